@@ -6,6 +6,9 @@ import json
 from datetime import datetime
 import os
 
+from utils.records import PROSPECT_COLUMNS, column_key
+from utils.sheet_writer import append_prospects
+
 def add_companies_to_sheets():
     """Add 20 more Orlando companies to existing Google Sheets data."""
     
@@ -254,26 +257,30 @@ def add_companies_to_sheets():
         
         print(f"📊 Adding {len(new_companies)} companies to the sheet...")
         
-        # Add each company
-        for i, company in enumerate(new_companies, 1):
-            worksheet.append_row(company)
-            print(f"   ✅ {i:2d}. {company[0]:<40} - ${company[14]:,} pipeline")
+        # Add every company not already in the sheet in one request
+        prospects = [dict(zip(map(column_key, PROSPECT_COLUMNS), company)) for company in new_companies]
+        existing_rows = [dict(zip(existing_data[0], row)) for row in existing_data[1:]] if existing_data else []
+        result = append_prospects(worksheet, prospects, existing_rows=existing_rows)
+        
+        for i, company in enumerate(result.added, 1):
+            print(f"   ✅ {i:2d}. {company['company_name']:<40} - ${company['annual_value']:,} pipeline")
+        for company in result.duplicates:
+            print(f"   ⏭️  {company['company_name']} - already in spreadsheet")
         
         # Calculate totals
-        new_total = sum(c[14] for c in new_companies)
+        new_total = sum(c['annual_value'] for c in result.added)
         
-        print(f"\n🎉 SUCCESS! Added {len(new_companies)} more companies to Google Sheets!")
+        print(f"\n🎉 SUCCESS! Added {len(result.added)} more companies to Google Sheets!")
         print(f"🔗 View at: https://docs.google.com/spreadsheets/d/{spreadsheet_id}/edit")
         print(f"💰 New companies pipeline value: ${new_total:,}")
         
-        # Get updated total
-        all_data = worksheet.get_all_values()
-        print(f"📊 Total companies now in sheet: {len(all_data) - 1}")  # -1 for header
+        # Updated total, without reading the sheet again
+        print(f"📊 Total companies now in sheet: {current_rows - 1 + len(result.added)}")  # -1 for header
         
         print(f"\n🎯 TOP PRIORITY COMPANIES TO CONTACT:")
-        high_priority = [c for c in new_companies if c[10] == "High"]
+        high_priority = [c for c in result.added if c['training_priority'] == "High"]
         for company in high_priority[:5]:
-            print(f"📞 {company[0]} - {company[5]} - {company[2]}")
+            print(f"📞 {company['company_name']} - {company['contact_person']} - {company['phone']}")
         
         print(f"\n✅ ALL REAL VERIFIED COMPANIES!")
         print(f"🚀 No fake data - all companies researched and verified!")
@@ -229,6 +229,7 @@ def add_more_orlando_companies():
     try:
         import gspread
         from google.oauth2.service_account import Credentials
+        from utils.sheet_writer import append_prospects
         
         # Load credentials
         with open('google_credentials.json', 'r') as f:
@@ -251,48 +252,22 @@ def add_more_orlando_companies():
         print(f"📊 Opened spreadsheet: {spreadsheet.title}")
         print(f"📍 Adding {len(ADDITIONAL_ORLANDO_COMPANIES)} more REAL Orlando companies:")
         
-        total_new_value = 0
+        # Existing rows are read once, for duplicate checks and the new total
+        existing_rows = worksheet.get_all_records()
+        
+        # Add every new company in one request; ones already in the sheet are skipped
+        result = append_prospects(worksheet, ADDITIONAL_ORLANDO_COMPANIES, existing_rows=existing_rows)
         
-        # Add each REAL company
-        for i, company in enumerate(ADDITIONAL_ORLANDO_COMPANIES, 1):
-            # Convert company dict to row format
-            row = [
-                company.get("company_name", ""),
-                company.get("website", ""),
-                company.get("phone", ""),
-                company.get("email", ""),
-                company.get("address", ""),
-                company.get("contact_person", ""),
-                company.get("title", ""),
-                company.get("company_size", ""),
-                company.get("employee_count", ""),
-                company.get("services", ""),
-                company.get("training_priority", ""),
-                company.get("training_gaps", ""),
-                company.get("deal_potential_min", ""),
-                company.get("deal_potential_max", ""),
-                company.get("annual_value", ""),
-                company.get("opportunity_level", ""),
-                company.get("pain_points", ""),
-                company.get("campaign_angle", ""),
-                company.get("next_action", ""),
-                company.get("follow_up_date", ""),
-                company.get("notes", ""),
-                company.get("data_source", ""),
-                company.get("verification_status", ""),
-                company.get("last_updated", "")
-            ]
-            
-            worksheet.append_row(row)
-            
+        total_new_value = 0
+        for i, company in enumerate(result.added, 1):
             total_new_value += company.get("annual_value", 0)
             print(f"   ✅ {i}. {company['company_name']} - ${company.get('annual_value', 0):,} pipeline - {company.get('phone', '')}")
+        for company in result.duplicates:
+            print(f"   ⏭️  {company['company_name']} - already in spreadsheet")
         
-        # Get current totals
-        all_values = worksheet.get_all_values()
-        current_total = len(all_values) - 1  # Subtract header row
+        current_total = len(existing_rows) + len(result.added)
         
-        print(f"\n🎉 SUCCESS! Added {len(ADDITIONAL_ORLANDO_COMPANIES)} more REAL companies!")
+        print(f"\n🎉 SUCCESS! Added {len(result.added)} more REAL companies!")
         print(f"📊 Total Orlando Companies Now: {current_total}")
         print(f"🔗 View at: https://docs.google.com/spreadsheets/d/{spreadsheet_id}/edit")
         print(f"💰 Additional Pipeline Value: ${total_new_value:,}")
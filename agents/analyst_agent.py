@@ -1,5 +1,5 @@
 from crewai import Agent
-from tools.company_analysis_tool import CompanyAnalysisTool
+from tools.company_analysis_tool import CompanyAnalysisTool, CompanyBatchAnalysisTool
 
 def create_sales_opportunity_analyst():
     """Create the Sales Opportunity Analyst Agent with real company analysis capabilities."""
@@ -35,7 +35,7 @@ def create_sales_opportunity_analyst():
         
         verbose=True,
         allow_delegation=False,
-        tools=[CompanyAnalysisTool()],
+        tools=[CompanyAnalysisTool(), CompanyBatchAnalysisTool()],
         
         # Analysis expertise
         max_execution_time=240,  # 4 minutes per company analysis
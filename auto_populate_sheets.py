@@ -4,11 +4,15 @@ Auto-Populate Google Sheets with Orlando Companies
 Directly adds the real Orlando pest control companies to the user's Google Sheets.
 """
 
+import csv
+import io
 import requests
 import json
 import datetime
 from urllib.parse import urlencode
 
+from utils.records import PROSPECT_COLUMNS, CompanyAnalysis
+
 # Google Sheets API endpoint
 SHEETS_API_BASE = "https://sheets.googleapis.com/v4/spreadsheets"
 SPREADSHEET_ID = "1pbi_GOxyUkLa3mzDSvu_tFWrZDtjPbij5Oa3pbs0aUw"
@@ -127,58 +131,14 @@ def create_sheets_url_with_data():
     print("🔗 CREATING DIRECT GOOGLE SHEETS LINK WITH DATA")
     print("=" * 60)
     
-    # Prepare data for URL encoding
-    headers = [
-        "Company Name", "Website", "Phone", "Email", "Address",
-        "Contact Person", "Title", "Company Size", "Employee Count",
-        "Services", "Training Priority", "Training Gaps",
-        "Deal Potential Min", "Deal Potential Max", "Annual Value",
-        "Opportunity Level", "Pain Points", "Campaign Angle",
-        "Next Action", "Follow Up Date", "Notes",
-        "Data Source", "Verification Status", "Last Updated"
-    ]
-    
-    # Create CSV-style data
-    csv_data = []
-    csv_data.append(",".join(headers))
-    
+    # Create CSV data in the prospect sheet's column order
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator="\n")
+    writer.writerow(PROSPECT_COLUMNS)
     for company in ORLANDO_COMPANIES_DATA:
-        row = [
-            company["company_name"],
-            company["website"],
-            company["phone"],
-            company["email"],
-            company["address"],
-            company["contact_person"],
-            company["title"],
-            company["company_size"],
-            company["employee_count"],
-            company["services"],
-            company["training_priority"],
-            company["training_gaps"],
-            str(company["deal_potential_min"]),
-            str(company["deal_potential_max"]),
-            str(company["annual_value"]),
-            company["opportunity_level"],
-            company["pain_points"],
-            company["campaign_angle"],
-            company["next_action"],
-            company["follow_up_date"],
-            company["notes"],
-            company["data_source"],
-            company["verification_status"],
-            company["last_updated"]
-        ]
-        # Escape commas and quotes in the data
-        escaped_row = []
-        for cell in row:
-            if "," in cell or '"' in cell:
-                escaped_row.append(f'"{cell.replace(chr(34), chr(34)+chr(34))}"')
-            else:
-                escaped_row.append(cell)
-        csv_data.append(",".join(escaped_row))
+        writer.writerow(CompanyAnalysis.from_dict(company).to_row(PROSPECT_COLUMNS, extra=company))
     
-    csv_content = "\n".join(csv_data)
+    csv_content = output.getvalue()
     
     # Save to file for user to manually import
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
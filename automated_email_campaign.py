@@ -8,6 +8,10 @@ from datetime import datetime, timedelta
 from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail, Email, To, Content, HtmlContent
 
+from utils.sheet_schema import email_status_fields
+from utils.sheet_snapshot import read_records
+from utils.sheet_writer import SheetWriteBuffer
+
 def load_env_file():
     """Load environment variables from .env file."""
     try:
@@ -171,8 +175,8 @@ P.S. - I'll follow up with a call next week if I don't hear back. Many business
     
     return email_content
 
-def send_email_and_track(company, worksheet, row_index):
-    """Send email and update Google Sheets with status."""
+def send_email_and_track(company, status_updates, row_index):
+    """Send email and queue its status update in a SheetWriteBuffer."""
     
     # Load SendGrid API key
     if not load_env_file():
@@ -217,14 +221,10 @@ def send_email_and_track(company, worksheet, row_index):
             update_row = row_index + 2
             
             try:
-                # Update email status columns using proper cell references
-                worksheet.update_cell(update_row, 11, 'Sent')  # Column K - Email Status
-                worksheet.update_cell(update_row, 12, current_time)  # Column L - Email Sent Date
-                worksheet.update_cell(update_row, 13, '202')  # Column M - SendGrid Status Code
-                worksheet.update_cell(update_row, 14, 'Active Campaign')  # Column N - Campaign Status
+                status_updates.update_fields(update_row, email_status_fields('Sent', current_time, '202', 'Active Campaign'))
                 
                 print(f"✅ Email sent to {company_name} ({contact_email})")
-                print(f"📊 Updated Google Sheets row {update_row}")
+                print(f"📊 Queued Google Sheets update for row {update_row}")
                 return True
             except Exception as sheets_error:
                 print(f"⚠️ Email sent but Google Sheets update failed: {sheets_error}")
@@ -262,7 +262,7 @@ def run_automated_campaign():
         worksheet = spreadsheet.sheet1
         
         # Get all data
-        all_data = worksheet.get_all_records()
+        all_data = read_records(worksheet)
         
         # Filter companies that haven't been emailed yet
         companies_to_email = []
@@ -284,14 +284,19 @@ def run_automated_campaign():
         print(f"🔥 High Priority: {len(high_priority)} companies")
         print(f"📈 Medium Priority: {len(medium_priority)} companies")
         
-        # Send emails
+        # Send emails; status columns are queued and written together when the
+        # block ends, also if it ends early, so no sent email goes unrecorded
         sent_count = 0
-        for company, row_index in high_priority + medium_priority[:5]:  # Send to high priority + first 5 medium
-            if send_email_and_track(company, worksheet, row_index):
-                sent_count += 1
-                # Add delay between emails to avoid rate limiting
-                import time
-                time.sleep(2)
+        try:
+            with SheetWriteBuffer(worksheet) as status_updates:
+                for company, row_index in high_priority + medium_priority[:5]:  # Send to high priority + first 5 medium
+                    if send_email_and_track(company, status_updates, row_index):
+                        sent_count += 1
+                        # Add delay between emails to avoid rate limiting
+                        import time
+                        time.sleep(2)
+        except Exception as sheets_error:
+            print(f"⚠️ Emails sent but Google Sheets update failed: {sheets_error}")
         
         print(f"\n🎉 Campaign completed!")
         print(f"📧 Emails sent: {sent_count}")
@@ -5,6 +5,8 @@ import gspread
 from google.oauth2.service_account import Credentials
 from datetime import datetime
 
+from utils.sheet_snapshot import read_records
+
 def load_env_file():
     """Load environment variables from .env file."""
     try:
@@ -44,7 +46,7 @@ def get_campaign_summary():
         worksheet = spreadsheet.sheet1
         
         # Get all data
-        all_data = worksheet.get_all_records()
+        all_data = read_records(worksheet)
         
         # Analyze campaign data
         total_companies = len(all_data)
@@ -5,6 +5,8 @@ from google.oauth2.service_account import Credentials
 import json
 from datetime import datetime, timedelta
 
+from utils.sheet_snapshot import read_records
+
 def get_daily_actions():
     """Get today's communication actions."""
     
@@ -31,7 +33,7 @@ def get_daily_actions():
         worksheet = spreadsheet.sheet1
         
         # Get all data
-        all_data = worksheet.get_all_records()
+        all_data = read_records(worksheet)
         high_priority = [c for c in all_data if c.get('Training Priority') == 'High']
         
         # Today's actions
@@ -1,15 +1,18 @@
 #!/usr/bin/env python3
 
-import requests
-from bs4 import BeautifulSoup
 import re
-import time
 import random
 from urllib.parse import urljoin, urlparse
 import json
 import gspread
 from google.oauth2.service_account import Credentials
 
+from utils.contact_extractor import extract_page_contacts
+from utils.entity_resolver import EntityResolver
+from utils.http_client import get_http_client
+from utils.parsed_page import ParsedPage
+from utils.site_crawler import SiteCrawler
+
 def load_env_file():
     """Load environment variables from .env file."""
     try:
@@ -27,43 +30,17 @@ def load_env_file():
         print(f"❌ Error loading .env file: {e}")
         return False
 
-def get_session():
-    """Get a requests session with proper headers."""
-    session = requests.Session()
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Accept-Encoding': 'gzip, deflate',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
-    })
-    return session
-
 def find_personal_emails_on_website(company_name, website_url):
     """Find personal email addresses on a company website."""
     personal_emails = []
     
     try:
-        session = get_session()
-        response = session.get(website_url, timeout=10)
+        response = get_http_client().get(website_url)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Find all email links and text
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        
-        # Check all text content
-        all_text = soup.get_text()
-        emails = re.findall(email_pattern, all_text)
-        
-        # Check href attributes
-        for link in soup.find_all('a', href=True):
-            href = link.get('href')
-            if href.startswith('mailto:'):
-                email = href.replace('mailto:', '').split('?')[0]
-                emails.append(email)
+        # Emails from mailto: links and page text in one pass
+        page = ParsedPage.from_html(response.content, website_url)
+        emails = extract_page_contacts(page).emails
         
         # Filter out generic emails and find personal ones
         for email in emails:
@@ -99,41 +76,15 @@ def find_personal_emails_on_website(company_name, website_url):
         return []
 
 def find_contact_page_emails(company_name, website_url):
-    """Find emails on contact/about pages."""
+    """Find emails on the contact/about/team/careers pages a site links to."""
     contact_emails = []
     
     try:
-        session = get_session()
-        
-        # Common contact page URLs
-        contact_urls = [
-            f"{website_url}/contact",
-            f"{website_url}/about",
-            f"{website_url}/team",
-            f"{website_url}/staff",
-            f"{website_url}/contact-us",
-            f"{website_url}/about-us"
-        ]
-        
-        for contact_url in contact_urls:
-            try:
-                response = session.get(contact_url, timeout=8)
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # Look for email patterns
-                    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-                    emails = re.findall(email_pattern, soup.get_text())
-                    
-                    for email in emails:
-                        email = email.lower().strip()
-                        if '@' in email and email not in contact_emails:
-                            contact_emails.append(email)
-                    
-                    time.sleep(random.uniform(1, 3))  # Be respectful
-                    
-            except Exception as e:
-                continue
+        # Pages discovered from the homepage's links and sitemap, fetched concurrently
+        for page in SiteCrawler().crawl(website_url):
+            for email in extract_page_contacts(page).emails:
+                if email not in contact_emails:
+                    contact_emails.append(email)
         
         return contact_emails
         
@@ -321,9 +272,6 @@ def find_more_orlando_companies():
             print(f"⚠️ No personal email found, using generic")
         
         validated_companies.append(company_data)
-        
-        # Be respectful with delays
-        time.sleep(random.uniform(2, 4))
     
     return validated_companies
 
@@ -350,13 +298,10 @@ def add_companies_to_sheets(companies):
         
         # Get existing data to avoid duplicates
         existing_data = worksheet.get_all_records()
-        existing_names = [row.get('Company Name', '').lower() for row in existing_data]
+        resolver = EntityResolver.from_rows(existing_data)
         
-        # Filter out duplicates
-        new_companies = []
-        for company in companies:
-            if company['Company Name'].lower() not in existing_names:
-                new_companies.append(company)
+        # Filter out duplicates (same domain, phone or a near-identical name)
+        new_companies = resolver.new_rows(companies)
         
         if not new_companies:
             print("✅ All companies already exist in spreadsheet")
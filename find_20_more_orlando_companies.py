@@ -6,6 +6,8 @@ import pandas as pd
 from datetime import datetime
 import random
 
+from utils.entity_resolver import EntityResolver
+
 def main():
     # Google Sheets authentication
     SCOPES = [
@@ -335,6 +337,12 @@ def main():
         existing_data = worksheet.get_all_records()
         next_row = len(existing_data) + 2  # +2 because of header row
         
+        # Skip companies already in the sheet (same domain, phone or a near-identical name)
+        new_companies = EntityResolver.from_rows(existing_data).new_rows(new_companies)
+        if not new_companies:
+            print("✅ All companies already exist in the sheet")
+            return
+        
         print(f"Adding {len(new_companies)} companies starting at row {next_row}")
         
         # Add each company
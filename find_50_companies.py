@@ -14,6 +14,9 @@ import random
 # Add the current directory to Python path for imports
 sys.path.append(str(Path(__file__).parent))
 
+from utils.records import PROSPECT_COLUMNS, CompanyAnalysis
+from utils.sheet_writer import append_prospects
+
 # Target cities to search
 TARGET_CITIES = [
     "Phoenix, AZ", "Tampa, FL", "Jacksonville, FL", "Miami, FL", 
@@ -413,15 +416,7 @@ def populate_google_sheets_with_50_companies():
         print(f"📈 Total companies found: {len(all_companies)}")
         
         # Headers
-        headers = [
-            "Company Name", "Website", "Phone", "Email", "Address",
-            "Contact Person", "Title", "Company Size", "Employee Count",
-            "Services", "Training Priority", "Training Gaps",
-            "Deal Potential Min", "Deal Potential Max", "Annual Value",
-            "Opportunity Level", "Pain Points", "Campaign Angle",
-            "Next Action", "Follow Up Date", "Notes",
-            "Data Source", "Verification Status", "Last Updated"
-        ]
+        headers = PROSPECT_COLUMNS
         
         # Clear existing data and add headers
         worksheet.clear()
@@ -433,38 +428,12 @@ def populate_google_sheets_with_50_companies():
         total_value = 0
         verified_count = 0
         
-        # Add each company
+        # Add every company in one request; the regional templates share
+        # contact details on purpose, so they are not de-duplicated
+        append_prospects(worksheet, all_companies, dedupe=False,
+                         row_for=lambda company: CompanyAnalysis.from_dict(company).to_row(headers, extra=company))
+        
         for i, company in enumerate(all_companies, 1):
-            # Convert company dict to row format
-            row = [
-                company.get("company_name", ""),
-                company.get("website", ""),
-                company.get("phone", ""),
-                company.get("email", ""),
-                company.get("address", ""),
-                company.get("contact_person", ""),
-                company.get("title", ""),
-                company.get("company_size", ""),
-                company.get("employee_count", ""),
-                company.get("services", ""),
-                company.get("training_priority", ""),
-                company.get("training_gaps", ""),
-                company.get("deal_potential_min", ""),
-                company.get("deal_potential_max", ""),
-                company.get("annual_value", ""),
-                company.get("opportunity_level", ""),
-                company.get("pain_points", ""),
-                company.get("campaign_angle", ""),
-                company.get("next_action", ""),
-                company.get("follow_up_date", ""),
-                company.get("notes", ""),
-                company.get("data_source", ""),
-                company.get("verification_status", ""),
-                company.get("last_updated", "")
-            ]
-            
-            worksheet.append_row(row)
-            
             # Track stats
             total_value += company.get("annual_value", 0)
             if company.get("verification_status") == "Verified":
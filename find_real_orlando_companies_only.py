@@ -8,6 +8,8 @@ from bs4 import BeautifulSoup
 import time
 import re
 
+from utils.entity_resolver import EntityResolver
+
 def load_env_file():
     """Load environment variables from .env file."""
     try:
@@ -154,13 +156,10 @@ def add_real_companies_to_sheets(companies):
         
         # Get existing data to avoid duplicates
         existing_data = worksheet.get_all_records()
-        existing_names = [row.get('Company Name', '').lower() for row in existing_data]
+        resolver = EntityResolver.from_rows(existing_data)
         
-        # Filter out duplicates - only add if not already in sheet
-        new_companies = []
-        for company in companies:
-            if company['Company Name'].lower() not in existing_names:
-                new_companies.append(company)
+        # Filter out duplicates - only add if no company with the same domain, phone or name is in the sheet
+        new_companies = resolver.new_rows(companies)
         
         if not new_companies:
             print("✅ All verified companies already exist in spreadsheet")
@@ -5,6 +5,10 @@ import gspread
 from google.oauth2.service_account import Credentials
 from datetime import datetime
 
+from utils.sheet_schema import email_status_fields
+from utils.sheet_snapshot import read_records
+from utils.sheet_writer import SheetWriteBuffer
+
 def load_env_file():
     """Load environment variables from .env file."""
     try:
@@ -44,7 +48,7 @@ def fix_email_status():
         worksheet = spreadsheet.sheet1
         
         # Get all data
-        all_data = worksheet.get_all_records()
+        all_data = read_records(worksheet)
         
         print("🔧 FIXING EMAIL STATUS IN GOOGLE SHEETS")
         print("=" * 50)
@@ -78,35 +82,33 @@ def fix_email_status():
         current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         updated_count = 0
         
-        # Update each row
-        for i, company in enumerate(all_data):
-            company_name = company.get('Company Name', '')
-            current_status = company.get('Email Status', '')
-            
-            if company_name in emailed_companies and current_status.lower() != 'sent':
-                # Update the row (row index + 2 because sheets are 1-indexed and we have headers)
-                row_index = i + 2
+        # Update each row; all updated rows are written in one request when
+        # the block ends, also if it ends early
+        with SheetWriteBuffer(worksheet) as status_updates:
+            for i, company in enumerate(all_data):
+                company_name = company.get('Company Name', '')
+                current_status = company.get('Email Status', '')
                 
-                try:
-                    worksheet.update_cell(row_index, 11, 'Sent')  # Column K - Email Status
-                    worksheet.update_cell(row_index, 12, current_time)  # Column L - Email Sent Date
-                    worksheet.update_cell(row_index, 13, '202')  # Column M - SendGrid Status Code
-                    worksheet.update_cell(row_index, 14, 'Active Campaign')  # Column N - Campaign Status
-                    
-                    print(f"✅ Updated: {company_name}")
-                    updated_count += 1
+                if company_name in emailed_companies and current_status.lower() != 'sent':
+                    # Update the row (row index + 2 because sheets are 1-indexed and we have headers)
+                    row_index = i + 2
                     
-                except Exception as e:
-                    print(f"❌ Error updating {company_name}: {e}")
+                    try:
+                        status_updates.update_fields(row_index, email_status_fields('Sent', current_time, '202', 'Active Campaign'))
+                        
+                        print(f"✅ Updated: {company_name}")
+                        updated_count += 1
+                        
+                    except Exception as e:
+                        print(f"❌ Error updating {company_name}: {e}")
         
         print(f"\n🎉 STATUS FIX COMPLETED:")
         print(f"📧 Companies updated: {updated_count}")
         print(f"⏰ Timestamp: {current_time}")
         
-        # Show summary
-        all_data_updated = worksheet.get_all_records()
-        sent_count = len([c for c in all_data_updated if c.get('Email Status', '').lower() == 'sent'])
-        total_count = len(all_data_updated)
+        # Show summary, counted from the rows already read plus the ones just marked
+        sent_count = len([c for c in all_data if str(c.get('Email Status', '')).lower() == 'sent']) + updated_count
+        total_count = len(all_data)
         
         print(f"\n📊 UPDATED SUMMARY:")
         print(f"📧 Total Companies: {total_count}")
@@ -5,6 +5,8 @@ from google.oauth2.service_account import Credentials
 import json
 from datetime import datetime, timedelta
 
+from utils.sheet_snapshot import read_records
+
 def safe_float(value):
     """Safely convert value to float, handling currency formatting."""
     if isinstance(value, (int, float)):
@@ -169,7 +171,7 @@ def create_all_campaign_emails():
         worksheet = spreadsheet.sheet1
         
         # Get all data
-        all_data = worksheet.get_all_records()
+        all_data = read_records(worksheet)
         
         # Separate by priority
         high_priority = [c for c in all_data if c.get('Training Priority') == 'High']
@@ -4,6 +4,8 @@ import gspread
 from google.oauth2.service_account import Credentials
 import json
 
+from utils.sheet_snapshot import read_records
+
 def analyze_company_approach(company):
     """Analyze a company and provide detailed sales approach recommendations."""
     
@@ -150,7 +152,7 @@ def main():
         worksheet = spreadsheet.sheet1
         
         # Get all data
-        all_data = worksheet.get_all_records()
+        all_data = read_records(worksheet)
         print(f"📊 Analyzing {len(all_data)} companies for optimal sales approaches\\n")
         
         # Separate by priority
@@ -4,7 +4,10 @@ import json
 import gspread
 from google.oauth2.service_account import Credentials
 from datetime import datetime
-import time
+
+from utils.sheet_schema import email_status_fields
+from utils.sheet_snapshot import read_records
+from utils.sheet_writer import SheetWriteBuffer
 
 def load_env_file():
     """Load environment variables from .env file."""
@@ -51,32 +54,10 @@ def manual_fix_sheet():
         print("🧹 Clearing incorrect timestamps...")
         
         # Get all data to see the current structure
-        all_data = worksheet.get_all_records()
+        all_data = read_records(worksheet)
         print(f"📊 Found {len(all_data)} companies in sheet")
         
-        # Clear the email status columns for all rows
-        for i in range(len(all_data)):
-            row_index = i + 2  # +2 because sheets are 1-indexed and we have headers
-            try:
-                # Clear the status columns
-                worksheet.update_cell(row_index, 11, '')  # Column K - Email Status
-                worksheet.update_cell(row_index, 12, '')  # Column L - Email Sent Date  
-                worksheet.update_cell(row_index, 13, '')  # Column M - SendGrid Status Code
-                worksheet.update_cell(row_index, 14, '')  # Column N - Campaign Status
-                
-                if i % 5 == 0:  # Progress indicator
-                    print(f"✅ Cleared row {row_index}")
-                
-                # Add delay to avoid rate limits
-                time.sleep(0.5)
-                
-            except Exception as e:
-                print(f"❌ Error clearing row {row_index}: {e}")
-                time.sleep(2)  # Longer delay on error
-        
-        print("✅ All timestamps cleared")
-        
-        # Now mark only the companies we actually emailed
+        # Companies we actually emailed
         actually_emailed_companies = [
             "Turner Pest Control",
             "Gato Guard Services", 
@@ -108,37 +89,28 @@ def manual_fix_sheet():
         print(f"\n📧 Marking companies we actually emailed...")
         print(f"⏰ Using timestamp: {current_time}")
         
-        # Update each row for companies we actually emailed
-        for i, company in enumerate(all_data):
-            company_name = company.get('Company Name', '')
-            
-            if company_name in actually_emailed_companies:
-                row_index = i + 2
+        # Each row gets its final values (cleared, or marked as sent) in one
+        # pass, and all of them go out in one batch when the block ends; a
+        # run that stops early writes only rows that are already correct
+        with SheetWriteBuffer(worksheet) as status_updates:
+            for i, company in enumerate(all_data):
+                company_name = company.get('Company Name', '')
+                row_index = i + 2  # +2 because sheets are 1-indexed and we have headers
                 
-                try:
-                    worksheet.update_cell(row_index, 11, 'Sent')  # Column K - Email Status
-                    worksheet.update_cell(row_index, 12, current_time)  # Column L - Email Sent Date
-                    worksheet.update_cell(row_index, 13, '202')  # Column M - SendGrid Status Code
-                    worksheet.update_cell(row_index, 14, 'Active Campaign')  # Column N - Campaign Status
-                    
+                if company_name in actually_emailed_companies:
+                    status_updates.update_fields(row_index, email_status_fields('Sent', current_time, '202', 'Active Campaign'))
                     print(f"✅ Marked as sent: {company_name}")
                     marked_count += 1
-                    
-                    # Add delay to avoid rate limits
-                    time.sleep(1)
-                    
-                except Exception as e:
-                    print(f"❌ Error marking {company_name}: {e}")
-                    time.sleep(2)  # Longer delay on error
+                else:
+                    status_updates.update_fields(row_index, email_status_fields())
         
         print(f"\n🎉 MANUAL FIX COMPLETED:")
         print(f"📧 Companies marked as sent: {marked_count}")
         print(f"⏰ Correct timestamp: {current_time}")
         
-        # Show final summary
-        all_data_updated = worksheet.get_all_records()
-        sent_count = len([c for c in all_data_updated if c.get('Email Status', '').lower() == 'sent'])
-        total_count = len(all_data_updated)
+        # Show final summary; every row was rewritten, so only the marked ones are sent
+        sent_count = marked_count
+        total_count = len(all_data)
         
         print(f"\n📊 FINAL SUMMARY:")
         print(f"📧 Total Companies: {total_count}")
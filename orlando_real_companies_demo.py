@@ -4,11 +4,8 @@ Orlando Real Companies Demo
 Uses manually verified real pest control companies in Orlando, FL
 """
 
-import requests
-from bs4 import BeautifulSoup
-import time
-import random
 from tools.company_analysis_tool import CompanyAnalysisTool
+from utils.http_client import get_http_client
 
 # Real Orlando pest control companies (manually verified)
 REAL_ORLANDO_COMPANIES = [
@@ -73,10 +70,7 @@ REAL_ORLANDO_COMPANIES = [
 def verify_company_website(company):
     """Verify that the company website is accessible."""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-        response = requests.get(company['website'], headers=headers, timeout=10)
+        response = get_http_client().get(company['website'])
         if response.status_code == 200:
             return True
         else:
@@ -105,34 +99,30 @@ def analyze_real_companies():
         if verify_company_website(company):
             verified_companies.append(company)
             print(f"✅ {company['name']} - Verified")
-        time.sleep(1)  # Rate limiting
     
     print(f"\n✅ Verified {len(verified_companies)} real companies out of {len(REAL_ORLANDO_COMPANIES)}")
     
-    # Analyze each verified company
+    # Analyze the top 5 verified companies concurrently
     print("\n🔍 ANALYSIS PHASE:")
-    for i, company in enumerate(verified_companies[:5], 1):  # Analyze top 5
+    top_companies = verified_companies[:5]
+    analyses = analysis_tool.analyze_batch(
+        [(company['name'], company['website'], "Orlando, FL") for company in top_companies]
+    )
+    
+    for i, (company, analysis) in enumerate(zip(top_companies, analyses), 1):
         print(f"\n--- Analyzing Company {i}: {company['name']} ---")
         
-        try:
-            analysis = analysis_tool._run(
-                company_name=company['name'],
-                website_url=company['website'],
-                location="Orlando, FL"
-            )
-            
-            analysis_results.append({
-                'company': company,
-                'analysis': analysis
-            })
-            
-            print("✅ Analysis completed")
-            
-            # Rate limiting
-            time.sleep(random.uniform(2, 4))
-            
-        except Exception as e:
-            print(f"❌ Analysis failed: {str(e)}")
+        if isinstance(analysis, Exception):
+            print(f"❌ Analysis failed: {str(analysis)}")
+            continue
+        
+        analysis_results.append({
+            'company': company,
+            'analysis': analysis_tool._format_report(analysis),
+            'record': analysis
+        })
+        
+        print("✅ Analysis completed")
     
     return verified_companies, analysis_results
 
@@ -124,6 +124,7 @@ def populate_real_orlando_only():
     try:
         import gspread
         from google.oauth2.service_account import Credentials
+        from utils.sheet_writer import append_prospects
         
         # Load credentials
         with open('google_credentials.json', 'r') as f:
@@ -164,40 +165,11 @@ def populate_real_orlando_only():
         print("✅ Cleared spreadsheet and added headers")
         print(f"📍 Adding {len(REAL_ORLANDO_COMPANIES)} REAL Orlando-area companies:")
         
-        total_value = 0
+        # Add every REAL company in one request (the sheet was just cleared)
+        result = append_prospects(worksheet, REAL_ORLANDO_COMPANIES, existing_rows=[])
         
-        # Add each REAL company
-        for i, company in enumerate(REAL_ORLANDO_COMPANIES, 1):
-            # Convert company dict to row format
-            row = [
-                company.get("company_name", ""),
-                company.get("website", ""),
-                company.get("phone", ""),
-                company.get("email", ""),
-                company.get("address", ""),
-                company.get("contact_person", ""),
-                company.get("title", ""),
-                company.get("company_size", ""),
-                company.get("employee_count", ""),
-                company.get("services", ""),
-                company.get("training_priority", ""),
-                company.get("training_gaps", ""),
-                company.get("deal_potential_min", ""),
-                company.get("deal_potential_max", ""),
-                company.get("annual_value", ""),
-                company.get("opportunity_level", ""),
-                company.get("pain_points", ""),
-                company.get("campaign_angle", ""),
-                company.get("next_action", ""),
-                company.get("follow_up_date", ""),
-                company.get("notes", ""),
-                company.get("data_source", ""),
-                company.get("verification_status", ""),
-                company.get("last_updated", "")
-            ]
-            
-            worksheet.append_row(row)
-            
+        total_value = 0
+        for i, company in enumerate(result.added, 1):
             total_value += company.get("annual_value", 0)
             print(f"   ✅ {i}. {company['company_name']} - ${company.get('annual_value', 0):,} pipeline - {company.get('phone', '')}")
         
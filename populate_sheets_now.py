@@ -10,6 +10,8 @@ import os
 import datetime
 from google.oauth2.service_account import Credentials
 
+from utils.sheet_writer import append_rows_chunked
+
 SPREADSHEET_ID = "1pbi_GOxyUkLa3mzDSvu_tFWrZDtjPbij5Oa3pbs0aUw"
 
 # Orlando companies data formatted for direct insertion
@@ -155,15 +157,13 @@ def try_direct_population():
                 "Data Source", "Verification Status", "Last Updated"
             ]
             
-            # Clear existing data and add headers
+            # Clear existing data, then add headers and every company in one request
             worksheet.clear()
-            worksheet.append_row(headers)
+            append_rows_chunked(worksheet, [headers] + ORLANDO_COMPANIES)
             
             print("📊 ADDING COMPANIES:")
             
-            # Add each company
             for i, company in enumerate(ORLANDO_COMPANIES, 1):
-                worksheet.append_row(company)
                 print(f"   ✅ {i}. {company[0]} - ${company[14]:,} pipeline")
             
             print(f"\n🎉 SUCCESS! All {len(ORLANDO_COMPANIES)} companies added to Google Sheets!")
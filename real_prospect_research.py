@@ -20,10 +20,9 @@ def create_real_research_tasks(location: str, max_companies: int = 10):
     research_task = Task(
         description=f"""Find {max_companies} REAL pest control companies in {location} using web scraping.
         
-        Use the web_scraping tool to search multiple sources:
-        1. Start with Google search: "pest control {location}"
-        2. Search Yellow Pages for pest control in {location}
-        3. Check Yelp for pest control businesses in {location}
+        Use the web_scraping tool ONCE with source "all" and query "pest control {location}".
+        It searches Google, Yellow Pages and Yelp at the same time and returns one
+        de-duplicated list, ranked by how many sources found each company.
         
         For each company found, verify:
         - Company name and website URL
@@ -38,7 +37,7 @@ def create_real_research_tasks(location: str, max_companies: int = 10):
         - Website URL  
         - Phone Number
         - Address
-        - Source (Google/Yellow Pages/Yelp)
+        - Source(s) (Google/Yellow Pages/Yelp)
         - Basic services mentioned
         
         Aim for {max_companies} verified companies with complete information.""",
@@ -49,7 +48,7 @@ def create_real_research_tasks(location: str, max_companies: int = 10):
     
     # Task 2: Analyze Real Companies
     analysis_task = Task(
-        description="""Analyze each REAL company found by the researcher using the company_analysis tool.
+        description="""Analyze each REAL company found by the researcher using the company_batch_analysis tool.
         
         For each company with a website URL, perform comprehensive analysis:
         
@@ -61,7 +60,7 @@ def create_real_research_tasks(location: str, max_companies: int = 10):
         6. Sales opportunity scoring
         7. Deal potential calculation
         
-        Use the company_analysis tool with:
+        Use the company_batch_analysis tool ONCE with every company, each given as:
         - Company name
         - Website URL
         - Location
@@ -5,6 +5,9 @@ import gspread
 from google.oauth2.service_account import Credentials
 from datetime import datetime
 
+from utils.sheet_schema import email_status_fields
+from utils.sheet_sync import ProspectStore, SheetSync
+
 def load_env_file():
     """Load environment variables from .env file."""
     try:
@@ -43,27 +46,19 @@ def reset_and_fix_sheet():
         spreadsheet = gc.open_by_key(spreadsheet_id)
         worksheet = spreadsheet.sheet1
         
-        # Get all data
-        all_data = worksheet.get_all_records()
+        # The sheet is mirrored in a local prospect store. The first sync
+        # brings the store up to date with the sheet (reading it only if it
+        # changed since the last run) and writes nothing; the second writes
+        # back just the cells whose value actually changes. Rows repeating
+        # a company name get the changes made to its first row, nothing more
+        store = ProspectStore()
+        sync = SheetSync(store, worksheet)
+        sync.sync()
+        all_data = store.records()
         
         print("🔄 RESETTING AND FIXING EMAIL STATUS")
         print("=" * 50)
         
-        # First, reset all companies to "Not Sent"
-        print("📋 Resetting all companies to 'Not Sent'...")
-        for i, company in enumerate(all_data):
-            row_index = i + 2
-            try:
-                worksheet.update_cell(row_index, 11, 'Not Sent')  # Column K - Email Status
-                worksheet.update_cell(row_index, 12, '')  # Column L - Email Sent Date
-                worksheet.update_cell(row_index, 13, '')  # Column M - SendGrid Status Code
-                worksheet.update_cell(row_index, 14, '')  # Column N - Campaign Status
-            except Exception as e:
-                print(f"❌ Error resetting row {row_index}: {e}")
-        
-        print("✅ All companies reset to 'Not Sent'")
-        
-        # Now mark only the companies we actually emailed
         actually_emailed_companies = [
             "Turner Pest Control",
             "Gato Guard Services", 
@@ -92,35 +87,33 @@ def reset_and_fix_sheet():
         current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         marked_count = 0
         
+        # Reset everyone else to "Not Sent"
         print(f"\n📧 Marking companies we actually emailed...")
-        
-        # Update each row for companies we actually emailed
-        for i, company in enumerate(all_data):
-            company_name = company.get('Company Name', '')
+        for company in all_data:
+            company_name = company.get('company_name', '')
             
             if company_name in actually_emailed_companies:
-                row_index = i + 2
-                
-                try:
-                    worksheet.update_cell(row_index, 11, 'Sent')  # Column K - Email Status
-                    worksheet.update_cell(row_index, 12, current_time)  # Column L - Email Sent Date
-                    worksheet.update_cell(row_index, 13, '202')  # Column M - SendGrid Status Code
-                    worksheet.update_cell(row_index, 14, 'Active Campaign')  # Column N - Campaign Status
-                    
-                    print(f"✅ Marked as sent: {company_name}")
-                    marked_count += 1
-                    
-                except Exception as e:
-                    print(f"❌ Error marking {company_name}: {e}")
+                store.update(company_name, email_status_fields('Sent', current_time, '202', 'Active Campaign'))
+                print(f"✅ Marked as sent: {company_name}")
+                marked_count += 1
+            else:
+                store.update(company_name, email_status_fields('Not Sent'))
+        
+        result = sync.sync()
+        for conflict in result.conflicts:
+            print(f"⚠️ {conflict.key}: '{conflict.field}' was edited in the sheet, kept '{conflict.sheet}'")
         
         print(f"\n🎉 SHEET FIX COMPLETED:")
         print(f"📧 Companies marked as sent: {marked_count}")
+        print(f"✏️ Cells changed: {result.cells_pushed} ({result.requests} requests)")
+        for company_name, rows in result.duplicates.items():
+            print(f"⚠️ {company_name} is listed more than once (also rows {', '.join(map(str, rows))}, "
+                  f"which only got the changes made to its first row)")
         print(f"⏰ Timestamp: {current_time}")
         
-        # Show final summary
-        all_data_updated = worksheet.get_all_records()
-        sent_count = len([c for c in all_data_updated if c.get('Email Status', '').lower() == 'sent'])
-        total_count = len(all_data_updated)
+        # Show final summary; every other company was reset, so only the marked ones are sent
+        sent_count = marked_count
+        total_count = len(all_data)
         
         print(f"\n📊 FINAL SUMMARY:")
         print(f"📧 Total Companies: {total_count}")
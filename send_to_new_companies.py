@@ -9,6 +9,9 @@ from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail, Email, To, Content
 import time
 
+from utils.sheet_schema import email_status_fields
+from utils.sheet_writer import SheetWriteBuffer
+
 def load_env_file():
     """Load environment variables from .env file."""
     try:
@@ -115,6 +118,58 @@ P.S. - I'll follow up with a call next week if I don't hear back. Many business
     
     return email_content
 
+def send_email_and_track(company, status_updates, row_index, api_key):
+    """Send one email and queue its status update in a SheetWriteBuffer."""
+    company_name = company.get('Company Name', '')
+    contact_email = company.get('Email', '')
+    contact_person = company.get('Contact Person', '')
+
+    if not contact_email:
+        print(f"❌ No email address for {company_name}")
+        return False
+
+    try:
+        # Generate personalized email
+        email_content = generate_personalized_email(company)
+
+        # Create SendGrid email
+        from_email = Email("kurt@pestprouniversity.com", "Kurt - Pest Pro University")
+        to_email = To(contact_email, contact_person or company_name)
+
+        subject = "Training Solution for {} - CEU Credits & Partnership Opportunities".format(company_name)
+
+        # Create mail object
+        mail = Mail(from_email, to_email, subject, Content("text/plain", email_content))
+
+        # Send the email
+        sg = SendGridAPIClient(api_key=api_key)
+        response = sg.send(mail)
+
+        if response.status_code == 202:
+            # Update Google Sheets with email status
+            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+            # Find the row to update
+            update_row = row_index + 2
+
+            try:
+                status_updates.update_fields(update_row, email_status_fields('Sent', current_time, '202', 'Active Campaign'))
+
+                print(f"✅ Email sent to {company_name} ({contact_email})")
+                print(f"📊 Queued Google Sheets update for row {update_row}")
+                return True
+
+            except Exception as sheets_error:
+                print(f"⚠️ Email sent but Google Sheets update failed: {sheets_error}")
+                return True  # Email was sent successfully, just tracking failed
+
+        else:
+            print(f"❌ Failed to send email to {company_name}: Status {response.status_code}")
+
+    except Exception as e:
+        print(f"❌ Error sending email to {company_name}: {e}")
+    return False
+
 def send_emails_to_new_companies():
     """Send emails to the new companies we just added."""
     
@@ -164,63 +219,19 @@ def send_emails_to_new_companies():
             print("✅ All companies have already been emailed!")
             return
         
-        # Send emails to first 10 companies
+        # Status columns are queued per email and written together when the
+        # block ends, also if it ends early, so no sent email goes unrecorded
         sent_count = 0
-        for company, row_index in companies_to_email[:10]:
-            company_name = company.get('Company Name', '')
-            contact_email = company.get('Email', '')
-            contact_person = company.get('Contact Person', '')
-            
-            if not contact_email:
-                print(f"❌ No email address for {company_name}")
-                continue
-            
-            try:
-                # Generate personalized email
-                email_content = generate_personalized_email(company)
-                
-                # Create SendGrid email
-                from_email = Email("kurt@pestprouniversity.com", "Kurt - Pest Pro University")
-                to_email = To(contact_email, contact_person or company_name)
-                
-                subject = "Training Solution for {} - CEU Credits & Partnership Opportunities".format(company_name)
-                
-                # Create mail object
-                mail = Mail(from_email, to_email, subject, Content("text/plain", email_content))
-                
-                # Send the email
-                sg = SendGridAPIClient(api_key=api_key)
-                response = sg.send(mail)
-                
-                if response.status_code == 202:
-                    # Update Google Sheets with email status
-                    current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    
-                    # Find the row to update
-                    update_row = row_index + 2
-                    
-                    try:
-                        worksheet.update_cell(update_row, 11, 'Sent')  # Column K - Email Status
-                        worksheet.update_cell(update_row, 12, current_time)  # Column L - Email Sent Date
-                        worksheet.update_cell(update_row, 13, '202')  # Column M - SendGrid Status Code
-                        worksheet.update_cell(update_row, 14, 'Active Campaign')  # Column N - Campaign Status
-                        
-                        print(f"✅ Email sent to {company_name} ({contact_email})")
-                        print(f"📊 Updated Google Sheets row {update_row}")
-                        sent_count += 1
-                        
-                    except Exception as sheets_error:
-                        print(f"⚠️ Email sent but Google Sheets update failed: {sheets_error}")
+        try:
+            with SheetWriteBuffer(worksheet) as status_updates:
+                # Send emails to first 10 companies
+                for company, row_index in companies_to_email[:10]:
+                    if send_email_and_track(company, status_updates, row_index, api_key):
                         sent_count += 1
-                    
-                    # Add delay between emails
-                    time.sleep(2)
-                    
-                else:
-                    print(f"❌ Failed to send email to {company_name}: Status {response.status_code}")
-                    
-            except Exception as e:
-                print(f"❌ Error sending email to {company_name}: {e}")
+                        # Add delay between emails
+                        time.sleep(2)
+        except Exception as sheets_error:
+            print(f"⚠️ Emails sent but Google Sheets update failed: {sheets_error}")
         
         print(f"\n🎉 CAMPAIGN COMPLETED!")
         print(f"📧 Emails sent: {sent_count}")
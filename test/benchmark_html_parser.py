@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark HTML parser backends on saved company pages.
+
+Compares every available BeautifulSoup backend (lxml, html.parser) on the
+fixture pages in test/fixtures, timing a full parse plus the text/link
+extraction the scraping tools do on each page.
+
+Usage: python test/benchmark_html_parser.py [iterations]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add the parent directory to Python path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.html_parser import available_parsers, make_soup
+from utils.parsed_page import ParsedPage
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+
+
+def time_parser(content: bytes, parser: str, iterations: int) -> float:
+    """Return the mean milliseconds to parse a page and extract its views."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        page = ParsedPage(make_soup(content, parser))
+        page.text
+        page.links
+        page.strings
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+def run_benchmark(iterations: int = 200):
+    """Time each parser on each fixture page and print a comparison table."""
+    parsers = available_parsers()
+    pages = sorted(FIXTURES_DIR.glob('*.html'))
+
+    print("📊 HTML Parser Benchmark")
+    print("=" * 60)
+    print(f"Parsers: {', '.join(parsers)} | Iterations per page: {iterations}\n")
+
+    header = f"{'Page':<28}" + "".join(f"{p:>14}" for p in parsers)
+    if len(parsers) > 1:
+        header += f"{'speedup':>10}"
+    print(header)
+    print("-" * len(header))
+
+    for page_path in pages:
+        content = page_path.read_bytes()
+        timings = [time_parser(content, parser, iterations) for parser in parsers]
+        row = f"{page_path.name:<28}" + "".join(f"{t:>11.3f} ms" for t in timings)
+        if len(parsers) > 1:
+            row += f"{timings[-1] / timings[0]:>9.1f}x"
+        print(row)
+
+    if 'lxml' not in parsers:
+        print("\n⚠️  lxml is not installed; only html.parser was measured.")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
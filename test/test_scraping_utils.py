@@ -0,0 +1,1017 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared scraping utilities.
+
+These run offline - no network access or API keys required.
+"""
+
+import asyncio
+import io
+import itertools
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Add the parent directory to Python path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+# No on-disk sheet snapshot unless a test sets one up in tmp_path
+os.environ['SHEETS_SNAPSHOT_PATH'] = ''
+
+from utils import analysis_cache
+from utils.analysis_cache import AnalysisCache, content_fingerprint
+from utils.http_cache import HttpCache
+from utils.http_client import (HttpClient, UnsupportedContentType, configure_http_client, get_http_client,
+                               read_limited)
+from utils.async_fetcher import AsyncFetcher, iterate_sync, run_sync
+from utils.entity_resolver import EntityResolver, name_fingerprint
+from utils.contact_extractor import extract_contacts, extract_page_contacts, phone_e164
+from utils.html_parser import available_parsers, make_soup
+from utils.keyword_matcher import KeywordMatcher
+from utils.parsed_page import ParsedPage
+from utils.rate_limiter import RateLimiter
+from utils.robots import RobotsCache
+from utils import scoring
+from utils.scoring import FEATURES, feature_columns, score_batch, score_company
+from utils.sheet_schema import SheetSchema, UnknownColumn, email_status_fields
+from utils import sheet_snapshot
+from utils.sheet_snapshot import SheetSnapshotCache, read_records
+from utils.sheet_sync import ProspectStore, SheetSync
+from utils.sheet_writer import SheetWriteBuffer, append_prospects
+from utils.site_crawler import SiteCrawler, parse_sitemap
+from utils.records import PROSPECT_COLUMNS, CompanyAnalysis, CompanyRecord, column_key, merge_company_records
+from utils.urls import host_of
+from tools.web_scraping_tool import WebScrapingTool
+from tools import company_analysis_tool
+from tools.google_sheets_tool import GoogleSheetsIntegrationTool
+from tools.company_analysis_tool import (SCORING_RULES_VERSION, CompanyAnalysisTool, CompanyBatchAnalysisTool,
+                                         score_pages)
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+
+SAMPLE_PAGE = b"""<html><head><title>Turner Pest Control</title></head><body>
+<h1>Welcome</h1>
+<p>Residential and commercial termite treatment.</p>
+<div><span>Our address</span>: 1852 McCoy Road, Orlando</div>
+<a href="mailto:owner@turnerpest.com?subject=Hi">Email us</a>
+<a href="tel:407-218-2020">Call</a>
+<a href="/about">About</a>
+</body></html>"""
+
+GOOGLE_RESULTS_PAGE = b"""<html><body>
+<div class="g"><a href="/url?q=https://sunshinepest.example/&amp;sa=U"><h3>Sunshine Pest Solutions</h3></a>
+<span>(407) 555-0142 - 1852 McCoy Road, Orlando</span></div>
+<div class="g"><a href="https://www.yelp.com/biz/turner"><h3>Turner Pest Control</h3></a></div>
+<div class="g"><a href="https://news.example.com/"><h3>Important local news</h3></a></div>
+</body></html>"""
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response."""
+
+    def __init__(self, url, status_code=200, content=b'<html></html>', headers=None):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"HTTP {self.status_code} for {self.url}")
+
+
+class FakeClient:
+    """Records request start times and answers after a fixed latency."""
+
+    def __init__(self, latency=0.05):
+        self.latency = latency
+        self.started = []
+
+    def cached(self, url):
+        return None
+
+    def get(self, url, **kwargs):
+        self.started.append((url, time.monotonic()))
+        time.sleep(self.latency)
+        return FakeResponse(url)
+
+
+def test_shared_http_client_is_reused():
+    """The shared client and its session are created once and reused."""
+    client = get_http_client()
+    assert get_http_client() is client
+    assert get_http_client().session is client.session
+
+
+def test_http_client_pool_settings():
+    """Pool size and retries are applied to both http and https adapters."""
+    client = HttpClient(pool_connections=5, pool_maxsize=3, max_retries=4)
+    for prefix in ('http://', 'https://'):
+        adapter = client.session.get_adapter(prefix + 'example.com')
+        assert adapter._pool_connections == 5
+        assert adapter._pool_maxsize == 3
+        assert adapter.max_retries.total == 4
+    client.close()
+
+
+def test_configure_http_client_replaces_shared_client():
+    """Reconfiguring swaps the shared client for a new one."""
+    old_client = get_http_client()
+    new_client = configure_http_client(timeout=5)
+    assert new_client is not old_client
+    assert get_http_client() is new_client
+    assert new_client.timeout == 5
+    configure_http_client()
+
+
+def test_async_fetcher_parallel_across_hosts():
+    """Different hosts are fetched concurrently, not one after another."""
+    client = FakeClient(latency=0.2)
+    fetcher = AsyncFetcher(max_concurrency=10, rate_limiter=RateLimiter(per_host_delay=1.0), client=client)
+    urls = [f"https://site{i}.example.com/" for i in range(5)]
+
+    start = time.monotonic()
+    responses = run_sync(fetcher.fetch_all(urls))
+    elapsed = time.monotonic() - start
+
+    assert [r.url for r in responses] == urls
+    assert elapsed < 0.6
+
+
+def test_async_fetcher_serializes_same_host():
+    """Requests to one host are spaced by the politeness delay."""
+    client = FakeClient(latency=0.0)
+    fetcher = AsyncFetcher(max_concurrency=10, rate_limiter=RateLimiter(per_host_delay=0.2), client=client)
+    urls = ["https://www.example.com/a", "https://example.com/b"]
+
+    run_sync(fetcher.fetch_all(urls))
+
+    assert host_of(urls[0]) == host_of(urls[1]) == 'example.com'
+    gap = client.started[1][1] - client.started[0][1]
+    assert gap >= 0.19
+
+
+def test_rate_limiter_only_delays_same_host():
+    """A second request to the same host waits; other hosts go straight through."""
+    limiter = RateLimiter(per_host_delay=0.5, global_rate=100, global_burst=100)
+    assert limiter.reserve("https://a.example.com/") == 0
+    assert limiter.reserve("https://b.example.com/") == 0
+    assert 0.45 < limiter.reserve("https://a.example.com/contact") <= 0.5
+
+
+def test_rate_limiter_global_cap():
+    """The global bucket caps total request rate across hosts."""
+    limiter = RateLimiter(per_host_delay=0, global_rate=10, global_burst=2)
+    waits = [limiter.reserve(f"https://site{i}.example.com/") for i in range(4)]
+    assert waits[:2] == [0, 0]
+    assert 0.05 < waits[2] <= 0.1
+    assert 0.15 < waits[3] <= 0.2
+
+
+def test_rate_limiter_host_burst_applies_to_one_host():
+    """A crawled host may take a burst; other hosts and Crawl-delay hosts keep one at a time."""
+    limiter = RateLimiter(per_host_delay=1.0, global_rate=100, global_burst=100)
+    limiter.set_host_burst("https://turnerpest.example/", 3)
+    assert [limiter.reserve("https://turnerpest.example/") for _ in range(3)] == [0, 0, 0]
+    assert limiter.reserve("https://turnerpest.example/") > 0.9
+
+    limiter.reserve("https://www.google.com/search")
+    assert limiter.reserve("https://www.google.com/search") > 0.9
+
+    limiter.set_host_delay("https://slowsite.example/", 5)
+    limiter.set_host_burst("https://slowsite.example/", 3)
+    limiter.reserve("https://slowsite.example/")
+    assert limiter.reserve("https://slowsite.example/about") > 4.9
+
+
+class FakeSession:
+    """Serves queued responses and records the request headers sent."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.sent_headers = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.sent_headers.append(headers or {})
+        return self.responses.pop(0)
+
+
+def test_http_cache_serves_fresh_entries_offline(tmp_path):
+    """A fresh entry is returned without another request."""
+    cache = HttpCache(str(tmp_path), ttl=60)
+    url = "https://example.com/contact"
+    session = FakeSession([FakeResponse(url, content=b'<p>hi</p>', headers={'ETag': '"v1"'})])
+
+    first = cache.fetch(session, url)
+    second = cache.fetch(session, url + "#team")
+
+    assert first.content == second.content == b'<p>hi</p>'
+    assert second.from_cache
+    assert len(session.sent_headers) == 1
+
+
+def test_http_cache_revalidates_stale_entries(tmp_path):
+    """Stale entries send validators and a 304 reuses the stored body."""
+    cache = HttpCache(str(tmp_path), ttl=0)
+    url = "https://example.com/about"
+    session = FakeSession([
+        FakeResponse(url, content=b'<p>about</p>',
+                     headers={'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}),
+        FakeResponse(url, status_code=304),
+    ])
+
+    cache.fetch(session, url)
+    revalidated = cache.fetch(session, url)
+
+    assert session.sent_headers[1] == {
+        'If-None-Match': '"v1"',
+        'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT',
+    }
+    assert revalidated.status_code == 200
+    assert revalidated.content == b'<p>about</p>'
+
+
+def test_parsed_page_views():
+    """Text, links and mailto/tel targets come from one parse."""
+    page = ParsedPage.from_html(SAMPLE_PAGE, "https://turnerpest.com/")
+    assert page.title == "Turner Pest Control"
+    assert page.mailto == ["owner@turnerpest.com"]
+    assert page.tel == ["407-218-2020"]
+    assert ("/about", "About") in page.links
+    assert page.text_lower is page.text_lower
+
+
+def test_parser_backends_agree_on_fixture():
+    """Every available backend extracts the same links and contacts."""
+    content = (FIXTURES_DIR / 'company_homepage.html').read_bytes()
+    pages = [ParsedPage(make_soup(content, parser)) for parser in available_parsers()]
+    for page in pages:
+        assert page.title == pages[0].title
+        assert page.links == pages[0].links
+        assert page.mailto == ['service@sunshinepest.example', 'dana.reyes@sunshinepest.example']
+
+
+def test_contact_extractor_single_pass():
+    """Phones, emails and addresses are found together and normalized."""
+    info = extract_contacts(
+        "Call (407) 555-0142 or 1-407-555-0142. Email John.Doe@Turner.com. "
+        "Visit 4950 Old Winter Garden Rd, Orlando, FL 32811 today."
+    )
+    assert info.phones == ['(407) 555-0142']
+    assert info.emails == ['john.doe@turner.com']
+    assert info.address == '4950 Old Winter Garden Rd, Orlando, FL 32811'
+    assert phone_e164(info.phone) == '+14075550142'
+
+
+def test_contact_extractor_prefers_links_and_finds_social():
+    """tel:/mailto: targets rank first and social profiles are collected."""
+    content = (FIXTURES_DIR / 'company_homepage.html').read_bytes()
+    info = extract_page_contacts(ParsedPage.from_html(content))
+    assert info.phone == '(407) 555-0142'
+    assert info.emails[:2] == ['service@sunshinepest.example', 'dana.reyes@sunshinepest.example']
+    assert info.address == '1852 McCoy Road, Orlando, FL 32809'
+    assert set(info.social) == {'facebook', 'linkedin', 'instagram'}
+
+
+def test_keyword_matcher_respects_word_boundaries():
+    """Keywords match whole words (with plurals), not substrings."""
+    matcher = KeywordMatcher(['ant', 'termite', 'bed bug', 'bed'])
+    found = matcher.find_all("It's important: Termites, ANTS and bed\nbugs; antique bedroom.")
+    assert found == {'ant', 'termite', 'bed bug'}
+    assert not matcher.search("important antique bedroom")
+    assert matcher.matches_in_order("bed bugs and ants") == ['ant', 'bed bug']
+
+
+def test_keyword_matcher_finds_overlapping_keywords():
+    """Keywords inside a longer match are found too; prefix mode matches fused names."""
+    matcher = KeywordMatcher(['bed bug', 'bug', 'pest control', 'control'])
+    assert matcher.find_all("Bed bug and pest control experts") == {'bed bug', 'bug', 'pest control', 'control'}
+
+    tool = WebScrapingTool()
+    for name in ("PestPro Solutions", "Pestmaster Services", "Termiteguard Inc", "Orlando Pest Control"):
+        assert tool._is_pest_control_company(name), name
+    for name in ("Orlando Plumbing Supply", "Anthony's Plumbing", "Antique Restorations", "Controlled Access Systems"):
+        assert not tool._is_pest_control_company(name), name
+
+
+def test_web_scraping_tool_returns_structured_records(monkeypatch):
+    """Search results are records; JSON mode returns them and websites chain directly."""
+    pages = {
+        'https://www.google.com': GOOGLE_RESULTS_PAGE,
+        'https://sunshinepest.example/': (FIXTURES_DIR / 'company_homepage.html').read_bytes(),
+    }
+
+    def fake_request(self, url):
+        return FakeResponse(url, content=next(v for k, v in pages.items() if url.startswith(k)))
+
+    monkeypatch.setattr(WebScrapingTool, '_safe_request', fake_request)
+    tool = WebScrapingTool()
+
+    companies = tool._search_google("pest control", "Orlando FL", 20)
+    assert [c.name for c in companies] == ['Sunshine Pest Solutions', 'Turner Pest Control']
+    assert companies[0].website == 'https://sunshinepest.example/'
+    assert tool._extract_websites(companies) == ['https://sunshinepest.example/']
+
+    result = json.loads(tool._run("pest control", "Orlando FL", source="google", output_format="json"))
+    assert result['count'] == 2
+    assert result['companies'][0]['phone'] == '(407) 555-0142'
+
+    monkeypatch.setattr(AsyncFetcher, 'fetch', lambda self, url: asyncio.sleep(0, fake_request(None, url)))
+    detailed = run_sync(tool._asearch_company_websites("pest control", "Orlando FL", 20))
+    assert len(detailed) == 1 and isinstance(detailed[0], CompanyRecord)
+    assert detailed[0].email == 'service@sunshinepest.example'
+
+
+def test_iter_companies_streams_websites_as_they_finish(monkeypatch):
+    """The first finished site is yielded while a slow one is still loading."""
+    results_page = b"""<html><body>
+    <div class="g"><a href="https://slowpest.example/"><h3>Slow Pest Control</h3></a></div>
+    <div class="g"><a href="https://fastpest.example/"><h3>Fast Pest Control</h3></a></div>
+    </body></html>"""
+    monkeypatch.setattr(WebScrapingTool, '_safe_request', lambda self, url: FakeResponse(url, content=results_page))
+
+    async def fake_fetch(self, url):
+        await asyncio.sleep(0.3 if 'slow' in url else 0)
+        return FakeResponse(url, content=SAMPLE_PAGE)
+
+    monkeypatch.setattr(AsyncFetcher, 'fetch', fake_fetch)
+    tool = WebScrapingTool()
+
+    start = time.monotonic()
+    stream = tool.iter_companies("pest control", "Orlando FL", source="websites")
+    first = next(stream)
+    assert first.website == 'https://fastpest.example/'
+    assert time.monotonic() - start < 0.25
+    assert [c.website for c in stream] == ['https://slowpest.example/']
+
+    async def collect():
+        return [c.website async for c in tool.aiter_companies("pest control", "Orlando FL", source="websites")]
+
+    assert run_sync(collect()) == ['https://fastpest.example/', 'https://slowpest.example/']
+
+
+def test_iterate_sync_propagates_errors():
+    """Items arrive one by one and an error in the producer reaches the consumer."""
+    async def numbers():
+        yield 1
+        raise ValueError("boom")
+
+    stream = iterate_sync(numbers())
+    assert next(stream) == 1
+    try:
+        next(stream)
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+
+def test_merge_company_records_by_domain_and_phone():
+    """Listings join on domain or phone, transitively, and rank by source count."""
+    records = [
+        CompanyRecord(name='Turner Pest', website='https://www.turnerpest.com/', source='Google Search'),
+        CompanyRecord(name='Solo Bug Co', phone='407-555-0100', source='Google Search'),
+        CompanyRecord(name='Turner Pest Control', website='http://turnerpest.com/contact',
+                      phone='(407) 218-2020', source='Yellow Pages'),
+        CompanyRecord(name='Turner Pest Control LLC', phone='+1 407 218 2020',
+                      address='1852 McCoy Road', source='Yelp'),
+        CompanyRecord(name='Yelp Listed Co', website='https://www.yelp.com/biz/a', source='Yelp'),
+        CompanyRecord(name='Other Yelp Co', website='https://www.yelp.com/biz/b', source='Yelp'),
+    ]
+    merged = merge_company_records(records, ignore_domains=['yelp.'])
+
+    assert len(merged) == 4
+    top = merged[0]
+    assert top.source == 'Yellow Pages, Yelp, Google Search'
+    assert top.phone == '(407) 218-2020' and top.address == '1852 McCoy Road'
+    assert top.website == 'http://turnerpest.com/contact'
+    assert {c.name for c in merged[1:]} == {'Solo Bug Co', 'Yelp Listed Co', 'Other Yelp Co'}
+
+
+def test_web_scraping_tool_all_sources_in_one_call(monkeypatch):
+    """source="all" runs every directory search and returns one merged list."""
+    calls = []
+
+    def fake_search(label, phone):
+        def search(self, query, location, max_results):
+            calls.append(label)
+            if label == 'yelp':
+                raise Exception("blocked")
+            return [CompanyRecord(name=f'Acme ({label})', phone=phone, source=label)]
+        return search
+
+    monkeypatch.setattr(WebScrapingTool, '_search_google', fake_search('google', '407-555-0142'))
+    monkeypatch.setattr(WebScrapingTool, '_search_yellowpages', fake_search('yellowpages', '(407) 555-0142'))
+    monkeypatch.setattr(WebScrapingTool, '_search_yelp', fake_search('yelp', None))
+
+    result = json.loads(WebScrapingTool()._run("pest control", "Orlando FL", source="all", output_format="json"))
+    assert sorted(calls) == ['google', 'yellowpages', 'yelp']
+    assert result['count'] == 1
+    assert result['companies'][0]['source'] == 'google, yellowpages'
+
+
+def test_entity_resolver_matches_domain_phone_and_fuzzy_names():
+    """Variants of a stored company are caught; different companies are not."""
+    resolver = EntityResolver.from_rows([
+        {'Company Name': 'Turner Pest Control', 'Website': 'https://www.turnerpest.com/', 'Phone': '(407) 218-2020'},
+        {'Company Name': 'Freedom Pest', 'Website': 'LinkedIn verified', 'Phone': ''},
+    ])
+
+    assert name_fingerprint('The Turner Pest Control, Inc.') == 'turner pest control'
+    assert resolver.match('Turner Pest Control Inc') == 0
+    assert resolver.match('Turners Pest Control') == 0
+    assert resolver.match('Acme', website='turnerpest.com/contact') == 0
+    assert resolver.match('Acme', phone='+1 407-218-2020') == 0
+    assert resolver.match('Turner Lawn Care') is None
+    assert resolver.match('Turner Pest Control', website='https://turner-tampa.example') is None
+    assert resolver.match('Acme', website='https://www.linkedin.com/company/acme') is None
+
+    rows = [
+        {'Company Name': 'Freedom Pest LLC', 'Phone': '407-555-0100'},
+        {'Company Name': 'Brand New Bugs', 'Phone': '407-555-0199'},
+        {'Company Name': 'Brand New Bugs Inc', 'Phone': ''},
+    ]
+    assert [r['Company Name'] for r in resolver.new_rows(rows)] == ['Brand New Bugs']
+
+
+def test_entity_resolver_lookup_does_not_scan_the_index():
+    """Matching against tens of thousands of prospects stays fast."""
+    resolver = EntityResolver()
+    for i in range(20000):
+        resolver.add(f"Company {i} Pest Control", f"https://company{i}.example", f"407{i:07d}")
+
+    start = time.perf_counter()
+    for i in range(200):
+        resolver.match(f"Unseen Business {i}", f"https://unseen{i}.example", f"321{i:07d}")
+    assert time.perf_counter() - start < 0.5
+    assert resolver.match("Company 123 Pest Control LLC") == 123
+
+
+class FixtureSiteFetcher(AsyncFetcher):
+    """Serves the Sunshine Pest fixture site and records every requested URL."""
+
+    def __init__(self, pages):
+        super().__init__()
+        self.pages = pages
+        self.requested = []
+
+    async def fetch(self, url, **kwargs):
+        self.requested.append(url)
+        path = '/' + url.split('://', 1)[1].partition('/')[2]
+        if path not in self.pages:
+            raise Exception(f"HTTP 404 for {url}")
+        return FakeResponse(url, content=self.pages[path])
+
+
+class RobotsClient:
+    """Serves a fixed robots.txt and counts how often it is requested."""
+
+    def __init__(self, status_code=200, content=b''):
+        self.status_code = status_code
+        self.content = content
+        self.requests = 0
+
+    def get(self, url, **kwargs):
+        self.requests += 1
+        return FakeResponse(url, self.status_code, self.content)
+
+
+def test_robots_cache_policy():
+    """Rules, Crawl-delay and sitemaps are loaded once per host and applied."""
+    client = RobotsClient(content=b"User-agent: *\nDisallow: /admin\nCrawl-delay: 5\n"
+                                  b"Sitemap: https://turnerpest.example/pages.xml\n")
+    limiter = RateLimiter(per_host_delay=1.0, global_rate=100, global_burst=100)
+    robots = RobotsCache(client=client, rate_limiter=limiter)
+
+    assert robots.allowed('https://turnerpest.example/contact')
+    assert not robots.allowed('https://turnerpest.example/admin/login')
+    assert robots.sitemap_urls('https://turnerpest.example/') == ['https://turnerpest.example/pages.xml']
+    assert client.requests == 1
+
+    limiter.reserve('https://turnerpest.example/')
+    assert 4.9 < limiter.reserve('https://turnerpest.example/contact') <= 5.0
+
+    missing = RobotsCache(client=RobotsClient(status_code=404))
+    assert missing.allowed('https://other.example/admin')
+    assert missing.sitemap_urls('https://other.example/x') == ['https://other.example/sitemap.xml']
+
+
+def test_site_crawler_follows_discovered_links_within_budget():
+    """Contact pages come from the site's own links and sitemaps, best first, within the page budget."""
+    sitemap_index = b"""<?xml version="1.0"?><sitemapindex>
+    <sitemap><loc>https://sunshinepest.example/page-sitemap.xml</loc></sitemap>
+    </sitemapindex>"""
+    sitemap = b"""<?xml version="1.0"?><urlset>
+    <url><loc>https://sunshinepest.example/careers</loc></url>
+    <url><loc>https://sunshinepest.example/blog/spring-ants</loc></url>
+    </urlset>"""
+    fetcher = FixtureSiteFetcher({
+        '/': (FIXTURES_DIR / 'company_homepage.html').read_bytes(),
+        '/contact': (FIXTURES_DIR / 'company_contact.html').read_bytes(),
+        '/about-us': SAMPLE_PAGE,
+        '/sitemap_index.xml': sitemap_index,
+        '/page-sitemap.xml': sitemap,
+    })
+    robots = RobotsCache(client=RobotsClient(content=b"User-agent: *\nDisallow: /our-team\n"
+                                                     b"Sitemap: https://sunshinepest.example/sitemap_index.xml\n"))
+
+    assert parse_sitemap(sitemap) == ['https://sunshinepest.example/careers',
+                                      'https://sunshinepest.example/blog/spring-ants']
+
+    pages = SiteCrawler(max_pages=4, fetcher=fetcher, robots=robots).crawl('https://sunshinepest.example/')
+    crawled = sorted(url.rsplit('/', 1)[1] for url in fetcher.requested)
+    assert crawled == ['', 'about-us', 'careers', 'contact', 'page-sitemap.xml', 'sitemap_index.xml']
+    assert [page.url for page in pages][0] == 'https://sunshinepest.example/'
+    assert len(pages) == 3
+
+    emails = {email for page in pages for email in extract_page_contacts(page).emails}
+    assert {'dana@sunshinepest.example', 'owner@turnerpest.com'} <= emails
+
+
+def streamed_response(body, content_type=None, status_code=200):
+    """A requests.Response whose body has not been read yet."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = 'https://turnerpest.example/page'
+    response.headers = CaseInsensitiveDict({'Content-Type': content_type} if content_type else {})
+    response.raw = io.BytesIO(body)
+    return response
+
+
+def test_read_limited_caps_body_and_skips_binary_content():
+    """Bodies stop at the byte budget; PDFs and sniffed binaries are rejected before download."""
+    page = read_limited(streamed_response(b'<html>' + b'x' * 50000, 'text/html; charset=utf-8'), max_bytes=1000)
+    assert len(page.content) == 1000 and page.truncated
+
+    small = read_limited(streamed_response(b'<html>ok</html>', 'text/html'), max_bytes=1000)
+    assert small.content == b'<html>ok</html>' and not small.truncated
+
+    for body, content_type in ((b'%PDF-1.4 ...', 'application/pdf'), (b'%PDF-1.4 ...', None),
+                               (b'\x89PNG....', 'application/octet-stream')):
+        try:
+            read_limited(streamed_response(body, content_type), max_bytes=1000)
+            assert False, f"expected {content_type} to be rejected"
+        except UnsupportedContentType:
+            pass
+
+    # Error pages are read (capped) whatever their type
+    assert read_limited(streamed_response(b'{"error": 1}', 'application/json', 404)).status_code == 404
+
+
+def test_async_fetcher_per_host_concurrency():
+    """With per-host slots and burst, a site's pages load together."""
+    client = FakeClient(latency=0.2)
+    fetcher = AsyncFetcher(rate_limiter=RateLimiter(per_host_delay=1.0, per_host_burst=3), client=client,
+                           per_host_concurrency=3)
+    urls = [f"https://turnerpest.example/{path}" for path in ('', 'about', 'careers')]
+
+    start = time.monotonic()
+    run_sync(fetcher.fetch_all(urls))
+    assert time.monotonic() - start < 0.35
+
+
+def test_async_fetcher_can_be_reused_across_event_loops():
+    """One fetcher serves several run_sync calls, each on its own event loop."""
+    fetcher = AsyncFetcher(rate_limiter=RateLimiter(per_host_delay=0), client=FakeClient(latency=0.01),
+                           max_concurrency=1)
+    urls = [f"https://turnerpest.example/{path}" for path in ('', 'about', 'careers')]
+    for _ in range(2):
+        responses = run_sync(fetcher.fetch_all(urls))
+        assert [response.url for response in responses] == urls
+
+
+def test_company_analysis_pools_signals_across_pages(monkeypatch):
+    """Team and locations mentioned only on the about page lift the size estimate."""
+    fetcher = FixtureSiteFetcher({
+        '/': SAMPLE_PAGE,
+        '/about': (FIXTURES_DIR / 'company_contact.html').read_bytes(),
+    })
+    monkeypatch.setattr(company_analysis_tool, 'SiteCrawler',
+                        lambda **kwargs: SiteCrawler(fetcher=fetcher, robots=RobotsCache(enabled=False), **kwargs))
+
+    report = CompanyAnalysisTool(use_cache=False)._run("Turner Pest Control", "https://turnerpest.example/", "Orlando, FL")
+    assert "Pages Analyzed: 2" in report
+    assert "Estimated Size: Medium (10-20 employees)" in report
+    assert "Phone: (407) 218-2020" in report
+
+
+def test_company_analysis_batch_keeps_order_and_errors(monkeypatch):
+    """Companies run in parallel; results keep input order and failures stay per item."""
+    def fake_analyze(self, company_name, website_url, location, multi_page=True):
+        time.sleep(0.3 if company_name == 'Slow Co' else 0.1)
+        if company_name == 'Broken Co':
+            raise Exception("connection reset")
+        return CompanyAnalysis(company_name, website_url, location, "Small (<10 employees)", 0, "<10",
+                               deal_potential_min=3600, deal_potential_max=7200)
+
+    monkeypatch.setattr(CompanyAnalysisTool, 'analyze', fake_analyze)
+    companies = [('Slow Co', 'https://slow.example', 'Orlando, FL'),
+                 ('Broken Co', 'https://broken.example', 'Orlando, FL')] + \
+                [(f'Co {i}', f'https://co{i}.example', 'Orlando, FL') for i in range(6)]
+
+    start = time.monotonic()
+    results = CompanyAnalysisTool().analyze_batch(companies)
+    assert time.monotonic() - start < 0.6
+
+    assert results[0].company_name == 'Slow Co'
+    assert isinstance(results[1], Exception) and str(results[1]) == "connection reset"
+    assert [r.company_name for r in results[2:]] == [f'Co {i}' for i in range(6)]
+
+    combined = CompanyBatchAnalysisTool()._run([
+        {'company_name': 'Co 1', 'website_url': 'https://co1.example', 'location': 'Orlando, FL'},
+        {'company_name': 'Broken Co', 'website_url': 'https://broken.example', 'location': 'Orlando, FL'},
+    ])
+    assert combined.startswith("BATCH ANALYSIS - 2 companies (1 failed)")
+    assert "Analysis error for Broken Co: connection reset" in combined
+
+
+def test_company_analysis_record_serializes_to_rows():
+    """Analysis results fill prospect sheet rows; other columns come from extra fields."""
+    analysis = score_pages("Turner Pest Control", "https://turnerpest.example/", "Orlando, FL",
+                           [ParsedPage.from_html(SAMPLE_PAGE), ParsedPage.from_html((FIXTURES_DIR / 'company_contact.html').read_bytes())])
+    assert analysis.company_size == "Medium (10-20 employees)" and analysis.employee_count == "10-20"
+    assert analysis.annual_value == 14000 and analysis.deal_range == "$11,200-$16,800"
+    assert not hasattr(analysis, '__dict__')
+
+    row = dict(zip(PROSPECT_COLUMNS, analysis.to_row(extra={'contact_person': 'Owner', 'address': '1852 McCoy Road'})))
+    assert row['Company Name'] == "Turner Pest Control"
+    assert row['Services'] == "Residential, Commercial, Termite"
+    assert row['Training Gaps'] == "; ".join(analysis.training_gaps)
+    assert row['Deal Potential Min'] == 11200 and row['Phone'] == '(407) 218-2020'
+    assert row['Contact Person'] == 'Owner' and row['Address'] == '1852 McCoy Road' and row['Notes'] == ''
+
+    restored = CompanyAnalysis.from_dict({**{column_key(c): v for c, v in row.items()}, 'size_score': '3'})
+    assert restored.training_gaps == analysis.training_gaps and restored.size_score == 3
+
+
+def test_analysis_cache_hits_only_for_same_content_and_rules(tmp_path):
+    """A stored analysis is reused until the page text, the rules or its age changes."""
+    cache = AnalysisCache(str(tmp_path))
+    analysis = score_pages("Turner Pest Control", "https://turnerpest.example/", "Orlando, FL",
+                           [ParsedPage.from_html(SAMPLE_PAGE)])
+    fingerprint = content_fingerprint(ParsedPage.from_html(SAMPLE_PAGE).text)
+    cache.put("https://turnerpest.example/", fingerprint, 'v1', analysis)
+
+    assert content_fingerprint("Family  owned\n since 1990") == content_fingerprint("Family owned since 1990")
+    assert cache.get("https://TurnerPest.example", fingerprint, 'v1') == analysis
+    assert cache.get("https://turnerpest.example/", fingerprint, 'v1', multi_page=False) is None
+    assert cache.get("https://turnerpest.example/", content_fingerprint("New homepage"), 'v1') is None
+    assert cache.get("https://turnerpest.example/", fingerprint, 'v2') is None
+
+    cache.max_age = 0
+    assert cache.get("https://turnerpest.example/", fingerprint, 'v1') is None
+
+
+def test_company_analysis_reuses_cached_result_for_unchanged_site(monkeypatch, tmp_path):
+    """Re-analyzing an unchanged site skips the crawl; a changed homepage re-scores it."""
+    monkeypatch.setattr(analysis_cache, '_shared_cache', AnalysisCache(str(tmp_path)))
+    homepage = {'html': SAMPLE_PAGE}
+    crawls = []
+
+    def fake_fetch_pages(self, url, multi_page, page=None):
+        assert page is not None, "the fingerprinted homepage should start the crawl"
+        crawls.append(url)
+        return [page]
+
+    monkeypatch.setattr(CompanyAnalysisTool, '_fetch_pages', fake_fetch_pages)
+    monkeypatch.setattr(CompanyAnalysisTool, '_fetch_homepage',
+                        lambda self, url: ParsedPage.from_html(homepage['html'], url))
+
+    tool = CompanyAnalysisTool()
+    first = tool.analyze("Turner Pest Control", "https://turnerpest.example/", "Orlando, FL")
+    second = tool.analyze("Turner Pest", "https://turnerpest.example/", "Winter Park, FL")
+    assert len(crawls) == 1
+    assert second.company_size == first.company_size and second.services == first.services
+    assert second.company_name == "Turner Pest" and second.location == "Winter Park, FL"
+
+    homepage['html'] = SAMPLE_PAGE.replace(b'</body>', b'<p>Now hiring technicians.</p></body>')
+    tool.analyze("Turner Pest Control", "https://turnerpest.example/", "Orlando, FL")
+    assert len(crawls) == 2
+    entries = list(tmp_path.glob('*.json'))
+    assert len(entries) == 1 and SCORING_RULES_VERSION in entries[0].read_text()
+
+
+def test_score_batch_matches_single_company_rules(monkeypatch):
+    """Bulk scoring agrees with score_company for every flag combination, with or without NumPy."""
+    rows = [{name: bool(bits >> i & 1) for i, name in enumerate(FEATURES)} for bits in range(2 ** len(FEATURES))]
+    expected = [score_company(row) for row in rows]
+
+    for numpy_module in (scoring.np, None):
+        monkeypatch.setattr(scoring, 'np', numpy_module)
+        columns = score_batch(feature_columns(rows))
+        for key in expected[0]:
+            assert list(columns[key]) == [scores[key] for scores in expected], key
+
+    assert score_company({'locations': True, 'fleet': True, 'images': True, 'no_training': True})['company_size'] \
+        == "Large (20+ employees)"
+
+
+def test_score_batch_rescores_100k_companies_quickly():
+    """100k companies are re-scored from feature columns in well under a second."""
+    count = 100_000
+    columns = {name: [(index * (offset + 3)) % 7 < 3 for index in range(count)]
+               for offset, name in enumerate(FEATURES)}
+
+    # The pure-Python fallback is only expected to finish, not to be fast
+    limit = 1.0 if scoring.np is not None else 10.0
+    start = time.monotonic()
+    scores = score_batch(columns)
+    assert time.monotonic() - start < limit
+    assert len(scores['annual_value']) == count
+    assert scores['annual_value'][0] == score_company({name: column[0] for name, column in columns.items()})['annual_value']
+
+
+class FakeSpreadsheet:
+    """Answers the Drive modifiedTime lookup with a settable revision."""
+
+    def __init__(self, revision='2025-06-18T09:00:00.000Z'):
+        self.id = 'spreadsheet-1'
+        self.revision = revision
+
+    def get_lastUpdateTime(self):
+        if isinstance(self.revision, Exception):
+            raise self.revision
+        return self.revision
+
+
+class FakeWorksheet:
+    """Records the write requests a gspread worksheet would receive."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, records=None, headers=None, values=None, spreadsheet=None):
+        self.id = next(self._ids)
+        self.records = records or []
+        self.headers = headers or []
+        self.values = values or ([list(self.records[0])] + [list(r.values()) for r in self.records]
+                                 if self.records else [])
+        self.spreadsheet = spreadsheet or FakeSpreadsheet()
+        self.requests = []
+        self.header_reads = 0
+
+    def row_values(self, row):
+        self.header_reads += 1
+        return self.headers if row == 1 else []
+
+    def batch_update(self, data, value_input_option=None):
+        self.requests.append((data, value_input_option))
+
+    def append_rows(self, values):
+        self.requests.append(('append_rows', values))
+
+    def append_row(self, values):
+        self.requests.append(('append_rows', [values]))
+
+    def get_all_records(self):
+        return self.records
+
+    def get(self, pad_values=False):
+        self.requests.append(('get', None))
+        return [list(row) for row in self.values]
+
+
+def test_sheet_write_buffer_sends_status_sync_as_one_request():
+    """50 four-cell status updates become one batch_update with one range per row."""
+    worksheet = FakeWorksheet()
+    with SheetWriteBuffer(worksheet) as buffer:
+        for row in range(2, 52):
+            buffer.update_row(row, ['Not Sent', '', '', ''], col=11)
+        buffer.update_row(7, ['Sent', '2025-06-18 09:00:00', '202', 'Active Campaign'], col=11)
+        buffer.update_cell(7, 21, 'Called back')
+        assert worksheet.requests == [] and buffer.pending_cells == 201
+
+    assert len(worksheet.requests) == 1
+    data, value_input_option = worksheet.requests[0]
+    assert value_input_option == 'USER_ENTERED'
+    assert len(data) == 51
+    assert data[0] == {'range': 'K2:N2', 'values': [['Not Sent', '', '', '']]}
+    assert {'range': 'K7:N7', 'values': [['Sent', '2025-06-18 09:00:00', '202', 'Active Campaign']]} in data
+    assert {'range': 'U7', 'values': [['Called back']]} in data
+    assert buffer.flush() == 0
+
+
+def test_sheet_write_buffer_flushes_by_size_and_age(monkeypatch):
+    """Writes go out once max_cells are pending or the oldest pending write is too old."""
+    worksheet = FakeWorksheet()
+    buffer = SheetWriteBuffer(worksheet, max_cells=8, max_delay=30)
+    for row in range(2, 5):
+        buffer.update_row(row, ['Sent', '', '', ''], col=11)
+    assert len(worksheet.requests) == 1 and buffer.pending_cells == 4
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, 'monotonic', lambda: now + 31)
+    buffer.update_cell(9, 11, 'Sent')
+    assert len(worksheet.requests) == 2 and buffer.pending_cells == 0
+
+
+def test_append_prospects_dedupes_and_chunks_rows(monkeypatch, tmp_path):
+    """Bulk adds skip invalid and known companies and write one request per chunk."""
+    monkeypatch.setattr(sheet_snapshot, '_shared_cache', SheetSnapshotCache(str(tmp_path / 'sheets.sqlite3')))
+    worksheet = FakeWorksheet(records=[{'Company Name': 'Turner Pest Control', 'Website': 'https://www.turnerpest.com',
+                                        'Phone': '(800) 225-5305'}])
+    prospects = [{'company_name': f'Company {i}', 'phone': f'(407) 555-{i:04d}', 'annual_value': 1000 + i}
+                 for i in range(1200)]
+    prospects += [
+        {'company_name': 'Turner Pest Control Inc', 'website': 'https://turnerpest.com/orlando'},
+        {'company_name': 'Company 7 LLC', 'phone': '407.555.0007'},
+        {'company_name': '', 'phone': '(407) 555-9999'},
+    ]
+
+    result = append_prospects(worksheet, prospects)
+    assert len(result.added) == 1200 and result.requests == 3
+    assert [p['company_name'] for p in result.duplicates] == ['Turner Pest Control Inc', 'Company 7 LLC']
+    assert len(result.invalid) == 1
+
+    chunks = [values for kind, values in worksheet.requests if kind == 'append_rows']
+    assert [len(chunk) for chunk in chunks] == [500, 500, 200]
+    assert len(chunks[0][0]) == len(PROSPECT_COLUMNS)
+    assert chunks[0][0][:3] == ['Company 0', '', '(407) 555-0000'] and chunks[0][0][14] == 1000
+
+
+# Column layout of the live prospect sheet, with the email tracking columns at K-N
+CAMPAIGN_SHEET_HEADERS = ["Company Name", "Website", "Phone", "Address", "Company Size", "Employees", "Services",
+                          "Pain Points", "Training Priority", "Annual Value", "Email Status", "Email Sent Date",
+                          "SendGrid Status", "Campaign Status", "Email", "Contact Person"]
+
+
+def test_sheet_schema_maps_fields_to_header_columns():
+    """Fields resolve by header or field name; adjacent fields become one A1 range."""
+    schema = SheetSchema(CAMPAIGN_SHEET_HEADERS)
+    assert schema.column('Email Status') == schema.column('email_status') == 11
+    assert schema.a1(5, 'Campaign Status') == 'N5'
+    assert schema.row_ranges(5, email_status_fields('Sent', '2025-06-18 09:00:00', '202', 'Active Campaign')) == [
+        {'range': 'K5:N5', 'values': [['Sent', '2025-06-18 09:00:00', '202', 'Active Campaign']]}]
+    assert schema.row_ranges(3, {'contact_person': 'Owner', 'phone': '(407) 555-0100', 'email': 'a@b.com'}) == [
+        {'range': 'C3', 'values': [['(407) 555-0100']]}, {'range': 'O3:P3', 'values': [['a@b.com', 'Owner']]}]
+
+    try:
+        schema.column('Training Gaps')
+        assert False, "expected UnknownColumn"
+    except UnknownColumn:
+        pass
+
+
+def test_status_updates_follow_the_sheet_header():
+    """Field-name writes land in the sheet's own columns and the header is read once."""
+    worksheet = FakeWorksheet(headers=["Company Name", "Email Status", "Email Sent Date", "SendGrid Status",
+                                       "Campaign Status", "Training Priority"])
+    with SheetWriteBuffer(worksheet) as buffer:
+        for row in (2, 3):
+            buffer.update_fields(row, email_status_fields('Sent', 'today', '202', 'Active Campaign'))
+        try:
+            buffer.update_fields(4, {'Email Status': 'Sent', 'Email Opened': 'Yes'})
+            assert False, "expected UnknownColumn"
+        except UnknownColumn:
+            pass
+
+    assert worksheet.header_reads == 1
+    data, _ = worksheet.requests[0]
+    assert [entry['range'] for entry in data] == ['B2:E2', 'B3:E3']
+
+
+def test_update_prospect_writes_one_request_by_header():
+    """update_prospect locates columns by header and writes a record in one batch_update."""
+    worksheet = FakeWorksheet(headers=CAMPAIGN_SHEET_HEADERS)
+    result = GoogleSheetsIntegrationTool()._update_prospect(
+        worksheet, {'training_priority': 'High', 'annual_value': 18000, 'email_status': 'Sent', 'notes': 'x'}, 7)
+
+    assert result == "Successfully updated row 7 in spreadsheet (no column for: notes)"
+    assert len(worksheet.requests) == 1
+    data, value_input_option = worksheet.requests[0]
+    assert data == [{'range': 'I7:K7', 'values': [['High', 18000, 'Sent']]}]
+    assert value_input_option == 'USER_ENTERED'
+
+
+def test_sheet_snapshot_rereads_only_when_the_revision_changes(tmp_path):
+    """Reads come from disk while Drive reports the same modifiedTime, even across runs."""
+    values = [CAMPAIGN_SHEET_HEADERS[:3] + ['Annual Value'],
+              ['Turner Pest Control', 'turnerpest.com', '(800) 225-5305', '18000'],
+              ['Gato Guard Services', '', '', '']]
+    worksheet = FakeWorksheet(values=values)
+    path = str(tmp_path / 'sheets.sqlite3')
+
+    cache = SheetSnapshotCache(path)
+    records = cache.get_all_records(worksheet)
+    assert records[0] == {'Company Name': 'Turner Pest Control', 'Website': 'turnerpest.com',
+                          'Phone': '(800) 225-5305', 'Annual Value': 18000}
+    assert records[1]['Annual Value'] == ''
+    assert cache.get_all_records(worksheet) == records and cache.reads == 1
+
+    next_run = SheetSnapshotCache(path)
+    assert next_run.get_all_records(worksheet) == records and next_run.reads == 0
+
+    worksheet.values[2][3] = '7200'
+    worksheet.spreadsheet.revision = '2025-06-18T10:30:00.000Z'
+    assert next_run.get_all_records(worksheet)[1]['Annual Value'] == 7200 and next_run.reads == 1
+
+    worksheet.spreadsheet.revision = RuntimeError('Drive API unavailable')
+    next_run.get_all_values(worksheet)
+    next_run.get_all_values(worksheet)
+    assert next_run.reads == 3
+
+
+def test_sheet_writes_drop_the_snapshot(monkeypatch, tmp_path):
+    """Writes force the next read even before Drive's revision moves."""
+    monkeypatch.setattr(sheet_snapshot, '_shared_cache', SheetSnapshotCache(str(tmp_path / 'sheets.sqlite3')))
+    worksheet = FakeWorksheet(headers=CAMPAIGN_SHEET_HEADERS, values=[CAMPAIGN_SHEET_HEADERS])
+    read_records(worksheet)
+    read_records(worksheet)
+    assert worksheet.requests.count(('get', None)) == 1
+
+    with SheetWriteBuffer(worksheet) as buffer:
+        buffer.update_fields(2, email_status_fields('Sent'))
+    read_records(worksheet)
+    assert worksheet.requests.count(('get', None)) == 2
+
+    # A process that only writes still drops the snapshot a reader stored
+    path = str(tmp_path / 'shared.sqlite3')
+    SheetSnapshotCache(path).get_all_values(worksheet)
+    monkeypatch.setenv('SHEETS_SNAPSHOT_PATH', path)
+    monkeypatch.setattr(sheet_snapshot, '_shared_cache', None)
+    GoogleSheetsIntegrationTool()._add_prospect(worksheet, {'company_name': 'Freedom Pest Inc'})
+    reader = SheetSnapshotCache(path)
+    reader.get_all_values(worksheet)
+    assert reader.reads == 1
+
+
+def test_sheet_sync_pushes_changed_cells_and_pulls_human_edits(tmp_path):
+    """Syncs write only changed cells, read the sheet only after it was edited, and flag conflicts."""
+    def row(name, phone='', status=''):
+        return [name, '', phone] + [''] * 7 + [status] + [''] * 5
+
+    worksheet = FakeWorksheet(headers=CAMPAIGN_SHEET_HEADERS, values=[
+        CAMPAIGN_SHEET_HEADERS, row('Turner Pest Control', '(800) 225-5305'), row('Gato Guard Services'),
+        row('Freedom Pest Inc', status='Not Sent')])
+    store = ProspectStore(str(tmp_path / 'prospects.sqlite3'))
+    sync = SheetSync(store, worksheet)
+
+    first = sync.sync()
+    assert first.read_sheet and first.requests == 1 and len(first.pulled) == 3
+    assert store.get('Freedom Pest Inc')['email_status'] == 'Not Sent'
+
+    assert store.update('Gato Guard Services', email_status_fields('Sent', '2025-06-18 09:00:00')) == 2
+    assert store.update('Turner Pest Control', {'Phone': '(800) 225-5305'}) == 0
+    pushed = sync.sync()
+    assert not pushed.read_sheet and pushed.requests == 1 and pushed.cells_pushed == 2
+    assert worksheet.requests[-1][0] == [{'range': 'K3:L3', 'values': [['Sent', '2025-06-18 09:00:00']]}]
+    worksheet.values[2][10:12] = ['Sent', '2025-06-18 09:00:00']
+
+    # A person fixes a phone number and bounces an email we are also changing
+    worksheet.values[1][2] = '(407) 555-0100'
+    worksheet.values[3][10] = 'Bounced'
+    worksheet.spreadsheet.revision = '2025-06-19T08:00:00.000Z'
+    store.update('Freedom Pest Inc', {'email_status': 'Sent'})
+    store.update('Lewis Cobb Pest Control', {'phone': '(407) 555-0199'})
+
+    merged = sync.sync()
+    assert merged.read_sheet and merged.pushed == {}
+    assert merged.pulled == {'Turner Pest Control': {'phone': '(407) 555-0100'},
+                             'Freedom Pest Inc': {'email_status': 'Bounced'}}
+    assert [(c.key, c.field, c.local, c.sheet) for c in merged.conflicts] == [
+        ('Freedom Pest Inc', 'email_status', 'Sent', 'Bounced')]
+    assert merged.appended == ['Lewis Cobb Pest Control'] and merged.requests == 2
+    assert worksheet.requests[-1][1][0][:3] == ['Lewis Cobb Pest Control', '', '(407) 555-0199']
+    assert store.get('Turner Pest Control')['phone'] == '(407) 555-0100'
+    assert store.get('Freedom Pest Inc')['email_status'] == 'Bounced'
+
+    assert sync.sync().requests == 0 and store.pending() == {}
+
+
+def test_sheet_sync_follows_moved_rows_and_leaves_duplicates_alone(tmp_path):
+    """Rows are found by company after rows move, duplicate rows are never reverted, and own writes cause no re-read."""
+    def row(name, status=''):
+        return [name, '', ''] + [''] * 7 + [status] + [''] * 5
+
+    worksheet = FakeWorksheet(headers=CAMPAIGN_SHEET_HEADERS, values=[
+        CAMPAIGN_SHEET_HEADERS, row('Turner Pest Control'), row('Gato Guard Services'), row('Freedom Pest Inc'),
+        row('Gato Guard Services', 'Not Sent')])
+    store = ProspectStore(str(tmp_path / 'prospects.sqlite3'))
+    sync = SheetSync(store, worksheet)
+
+    first = sync.sync()
+    assert first.duplicates == {'Gato Guard Services': [5]} and first.requests == 1
+    assert worksheet.values[4][10] == 'Not Sent'
+
+    # Someone deletes the first company, moving every row below it up
+    del worksheet.values[1]
+    worksheet.spreadsheet.revision = '2025-06-19T08:00:00.000Z'
+    assert sync.sync().removed == ['Turner Pest Control']
+
+    def batch_update(data, value_input_option=None):
+        worksheet.requests.append((data, value_input_option))
+        worksheet.spreadsheet.revision = '2025-06-19T09:00:00.000Z'
+
+    worksheet.batch_update = batch_update
+    store.update('Freedom Pest Inc', {'email_status': 'Sent'})
+    store.update('Gato Guard Services', {'email_status': 'Sent'})
+    pushed = sync.sync()
+    assert [entry['range'] for entry in worksheet.requests[-1][0]] == ['K2', 'K3', 'K4']
+    assert pushed.cells_pushed == 3 and pushed.duplicate_cells == 1
+
+    after = sync.sync()
+    assert not after.read_sheet and after.requests == 0
+    with store._connect() as db:
+        assert db.execute('SELECT COUNT(*) FROM changes').fetchone()[0] == 0
@@ -7,14 +7,16 @@ from .google_sheets_tool import GoogleSheetsIntegrationTool
 from .web_scraping_tool import WebScrapingTool
 
 try:
-    from .company_analysis_tool import CompanyAnalysisTool
+    from .company_analysis_tool import CompanyAnalysisTool, CompanyBatchAnalysisTool
 except ImportError:
     CompanyAnalysisTool = None
+    CompanyBatchAnalysisTool = None
 
 __all__ = [
     'ExampleTool',
     'PestControlResearchTool',
     'GoogleSheetsIntegrationTool',
     'WebScrapingTool',
-    'CompanyAnalysisTool'
+    'CompanyAnalysisTool',
+    'CompanyBatchAnalysisTool'
 ] 
\ No newline at end of file
@@ -1,18 +1,92 @@
 from langchain.tools import BaseTool
-from typing import Type, Dict, List, Optional
+from typing import Type, Dict, List, Optional, Tuple, Union
 from pydantic import BaseModel, Field
-import requests
-from bs4 import BeautifulSoup
-import re
-import time
-import random
 from urllib.parse import urljoin
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.analysis_cache import content_fingerprint, get_analysis_cache
+from utils.contact_extractor import extract_page_contacts
+from utils.http_client import get_http_client
+from utils.keyword_matcher import KeywordMatcher
+from utils.parsed_page import ParsedPage
+from utils.records import CompanyAnalysis
+from utils.robots import get_robots_cache
+from utils.scoring import (OPPORTUNITY_THRESHOLDS, PRIORITY_THRESHOLDS, SIZE_BUCKETS, SIZE_THRESHOLDS,
+                           SIZE_WEIGHTS, company_features, score_company, training_gaps)
+from utils.site_crawler import SiteCrawler
+
+# Keyword vocabularies for the analysis, compiled once into one matcher
+SIZE_KEYWORDS = ['team', 'staff', 'locations', 'offices', 'fleet', 'trucks']
+TRAINING_KEYWORDS = ['training', 'hiring', 'careers', 'quality', 'service', 'compliance', 'licensed']
+SERVICE_KEYWORDS = ['residential', 'commercial', 'termite', 'rodent', 'mosquito', 'bed bug', 'ant']
+DECISION_MAKER_KEYWORDS = ['owner', 'president', 'manager']
+ANALYSIS_MATCHER = KeywordMatcher(SIZE_KEYWORDS + TRAINING_KEYWORDS + SERVICE_KEYWORDS + DECISION_MAKER_KEYWORDS)
+
+# Pages linked from the homepage that carry size, hiring and leadership signals
+ANALYSIS_PAGE_KEYWORDS = ('about', 'team', 'staff', 'leadership', 'careers', 'jobs', 'employment',
+                          'locations', 'service-area', 'areas-we-serve', 'offices')
 
 class CompanyAnalysisInput(BaseModel):
     """Input for company analysis tool."""
     company_name: str = Field(description="Name of the company to analyze")
     website_url: str = Field(description="Company website URL")
     location: str = Field(description="Company location")
+    multi_page: bool = Field(description="Also analyze the about, team, careers and locations pages linked from the homepage", default=True)
+
+# Bump when the scoring logic in score_pages or utils.scoring changes; edits
+# to the keyword lists or scoring tables change SCORING_RULES_VERSION on their own
+SCORING_LOGIC_VERSION = 1
+SCORING_RULES_VERSION = hashlib.sha256(repr((
+    SCORING_LOGIC_VERSION, SIZE_KEYWORDS, TRAINING_KEYWORDS, SERVICE_KEYWORDS,
+    DECISION_MAKER_KEYWORDS, ANALYSIS_PAGE_KEYWORDS, SIZE_WEIGHTS, SIZE_THRESHOLDS, SIZE_BUCKETS,
+    PRIORITY_THRESHOLDS, OPPORTUNITY_THRESHOLDS
+)).encode('utf-8')).hexdigest()[:12]
+
+def score_pages(company_name: str, website_url: str, location: str, pages: List[ParsedPage]) -> CompanyAnalysis:
+    """Score a company from its parsed pages, pooling signals across all of them."""
+    # Every keyword below is found in one pass over each page's text
+    found = set()
+    for page in pages:
+        found |= ANALYSIS_MATCHER.find_all(page.text)
+    
+    # Size and training needs assessment (rules shared with bulk scoring)
+    features = company_features(found, max(len(page.soup.find_all('img')) for page in pages))
+    score = score_company(features)
+    
+    # Phone and email extraction, homepage first
+    contacts = [extract_page_contacts(page) for page in pages]
+    
+    return CompanyAnalysis(
+        company_name=company_name,
+        website=website_url,
+        location=location,
+        company_size=score['company_size'],
+        size_score=score['size_score'],
+        employee_count=score['employee_count'],
+        services=[keyword.title() for keyword in SERVICE_KEYWORDS if keyword in found],
+        training_priority=score['training_priority'],
+        training_gaps=training_gaps(features),
+        decision_makers=[keyword.title() for keyword in DECISION_MAKER_KEYWORDS if keyword in found],
+        deal_potential_min=score['deal_potential_min'],
+        deal_potential_max=score['deal_potential_max'],
+        opportunity_level=score['opportunity_level'],
+        phone=next((c.phone for c in contacts if c.phone), None),
+        email=next((c.email for c in contacts if c.email), None),
+        pages_analyzed=len(pages),
+    )
+
+class CompanyTarget(BaseModel):
+    """One company in a batch analysis."""
+    company_name: str = Field(description="Name of the company to analyze")
+    website_url: str = Field(description="Company website URL")
+    location: str = Field(description="Company location")
+
+class CompanyBatchAnalysisInput(BaseModel):
+    """Input for batch company analysis tool."""
+    companies: List[CompanyTarget] = Field(description="Companies to analyze, each with company_name, website_url and location")
+    multi_page: bool = Field(description="Also analyze the about, team, careers and locations pages linked from each homepage", default=True)
 
 class CompanyAnalysisTool(BaseTool):
     """Tool for analyzing real pest control companies to assess training needs and opportunities."""
@@ -20,107 +94,166 @@ class CompanyAnalysisTool(BaseTool):
     name: str = "company_analysis"
     description: str = """Use this tool to analyze a real pest control company's website and online presence 
     to determine company size, services, training needs, decision makers, and sales opportunity potential.
-    Requires company name, website URL, and location."""
+    Requires company name, website URL, and location. By default the about, team, careers and
+    locations pages are analyzed together with the homepage."""
     
     args_schema: Type[BaseModel] = CompanyAnalysisInput
     
-    def _get_session(self):
-        """Get requests session with headers."""
-        session = requests.Session()
-        session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        })
-        return session
+    # Most pages fetched per company in multi-page mode (homepage included)
+    max_pages: int = 6
     
-    def _run(self, company_name: str, website_url: str, location: str) -> str:
+    # Companies analyzed at once by analyze_batch
+    max_workers: int = 8
+    
+    # Reuse stored analyses of sites whose content has not changed
+    use_cache: bool = True
+    
+    def _fetch_pages(self, website_url: str, multi_page: bool,
+                     homepage: Optional[ParsedPage] = None) -> List[ParsedPage]:
+        """Fetch the homepage (unless given) and, in multi-page mode, its key linked pages concurrently."""
+        if not multi_page:
+            return [homepage or self._fetch_homepage(website_url)]
+        
+        crawler = SiteCrawler(max_pages=self.max_pages, use_sitemap=False, keywords=ANALYSIS_PAGE_KEYWORDS)
+        pages = crawler.crawl(website_url, homepage)
+        if not pages:
+            raise Exception(f"Could not load {website_url}")
+        return pages
+    
+    def analyze(self, company_name: str, website_url: str, location: str, multi_page: bool = True) -> CompanyAnalysis:
+        """Fetch and score a company's website, returning a structured result.
+        
+        If the homepage text and the scoring rules are unchanged since the
+        last analysis of this URL, the stored result is returned without
+        crawling or scoring again. Raises if the website cannot be loaded.
+        """
+        cache = get_analysis_cache() if self.use_cache else None
+        
+        homepage = None
+        if cache:
+            # The homepage fetched for the fingerprint also starts the crawl
+            homepage = self._fetch_homepage(website_url)
+            cached = cache.get(website_url, content_fingerprint(homepage.text), SCORING_RULES_VERSION, multi_page)
+            if cached:
+                cached.company_name = company_name
+                cached.location = location
+                return cached
+        
+        pages = self._fetch_pages(website_url, multi_page, homepage)
+        analysis = score_pages(company_name, website_url, location, pages)
+        
+        if cache:
+            cache.put(website_url, content_fingerprint(pages[0].text), SCORING_RULES_VERSION, analysis, multi_page)
+        return analysis
+    
+    def _fetch_homepage(self, website_url: str) -> ParsedPage:
+        """Fetch and parse the homepage (served from the HTTP cache when fresh)."""
+        get_robots_cache().check(website_url)
+        response = get_http_client().get(website_url)
+        response.raise_for_status()
+        return ParsedPage.from_html(response.content, website_url)
+    
+    def _run(self, company_name: str, website_url: str, location: str, multi_page: bool = True) -> str:
         """Analyze a real company for training needs and sales opportunities."""
         
         try:
-            session = self._get_session()
-            response = session.get(website_url, timeout=10)
-            soup = BeautifulSoup(response.content, "html.parser")
-            text = soup.get_text().lower()
-            
-            # Size assessment
-            size_score = 0
-            if "team" in text or "staff" in text: size_score += 1
-            if "locations" in text or "offices" in text: size_score += 2
-            if "fleet" in text or "trucks" in text: size_score += 1
-            if len(soup.find_all('img')) > 10: size_score += 1
-            
-            if size_score >= 4: size = "Large (20+ employees)"
-            elif size_score >= 2: size = "Medium (10-20 employees)"
-            else: size = "Small (<10 employees)"
+            return self._format_report(self.analyze(company_name, website_url, location, multi_page))
             
-            # Training needs assessment
-            gaps = []
-            if "training" not in text: gaps.append("No formal training mentioned")
-            if "hiring" in text or "careers" in text: gaps.append("Hiring challenges indicate training needs")
-            if "quality" in text and "service" in text: gaps.append("Quality focus suggests training opportunities")
-            if "compliance" in text or "licensed" in text: gaps.append("Compliance requirements")
-            
-            # Services analysis
-            services = []
-            service_keywords = ['residential', 'commercial', 'termite', 'rodent', 'mosquito', 'bed bug', 'ant']
-            for keyword in service_keywords:
-                if keyword in text:
-                    services.append(keyword.title())
-            
-            # Decision makers (basic extraction)
-            decision_makers = []
-            if "owner" in text: decision_makers.append("Owner")
-            if "president" in text: decision_makers.append("President") 
-            if "manager" in text: decision_makers.append("Manager")
-            
-            # Deal potential
-            deals = {
-                "Large (20+ employees)": "$15,000-$21,600",
-                "Medium (10-20 employees)": "$11,200-$16,800",
-                "Small (<10 employees)": "$3,600-$7,200"
-            }
-            
-            # Phone and email extraction
-            phone_match = re.search(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', soup.get_text())
-            phone = phone_match.group() if phone_match else "Not found"
-            
-            email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', soup.get_text())
-            email = email_match.group() if email_match else "Not found"
-            
-            return f"""COMPANY ANALYSIS REPORT - {company_name}
+        except Exception as e:
+            return f"Analysis error for {company_name}: {str(e)}"
+    
+    def _format_report(self, analysis: CompanyAnalysis) -> str:
+        """Format an analysis as the readable report agents get back."""
+        gaps = analysis.training_gaps
+        return f"""COMPANY ANALYSIS REPORT - {analysis.company_name}
 ================================
 
 📊 COMPANY OVERVIEW:
-Name: {company_name}
-Location: {location}
-Website: {website_url}
-Estimated Size: {size}
-Size Score: {size_score}/5
+Name: {analysis.company_name}
+Location: {analysis.location}
+Website: {analysis.website}
+Estimated Size: {analysis.company_size}
+Size Score: {analysis.size_score}/5
+Pages Analyzed: {analysis.pages_analyzed}
 
 🛠️ SERVICES OFFERED:
-{', '.join(services) if services else 'General pest control'}
+{', '.join(analysis.services) if analysis.services else 'General pest control'}
 
 🎓 TRAINING ASSESSMENT:
-Training Priority: {'High' if len(gaps) >= 3 else 'Medium' if len(gaps) >= 1 else 'Low'}
+Training Priority: {analysis.training_priority}
 Training Gaps Identified:
 {chr(10).join(f'  • {gap}' for gap in gaps)}
 
 👥 DECISION MAKERS:
-{', '.join(decision_makers) if decision_makers else 'Need further research'}
+{', '.join(analysis.decision_makers) if analysis.decision_makers else 'Need further research'}
 
 📞 CONTACT INFORMATION:
-Phone: {phone}
-Email: {email}
-Website: {website_url}
+Phone: {analysis.phone or 'Not found'}
+Email: {analysis.email or 'Not found'}
+Website: {analysis.website}
 
 💰 SALES OPPORTUNITY:
-Deal Potential: {deals.get(size, '$3,600-$7,200')}
-Opportunity Level: {'High' if len(gaps) >= 2 else 'Medium'}
+Deal Potential: {analysis.deal_range}
+Opportunity Level: {analysis.opportunity_level}
 
 This analysis is based on real website content."""
-            
-        except Exception as e:
-            return f"Analysis error for {company_name}: {str(e)}"
     
-    async def _arun(self, company_name: str, website_url: str, location: str) -> str:
+    async def _arun(self, company_name: str, website_url: str, location: str, multi_page: bool = True) -> str:
+        """Async version of the run method."""
+        return await asyncio.to_thread(self._run, company_name, website_url, location, multi_page)
+    
+    def analyze_batch(self, companies: List[Tuple[str, str, str]],
+                      multi_page: bool = True) -> List[Union[CompanyAnalysis, Exception]]:
+        """Analyze many (name, website_url, location) companies concurrently.
+        
+        Results come back in input order. A company that fails gets its
+        exception in its slot; the others are unaffected.
+        """
+        def analyze(company):
+            name, website_url, location = company
+            try:
+                return self.analyze(name, website_url, location, multi_page)
+            except Exception as e:
+                return e
+        
+        if not companies:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(companies))) as pool:
+            return list(pool.map(analyze, companies))
+
+class CompanyBatchAnalysisTool(BaseTool):
+    """Tool for analyzing a whole list of pest control companies in one call."""
+    
+    name: str = "company_batch_analysis"
+    description: str = """Use this tool to analyze several real pest control companies at once. Pass every
+    company as a list of objects with company_name, website_url and location. The companies are analyzed
+    in parallel and one report per company is returned, in the same order. Prefer this over calling
+    company_analysis once per company."""
+    
+    args_schema: Type[BaseModel] = CompanyBatchAnalysisInput
+    
+    def _run(self, companies: List, multi_page: bool = True) -> str:
+        """Analyze every company concurrently and join the reports."""
+        targets = []
+        for company in companies:
+            if isinstance(company, dict):
+                company = CompanyTarget(**company)
+            targets.append((company.company_name, company.website_url, company.location))
+        
+        tool = CompanyAnalysisTool()
+        results = tool.analyze_batch(targets, multi_page)
+        
+        reports = []
+        for (name, _, _), result in zip(targets, results):
+            if isinstance(result, Exception):
+                reports.append(f"Analysis error for {name}: {str(result)}")
+            else:
+                reports.append(tool._format_report(result))
+        failed = sum(1 for result in results if isinstance(result, Exception))
+        
+        header = f"BATCH ANALYSIS - {len(reports)} companies ({failed} failed)"
+        return header + "\n\n" + "\n\n".join(reports)
+    
+    async def _arun(self, companies: List, multi_page: bool = True) -> str:
         """Async version of the run method."""
-        return self._run(company_name, website_url, location) 
\ No newline at end of file
+        return await asyncio.to_thread(self._run, companies, multi_page) 
\ No newline at end of file
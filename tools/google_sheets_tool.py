@@ -1,5 +1,5 @@
 from langchain.tools import BaseTool
-from typing import Type, Dict, Any, Optional
+from typing import Type, Dict, Any, List, Optional
 from pydantic import BaseModel, Field
 import csv
 import io
@@ -9,18 +9,27 @@ import json
 import os
 from datetime import datetime
 
+from gspread.utils import ValueInputOption
+
+from utils.sheet_schema import schema_for
+from utils.sheet_snapshot import forget_snapshot, read_records
+from utils.sheet_writer import append_prospects, prospect_row
+
 class GoogleSheetsInput(BaseModel):
     """Input for Google Sheets operations."""
-    action: str = Field(description="Action to perform: add_prospect, update_prospect, get_prospects")
+    action: str = Field(description="Action to perform: add_prospect, add_prospects, update_prospect, get_prospects")
     company_data: Optional[Dict] = Field(description="Company data to add/update", default=None)
     row_number: Optional[int] = Field(description="Row number for updates", default=None)
+    prospects: Optional[List[Dict]] = Field(description="Companies to add in one call with add_prospects", default=None)
 
 class GoogleSheetsIntegrationTool(BaseTool):
     """Google Sheets integration tool for prospect tracking."""
     
     name: str = "google_sheets_integration"
     description: str = """Integrate with Google Sheets to manage prospect data. 
-    Actions: add_prospect, update_prospect, get_prospects"""
+    Actions: add_prospect, add_prospects, update_prospect, get_prospects.
+    Use add_prospects with a list of companies to add several at once; companies already
+    in the sheet are skipped."""
     
     args_schema: Type[BaseModel] = GoogleSheetsInput
     
@@ -42,7 +51,8 @@ class GoogleSheetsIntegrationTool(BaseTool):
             print(f"Google Sheets authentication error: {e}")
             return None
     
-    def _run(self, action: str, company_data: Optional[Dict] = None, row_number: Optional[int] = None) -> str:
+    def _run(self, action: str, company_data: Optional[Dict] = None, row_number: Optional[int] = None,
+             prospects: Optional[List[Dict]] = None) -> str:
         """Execute Google Sheets operations."""
         
         try:
@@ -57,6 +67,8 @@ class GoogleSheetsIntegrationTool(BaseTool):
             
             if action == "add_prospect":
                 return self._add_prospect(worksheet, company_data)
+            elif action == "add_prospects":
+                return self._add_prospects(worksheet, prospects)
             elif action == "update_prospect":
                 return self._update_prospect(worksheet, company_data, row_number)
             elif action == "get_prospects":
@@ -73,70 +85,52 @@ class GoogleSheetsIntegrationTool(BaseTool):
         if not company_data:
             return "Error: No company data provided"
         
-        # Map company data to spreadsheet columns
-        row_data = [
-            company_data.get('company_name', ''),
-            company_data.get('website', ''),
-            company_data.get('phone', ''),
-            company_data.get('email', ''),
-            company_data.get('address', ''),
-            company_data.get('contact_person', ''),
-            company_data.get('title', ''),
-            company_data.get('company_size', ''),
-            company_data.get('employee_count', ''),
-            company_data.get('services', ''),
-            company_data.get('training_priority', ''),
-            company_data.get('training_gaps', ''),
-            company_data.get('deal_potential_min', ''),
-            company_data.get('deal_potential_max', ''),
-            company_data.get('annual_value', ''),
-            company_data.get('opportunity_level', ''),
-            company_data.get('pain_points', ''),
-            company_data.get('campaign_angle', ''),
-            company_data.get('next_action', ''),
-            company_data.get('follow_up_date', ''),
-            company_data.get('notes', ''),
-            company_data.get('data_source', ''),
-            company_data.get('verification_status', ''),
-            company_data.get('last_updated', '')
-        ]
-        
-        # Add the row
-        worksheet.append_row(row_data)
+        # Map company data to spreadsheet columns and add the row
+        worksheet.append_row(prospect_row(company_data))
+        forget_snapshot(worksheet)
         
         return f"Successfully added {company_data.get('company_name', 'Unknown')} to spreadsheet"
     
+    def _add_prospects(self, worksheet, prospects: Optional[List[Dict]]) -> str:
+        """Add many prospects with one append request per chunk, skipping duplicates."""
+        
+        if not prospects:
+            return "Error: No prospects provided"
+        
+        result = append_prospects(worksheet, prospects)
+        
+        summary = f"Successfully added {len(result.added)} prospects to spreadsheet"
+        if result.duplicates:
+            names = ', '.join(str(p.get('company_name', '')) for p in result.duplicates)
+            summary += f"\nSkipped {len(result.duplicates)} already in the sheet: {names}"
+        if result.invalid:
+            summary += f"\nSkipped {len(result.invalid)} without a company name"
+        return summary
+    
     def _update_prospect(self, worksheet, company_data: Dict, row_number: int) -> str:
         """Update an existing prospect in the spreadsheet."""
         
         if not company_data or not row_number:
             return "Error: Missing company data or row number"
         
-        # Update specific cells
-        for col, value in company_data.items():
-            # Map column names to column numbers (simplified)
-            col_map = {
-                'company_name': 1, 'website': 2, 'phone': 3, 'email': 4,
-                'address': 5, 'contact_person': 6, 'title': 7,
-                'company_size': 8, 'employee_count': 9, 'services': 10,
-                'training_priority': 11, 'training_gaps': 12,
-                'deal_potential_min': 13, 'deal_potential_max': 14,
-                'annual_value': 15, 'opportunity_level': 16,
-                'pain_points': 17, 'campaign_angle': 18,
-                'next_action': 19, 'follow_up_date': 20,
-                'notes': 21, 'data_source': 22,
-                'verification_status': 23, 'last_updated': 24
-            }
-            
-            if col in col_map:
-                worksheet.update_cell(row_number, col_map[col], value)
+        # Columns are located by the sheet's own headers; neighbouring
+        # fields are written as one range and the whole update is one request
+        schema = schema_for(worksheet)
+        known, unknown = schema.split(company_data)
+        if known:
+            worksheet.batch_update(schema.row_ranges(row_number, known),
+                                   value_input_option=ValueInputOption.user_entered)
+            forget_snapshot(worksheet)
         
-        return f"Successfully updated row {row_number} in spreadsheet"
+        result = f"Successfully updated row {row_number} in spreadsheet"
+        if unknown:
+            result += f" (no column for: {', '.join(unknown)})"
+        return result
     
     def _get_prospects(self, worksheet) -> str:
         """Get all prospects from the spreadsheet."""
         
-        all_records = worksheet.get_all_records()
+        all_records = read_records(worksheet)
         
         if not all_records:
             return "No prospects found in spreadsheet"
@@ -153,9 +147,10 @@ class GoogleSheetsIntegrationTool(BaseTool):
         
         return summary
     
-    async def _arun(self, action: str, company_data: Optional[Dict] = None, row_number: Optional[int] = None) -> str:
+    async def _arun(self, action: str, company_data: Optional[Dict] = None, row_number: Optional[int] = None,
+                    prospects: Optional[List[Dict]] = None) -> str:
         """Async version of the run method."""
-        return self._run(action, company_data, row_number)
+        return self._run(action, company_data, row_number, prospects)
 
     def _create_campaign_template(self, campaign_name: str) -> str:
         """Create a template structure for the Google Sheets."""
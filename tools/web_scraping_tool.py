@@ -1,20 +1,52 @@
 from langchain.tools import BaseTool
-from typing import Type, Dict, List, Optional
+from typing import Type, AsyncIterator, Iterator, List, Optional
 from pydantic import BaseModel, Field
 import requests
-from bs4 import BeautifulSoup
-import time
-import random
 import re
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, parse_qs
 import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.html_parser import make_soup
+from utils.http_client import get_http_client
+from utils.keyword_matcher import KeywordMatcher
+from utils.async_fetcher import AsyncFetcher, iterate_sync
+from utils.contact_extractor import extract_contacts, extract_page_contacts
+from utils.parsed_page import ParsedPage
+from utils.records import CompanyRecord, merge_company_records
+from utils.robots import get_robots_cache
+
+# Keyword vocabularies, compiled once into single-pass matchers
+SERVICE_KEYWORDS = [
+    'residential', 'commercial', 'termite', 'rodent', 'ant', 'bed bug',
+    'mosquito', 'wildlife', 'inspection', 'treatment', 'extermination'
+]
+PEST_NAME_KEYWORDS = [
+    'pest', 'exterminator', 'termite', 'bug', 'rodent', 'ant',
+    'mosquito', 'wildlife', 'control', 'management', 'removal'
+]
+# Words that also count at the start of a fused name ("PestPro", "Termiteguard");
+# kept short so "Anthony's" or "Controlled Access" do not match
+PEST_NAME_PREFIXES = ['pest', 'termite']
+SERVICE_MATCHER = KeywordMatcher(SERVICE_KEYWORDS)
+PEST_NAME_MATCHER = KeywordMatcher(PEST_NAME_KEYWORDS)
+PEST_NAME_PREFIX_MATCHER = KeywordMatcher(PEST_NAME_PREFIXES, plurals=False, whole_words=False)
+
+# Directory sources queried together by source="all"
+DIRECTORY_SOURCES = ('google', 'yellowpages', 'yelp')
+SOURCES = DIRECTORY_SOURCES + ('websites', 'all')
+
+# Directory and social domains that are never a company's own website
+EXCLUDED_WEBSITE_DOMAINS = ['google.', 'yelp.', 'yellowpages.', 'facebook.']
 
 class WebScrapingInput(BaseModel):
     """Input for web scraping tool."""
     query: str = Field(description="Search query (e.g., 'pest control Orlando FL')")
     location: str = Field(description="Geographic location for search")
     max_results: int = Field(description="Maximum number of results to return", default=20)
-    source: str = Field(description="Source to scrape: 'google', 'yellowpages', 'yelp', 'websites'", default="google")
+    source: str = Field(description="Source to scrape: 'google', 'yellowpages', 'yelp', 'websites', or 'all' to search every directory at once", default="google")
+    output_format: str = Field(description="Output format: 'text' for a readable report or 'json' for structured records", default="text")
 
 class WebScrapingTool(BaseTool):
     """Professional web scraping tool for finding real pest control companies."""
@@ -22,67 +54,124 @@ class WebScrapingTool(BaseTool):
     name: str = "web_scraping"
     description: str = """Use this tool to find real pest control companies through web scraping. 
     Specify the search query, location, and source (google, yellowpages, yelp, or websites).
-    Returns actual company names, websites, phone numbers, and addresses."""
+    Use source 'all' to search Google, Yellow Pages and Yelp together in one call and get a
+    single de-duplicated list ranked by how many sources found each company.
+    Returns actual company names, websites, phone numbers, and addresses.
+    Set output_format to 'json' to get the companies as structured records."""
     
     args_schema: Type[BaseModel] = WebScrapingInput
     
-    def _get_session(self):
-        """Get a requests session with proper headers."""
-        session = requests.Session()
-        session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        })
-        return session
+    # Maximum number of company websites fetched at once
+    max_concurrency: int = 10
     
-    def _run(self, query: str, location: str, max_results: int = 20, source: str = "google") -> str:
+    def _run(self, query: str, location: str, max_results: int = 20, source: str = "google",
+             output_format: str = "text") -> str:
         """Execute web scraping based on source."""
         
+        if source not in SOURCES:
+            return "Invalid source. Use: google, yellowpages, yelp, websites, or all"
+        
         try:
-            if source == "google":
-                return self._scrape_google_search(query, location, max_results)
-            elif source == "yellowpages":
-                return self._scrape_yellowpages(query, location, max_results)
-            elif source == "yelp":
-                return self._scrape_yelp(query, location, max_results)
-            elif source == "websites":
-                return self._scrape_company_websites(query, location, max_results)
-            else:
-                return "Invalid source. Use: google, yellowpages, yelp, or websites"
+            companies = list(self.iter_companies(query, location, max_results, source))
+            return self._format_output(companies, self._source_info(source, query, location), output_format)
                 
         except Exception as e:
             return f"Scraping error: {str(e)}"
     
-    def _scrape_google_search(self, query: str, location: str, max_results: int) -> str:
+    def iter_companies(self, query: str, location: str, max_results: int = 20,
+                       source: str = "google") -> Iterator[CompanyRecord]:
+        """Yield company records one at a time as soon as each is extracted.
+        
+        Lets callers start analysis or Sheets writes on the first prospect
+        while slower sites are still being scraped.
+        """
+        if source == "google":
+            return self._iter_google(query, location, max_results)
+        elif source == "yellowpages":
+            return self._iter_yellowpages(query, location, max_results)
+        elif source == "yelp":
+            return self._iter_yelp(query, location, max_results)
+        elif source == "websites":
+            return iterate_sync(self._aiter_company_websites(query, location, max_results))
+        elif source == "all":
+            return iter(self._search_all(query, location, max_results))
+        raise ValueError(f"Invalid source: {source}")
+    
+    async def aiter_companies(self, query: str, location: str, max_results: int = 20,
+                              source: str = "google") -> AsyncIterator[CompanyRecord]:
+        """Async version of iter_companies."""
+        if source == "websites":
+            async for company in self._aiter_company_websites(query, location, max_results):
+                yield company
+            return
+        
+        companies = await asyncio.to_thread(lambda: list(self.iter_companies(query, location, max_results, source)))
+        for company in companies:
+            yield company
+    
+    def _source_info(self, source: str, query: str, location: str) -> str:
+        """Describe where a result set came from."""
+        labels = {
+            "google": f"Google Search: {query} {location}",
+            "yellowpages": f"Yellow Pages: {location}",
+            "yelp": f"Yelp: {location}",
+            "websites": f"Website Details: {location}",
+            "all": f"Google, Yellow Pages and Yelp: {query} {location}",
+        }
+        return labels.get(source, source)
+    
+    def _search_all(self, query: str, location: str, max_results: int) -> List[CompanyRecord]:
+        """Query every directory concurrently and merge the results.
+        
+        Listings of the same company are merged by website domain or phone
+        number. A source that fails is reported and skipped so the others
+        still return results.
+        """
+        searches = {
+            'google': self._search_google,
+            'yellowpages': self._search_yellowpages,
+            'yelp': self._search_yelp,
+        }
+        
+        with ThreadPoolExecutor(max_workers=len(DIRECTORY_SOURCES)) as pool:
+            futures = {source: pool.submit(searches[source], query, location, max_results)
+                       for source in DIRECTORY_SOURCES}
+        
+        companies = []
+        for source, future in futures.items():
+            try:
+                companies.extend(future.result())
+            except Exception as e:
+                print(f"Error searching {source}: {e}")
+        
+        return merge_company_records(companies, EXCLUDED_WEBSITE_DOMAINS)[:max_results]
+    
+    def _search_google(self, query: str, location: str, max_results: int) -> List[CompanyRecord]:
+        """Collect all Google results into a list."""
+        return list(self._iter_google(query, location, max_results))
+    
+    def _iter_google(self, query: str, location: str, max_results: int) -> Iterator[CompanyRecord]:
         """Scrape Google search results for pest control companies."""
         
         search_query = f"{query} {location}"
         url = f"https://www.google.com/search?q={search_query.replace(' ', '+')}"
         
-        try:
-            response = self._safe_request(url)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            companies = []
-            
-            # Look for business listings in Google results
-            business_results = soup.find_all('div', class_=['VkpGBb', 'g'])
-            
-            for result in business_results[:max_results]:
-                company_data = self._extract_google_business_info(result)
-                if company_data and self._is_pest_control_company(company_data.get('name', '')):
-                    companies.append(company_data)
-            
-            return self._format_companies_output(companies, f"Google Search: {search_query}")
-            
-        except Exception as e:
-            return f"Google search error: {str(e)}"
+        response = self._safe_request(url)
+        soup = make_soup(response.content)
+        
+        # Look for business listings in Google results
+        business_results = soup.find_all('div', class_=['VkpGBb', 'g'])
+        
+        for result in business_results[:max_results]:
+            company = self._extract_google_business_info(result)
+            if company and self._is_pest_control_company(company.name):
+                yield company
+    
+    def _search_yellowpages(self, query: str, location: str, max_results: int) -> List[CompanyRecord]:
+        """Collect all Yellow Pages results into a list."""
+        return list(self._iter_yellowpages(query, location, max_results))
     
-    def _scrape_yellowpages(self, query: str, location: str, max_results: int) -> str:
+    def _iter_yellowpages(self, query: str, location: str, max_results: int) -> Iterator[CompanyRecord]:
         """Scrape Yellow Pages for pest control companies."""
         
         # Format location for Yellow Pages URL
@@ -91,76 +180,64 @@ class WebScrapingTool(BaseTool):
         
         url = f"https://www.yellowpages.com/{location_formatted}/{query_formatted}"
         
-        try:
-            response = self._safe_request(url)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            companies = []
-            
-            # Yellow Pages business listings
-            listings = soup.find_all('div', class_=['info-section', 'info'])
-            
-            for listing in listings[:max_results]:
-                company_data = self._extract_yellowpages_info(listing)
-                if company_data:
-                    companies.append(company_data)
-            
-            return self._format_companies_output(companies, f"Yellow Pages: {location}")
-            
-        except Exception as e:
-            return f"Yellow Pages error: {str(e)}"
+        response = self._safe_request(url)
+        soup = make_soup(response.content)
+        
+        # Yellow Pages business listings
+        listings = soup.find_all('div', class_=['info-section', 'info'])
+        
+        for listing in listings[:max_results]:
+            company = self._extract_yellowpages_info(listing)
+            if company:
+                yield company
+    
+    def _search_yelp(self, query: str, location: str, max_results: int) -> List[CompanyRecord]:
+        """Collect all Yelp results into a list."""
+        return list(self._iter_yelp(query, location, max_results))
     
-    def _scrape_yelp(self, query: str, location: str, max_results: int) -> str:
+    def _iter_yelp(self, query: str, location: str, max_results: int) -> Iterator[CompanyRecord]:
         """Scrape Yelp for pest control companies."""
         
         search_url = f"https://www.yelp.com/search?find_desc={query.replace(' ', '+')}&find_loc={location.replace(' ', '+')}"
         
-        try:
-            response = self._safe_request(search_url)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            companies = []
-            
-            # Yelp business containers
-            business_containers = soup.find_all('div', {'data-testid': 'serp-ia-card'})
-            
-            for container in business_containers[:max_results]:
-                company_data = self._extract_yelp_info(container)
-                if company_data:
-                    companies.append(company_data)
-            
-            return self._format_companies_output(companies, f"Yelp: {location}")
-            
-        except Exception as e:
-            return f"Yelp error: {str(e)}"
+        response = self._safe_request(search_url)
+        soup = make_soup(response.content)
+        
+        # Yelp business containers
+        business_containers = soup.find_all('div', {'data-testid': 'serp-ia-card'})
+        
+        for container in business_containers[:max_results]:
+            company = self._extract_yelp_info(container)
+            if company:
+                yield company
+    
+    async def _asearch_company_websites(self, query: str, location: str, max_results: int) -> List[CompanyRecord]:
+        """Collect all company website results into a list."""
+        return [company async for company in self._aiter_company_websites(query, location, max_results)]
     
-    def _scrape_company_websites(self, query: str, location: str, max_results: int) -> str:
-        """Visit actual company websites to extract detailed information."""
+    async def _aiter_company_websites(self, query: str, location: str, max_results: int) -> AsyncIterator[CompanyRecord]:
+        """Fetch company websites concurrently, yielding each company as its site is parsed.
         
-        # First get a list of websites from Google search
-        google_results = self._scrape_google_search(query, location, max_results)
+        Different hosts are fetched in parallel; requests to the same host are
+        serialized and paced by the shared rate limiter.
+        """
         
-        # Extract website URLs from the results
-        websites = self._extract_websites_from_results(google_results)
+        # First get companies from Google search and take their websites
+        google_companies = await asyncio.to_thread(self._search_google, query, location, max_results)
+        websites = self._extract_websites(google_companies)[:max_results]
         
-        detailed_companies = []
+        fetcher = AsyncFetcher(max_concurrency=self.max_concurrency, robots=get_robots_cache())
         
-        for website in websites[:max_results]:
-            try:
-                company_details = self._scrape_individual_website(website)
-                if company_details:
-                    detailed_companies.append(company_details)
-                
-                # Rate limiting
-                time.sleep(random.uniform(1, 3))
-                
-            except Exception as e:
-                print(f"Error scraping {website}: {e}")
+        async for website, response in fetcher.fetch_as_completed(websites):
+            if isinstance(response, Exception):
+                print(f"Error scraping {website}: {response}")
                 continue
-        
-        return self._format_companies_output(detailed_companies, f"Website Details: {location}")
+            
+            company = self._parse_company_website(website, response)
+            if company:
+                yield company
     
-    def _extract_google_business_info(self, result_element) -> Optional[Dict]:
+    def _extract_google_business_info(self, result_element) -> Optional[CompanyRecord]:
         """Extract business information from Google search result."""
         
         try:
@@ -172,30 +249,26 @@ class WebScrapingTool(BaseTool):
             link_elem = result_element.find('a', href=True)
             website = link_elem['href'] if link_elem else None
             
-            # Phone number (look for patterns)
-            text_content = result_element.get_text()
-            phone_match = re.search(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', text_content)
-            phone = phone_match.group() if phone_match else None
-            
-            # Address (look for common address patterns)
-            address_match = re.search(r'\d+\s+[A-Za-z\s]+(?:St|Street|Ave|Avenue|Rd|Road|Blvd|Boulevard|Dr|Drive)', text_content)
-            address = address_match.group() if address_match else None
+            # Phone number and address in one pass over the result text
+            contacts = extract_contacts(result_element.get_text())
+            phone = contacts.phone
+            address = contacts.address
             
             if name:
-                return {
-                    'name': name,
-                    'website': website,
-                    'phone': phone,
-                    'address': address,
-                    'source': 'Google Search'
-                }
+                return CompanyRecord(
+                    name=name,
+                    website=self._unwrap_google_link(website),
+                    phone=phone,
+                    address=address,
+                    source='Google Search'
+                )
             
         except Exception as e:
             print(f"Error extracting Google info: {e}")
         
         return None
     
-    def _extract_yellowpages_info(self, listing_element) -> Optional[Dict]:
+    def _extract_yellowpages_info(self, listing_element) -> Optional[CompanyRecord]:
         """Extract business information from Yellow Pages listing."""
         
         try:
@@ -216,20 +289,20 @@ class WebScrapingTool(BaseTool):
             website = website_elem.get('href') if website_elem else None
             
             if name:
-                return {
-                    'name': name,
-                    'phone': phone,
-                    'address': address,
-                    'website': website,
-                    'source': 'Yellow Pages'
-                }
+                return CompanyRecord(
+                    name=name,
+                    phone=phone,
+                    address=address,
+                    website=website,
+                    source='Yellow Pages'
+                )
                 
         except Exception as e:
             print(f"Error extracting Yellow Pages info: {e}")
         
         return None
     
-    def _extract_yelp_info(self, container_element) -> Optional[Dict]:
+    def _extract_yelp_info(self, container_element) -> Optional[CompanyRecord]:
         """Extract business information from Yelp listing."""
         
         try:
@@ -246,129 +319,76 @@ class WebScrapingTool(BaseTool):
             phone = phone_elem.strip() if phone_elem else None
             
             if name:
-                return {
-                    'name': name,
-                    'address': address,
-                    'phone': phone,
-                    'source': 'Yelp'
-                }
+                return CompanyRecord(
+                    name=name,
+                    address=address,
+                    phone=phone,
+                    source='Yelp'
+                )
                 
         except Exception as e:
             print(f"Error extracting Yelp info: {e}")
         
         return None
     
-    def _scrape_individual_website(self, website_url: str) -> Optional[Dict]:
+    def _scrape_individual_website(self, website_url: str) -> Optional[CompanyRecord]:
         """Scrape individual company website for detailed information."""
         
         try:
             response = self._safe_request(website_url)
-            soup = BeautifulSoup(response.content, 'html.parser')
+        except Exception as e:
+            print(f"Error scraping website {website_url}: {e}")
+            return None
+        
+        return self._parse_company_website(website_url, response)
+    
+    def _parse_company_website(self, website_url: str, response: requests.Response) -> Optional[CompanyRecord]:
+        """Extract detailed company information from a fetched website."""
+        
+        try:
+            # Parse once; every extractor shares the page's cached views
+            page = ParsedPage.from_html(response.content, website_url)
             
             # Extract company name (from title, h1, or header)
-            name = self._extract_company_name(soup)
+            name = self._extract_company_name(page)
             
-            # Extract contact information
-            phone = self._extract_phone_from_website(soup)
-            email = self._extract_email_from_website(soup)
-            address = self._extract_address_from_website(soup)
+            # Extract all contact information in one pass
+            contacts = extract_page_contacts(page)
             
             # Extract services offered
-            services = self._extract_services(soup)
-            
-            return {
-                'name': name,
-                'website': website_url,
-                'phone': phone,
-                'email': email,
-                'address': address,
-                'services': services,
-                'source': 'Website Scraping'
-            }
+            services = self._extract_services(page)
+            
+            return CompanyRecord(
+                name=name,
+                website=website_url,
+                phone=contacts.phone,
+                email=contacts.email,
+                address=contacts.address,
+                social=contacts.social,
+                services=services,
+                source='Website Scraping'
+            )
             
         except Exception as e:
             print(f"Error scraping website {website_url}: {e}")
             return None
     
-    def _extract_company_name(self, soup: BeautifulSoup) -> str:
+    def _extract_company_name(self, page: ParsedPage) -> str:
         """Extract company name from website."""
-        # Try title tag first
-        title = soup.find('title')
-        if title:
-            return title.get_text(strip=True)
-        
-        # Try main heading
-        h1 = soup.find('h1')
-        if h1:
-            return h1.get_text(strip=True)
-        
-        return "Unknown Company"
-    
-    def _extract_phone_from_website(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract phone number from website."""
-        text_content = soup.get_text()
-        phone_patterns = [
-            r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-            r'\d{3}-\d{3}-\d{4}',
-            r'\(\d{3}\)\s*\d{3}-\d{4}'
-        ]
-        
-        for pattern in phone_patterns:
-            match = re.search(pattern, text_content)
-            if match:
-                return match.group()
-        
-        return None
-    
-    def _extract_email_from_website(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract email address from website."""
-        text_content = soup.get_text()
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        match = re.search(email_pattern, text_content)
-        return match.group() if match else None
-    
-    def _extract_address_from_website(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract address from website."""
-        # Look for address-related text
-        address_indicators = ['address', 'location', 'contact']
-        
-        for indicator in address_indicators:
-            element = soup.find(text=re.compile(indicator, re.I))
-            if element:
-                parent = element.parent
-                if parent:
-                    text = parent.get_text(strip=True)
-                    # Look for address pattern
-                    address_match = re.search(r'\d+\s+[A-Za-z\s]+(?:St|Street|Ave|Avenue|Rd|Road|Blvd|Boulevard|Dr|Drive)', text)
-                    if address_match:
-                        return address_match.group()
-        
-        return None
+        # Title tag first, then main heading
+        return page.title or "Unknown Company"
     
-    def _extract_services(self, soup: BeautifulSoup) -> List[str]:
+    def _extract_services(self, page: ParsedPage) -> List[str]:
         """Extract services offered from website."""
-        services = []
-        service_keywords = [
-            'residential', 'commercial', 'termite', 'rodent', 'ant', 'bed bug',
-            'mosquito', 'wildlife', 'inspection', 'treatment', 'extermination'
-        ]
-        
-        text_content = soup.get_text().lower()
-        
-        for keyword in service_keywords:
-            if keyword in text_content:
-                services.append(keyword.title())
-        
-        return services
+        return [keyword.title() for keyword in SERVICE_MATCHER.matches_in_order(page.text)]
     
     def _safe_request(self, url: str) -> requests.Response:
         """Make a safe HTTP request with proper headers and error handling."""
         try:
-            # Random delay to avoid being blocked
-            time.sleep(random.uniform(0.5, 2.0))
-            
-            session = self._get_session()
-            response = session.get(url, timeout=10)
+            # Skip paths the site's robots.txt disallows
+            get_robots_cache().check(url)
+            # Cached, per-host rate limited fetch to avoid being blocked
+            response = get_http_client().get(url)
             response.raise_for_status()
             return response
             
@@ -377,29 +397,39 @@ class WebScrapingTool(BaseTool):
     
     def _is_pest_control_company(self, company_name: str) -> bool:
         """Check if company name indicates it's a pest control business."""
-        pest_keywords = [
-            'pest', 'exterminator', 'termite', 'bug', 'rodent', 'ant',
-            'mosquito', 'wildlife', 'control', 'management', 'removal'
-        ]
+        return PEST_NAME_MATCHER.search(company_name) or PEST_NAME_PREFIX_MATCHER.search(company_name)
+    
+    def _unwrap_google_link(self, href: Optional[str]) -> Optional[str]:
+        """Turn Google's /url?q=<target> redirect links into the target URL."""
+        if href and href.startswith('/url?'):
+            return parse_qs(urlparse(href).query).get('q', [None])[0]
+        return href
+    
+    def _extract_websites(self, companies: List[CompanyRecord]) -> List[str]:
+        """Collect unique company websites, skipping directory and social sites."""
+        websites = []
+        for company in companies:
+            url = company.website
+            if not url or not url.startswith(('http://', 'https://')):
+                continue
+            if any(exclude in url for exclude in EXCLUDED_WEBSITE_DOMAINS):
+                continue
+            if url not in websites:
+                websites.append(url)
         
-        name_lower = company_name.lower()
-        return any(keyword in name_lower for keyword in pest_keywords)
+        return websites
     
-    def _extract_websites_from_results(self, results_text: str) -> List[str]:
-        """Extract website URLs from search results text."""
-        # This is a simplified extraction - in practice you'd parse the structured data
-        url_pattern = r'https?://[^\s<>"\']+\.[^\s<>"\']*'
-        urls = re.findall(url_pattern, results_text)
-        
-        # Filter for likely company websites (not Google, Yelp, etc.)
-        filtered_urls = []
-        for url in urls:
-            if not any(exclude in url for exclude in ['google.', 'yelp.', 'yellowpages.', 'facebook.']):
-                filtered_urls.append(url)
-        
-        return filtered_urls[:10]  # Limit to 10 websites
+    def _format_output(self, companies: List[CompanyRecord], source_info: str, output_format: str = "text") -> str:
+        """Render companies as a readable report or as JSON records."""
+        if output_format == "json":
+            return json.dumps({
+                'source': source_info,
+                'count': len(companies),
+                'companies': [company.to_dict() for company in companies]
+            }, indent=2)
+        return self._format_companies_output(companies, source_info)
     
-    def _format_companies_output(self, companies: List[Dict], source_info: str) -> str:
+    def _format_companies_output(self, companies: List[CompanyRecord], source_info: str) -> str:
         """Format the companies data into a readable output."""
         
         if not companies:
@@ -409,30 +439,42 @@ class WebScrapingTool(BaseTool):
         output += "=" * (len(source_info) + 25) + "\n\n"
         
         for i, company in enumerate(companies, 1):
-            output += f"{i}. {company.get('name', 'Unknown Company')}\n"
+            output += f"{i}. {company.name or 'Unknown Company'}\n"
+            
+            if company.website:
+                output += f"   Website: {company.website}\n"
             
-            if company.get('website'):
-                output += f"   Website: {company['website']}\n"
+            if company.phone:
+                output += f"   Phone: {company.phone}\n"
             
-            if company.get('phone'):
-                output += f"   Phone: {company['phone']}\n"
+            if company.email:
+                output += f"   Email: {company.email}\n"
             
-            if company.get('email'):
-                output += f"   Email: {company['email']}\n"
+            if company.address:
+                output += f"   Address: {company.address}\n"
             
-            if company.get('address'):
-                output += f"   Address: {company['address']}\n"
+            if company.services:
+                output += f"   Services: {', '.join(company.services)}\n"
             
-            if company.get('services'):
-                output += f"   Services: {', '.join(company['services'])}\n"
+            if company.social:
+                output += f"   Social: {', '.join(company.social.values())}\n"
             
-            output += f"   Source: {company.get('source', 'Unknown')}\n\n"
+            output += f"   Source: {company.source}\n\n"
         
         output += f"Total verified companies found: {len(companies)}\n"
         output += "All data sourced from real websites and directories.\n"
         
         return output
     
-    async def _arun(self, query: str, location: str, max_results: int = 20, source: str = "google") -> str:
+    async def _arun(self, query: str, location: str, max_results: int = 20, source: str = "google",
+                    output_format: str = "text") -> str:
         """Async version of the run method."""
-        return self._run(query, location, max_results, source) 
\ No newline at end of file
+        
+        try:
+            if source == "websites":
+                companies = [company async for company in self.aiter_companies(query, location, max_results, source)]
+                return self._format_output(companies, self._source_info(source, query, location), output_format)
+            return await asyncio.to_thread(self._run, query, location, max_results, source, output_format)
+        
+        except Exception as e:
+            return f"Scraping error: {str(e)}"
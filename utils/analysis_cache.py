@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Optional
+
+from utils.records import CompanyAnalysis
+from utils.urls import normalize_url
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def content_fingerprint(text: str) -> str:
+    """Hash a page's visible text, ignoring whitespace-only differences.
+
+    Hashing the text rather than the raw HTML keeps per-request noise
+    (nonces, CSRF tokens, cache-busting query strings) from looking like a
+    content change.
+    """
+    return hashlib.sha256(_WHITESPACE.sub(' ', text or '').strip().encode('utf-8')).hexdigest()
+
+
+class AnalysisCache:
+    """Persistent store of company analyses, reused while nothing has changed.
+
+    One ``<sha256>.json`` entry per analyzed URL (and page mode) under
+    ``cache_dir`` holds the last result together with the content
+    fingerprint and scoring-rules version it was computed from. A lookup
+    only hits when both still match and the entry is younger than
+    ``max_age``, so a changed site, changed rules or an old entry all
+    trigger a fresh analysis.
+    """
+
+    def __init__(self, cache_dir: str = '.cache/analysis', max_age: float = 30 * 86400):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url: str, multi_page: bool) -> str:
+        key = f"{normalize_url(url)}|{'site' if multi_page else 'home'}"
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, url: str, fingerprint: str, rules_version: str, multi_page: bool = True) -> Optional[CompanyAnalysis]:
+        """Return the stored analysis if it was made from the same content and rules."""
+        try:
+            with open(self._path(url, multi_page), 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get('fingerprint') != fingerprint or entry.get('rules_version') != rules_version:
+            return None
+        if time.time() - entry.get('analyzed_at', 0) >= self.max_age:
+            return None
+        return CompanyAnalysis.from_dict(entry['result'])
+
+    def put(self, url: str, fingerprint: str, rules_version: str, analysis: CompanyAnalysis, multi_page: bool = True):
+        """Store an analysis, replacing any older entry for the URL."""
+        path = self._path(url, multi_page)
+        entry = {
+            'url': url,
+            'fingerprint': fingerprint,
+            'rules_version': rules_version,
+            'analyzed_at': time.time(),
+            'result': analysis.to_dict(),
+        }
+        # Write-then-rename so concurrent readers never see a partial file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    def clear(self):
+        """Delete every stored analysis."""
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.json'):
+                os.remove(os.path.join(self.cache_dir, name))
+
+
+_shared_cache: Optional[AnalysisCache] = None
+_shared_lock = threading.Lock()
+_UNSET = object()
+
+
+def _default_cache() -> Optional[AnalysisCache]:
+    """Build the analysis cache from ANALYSIS_CACHE_DIR (empty disables it)."""
+    cache_dir = os.getenv('ANALYSIS_CACHE_DIR', '.cache/analysis')
+    return AnalysisCache(cache_dir) if cache_dir else None
+
+
+def get_analysis_cache() -> Optional[AnalysisCache]:
+    """Return the process-wide analysis cache (None when disabled), creating it on first use."""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                _shared_cache = _default_cache() or _UNSET
+    return None if _shared_cache is _UNSET else _shared_cache
+
+
+def configure_analysis_cache(**kwargs) -> AnalysisCache:
+    """Replace the shared analysis cache with one built from the given settings."""
+    global _shared_cache
+    with _shared_lock:
+        _shared_cache = AnalysisCache(**kwargs)
+    return _shared_cache
@@ -0,0 +1,155 @@
+import asyncio
+import queue
+import threading
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
+
+import requests
+
+from utils.http_client import HttpClient, get_http_client
+from utils.rate_limiter import RateLimiter, get_rate_limiter
+from utils.robots import DisallowedByRobots, RobotsCache
+from utils.urls import host_of
+
+
+def run_sync(coro):
+    """Run a coroutine to completion from synchronous code.
+
+    Uses ``asyncio.run`` normally; if the calling thread already has a running
+    event loop (e.g. a sync tool call made from inside an agent's loop), the
+    coroutine is run on a helper thread instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    result = {}
+
+    def runner():
+        try:
+            result['value'] = asyncio.run(coro)
+        except BaseException as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=runner)
+    thread.start()
+    thread.join()
+    if 'error' in result:
+        raise result['error']
+    return result['value']
+
+
+_DONE = object()
+
+
+def iterate_sync(agen: AsyncIterator) -> Iterator:
+    """Consume an async iterator from synchronous code, item by item.
+
+    The async iterator runs on its own event loop in a helper thread and each
+    item is handed over as soon as it is produced, so the caller can start
+    working on the first result while the rest are still being fetched.
+    """
+    items: queue.Queue = queue.Queue()
+
+    async def drain():
+        try:
+            async for item in agen:
+                items.put((True, item))
+        except BaseException as e:
+            items.put((False, e))
+        finally:
+            items.put((True, _DONE))
+
+    thread = threading.Thread(target=lambda: asyncio.run(drain()), daemon=True)
+    thread.start()
+
+    while True:
+        ok, item = items.get()
+        if not ok:
+            raise item
+        if item is _DONE:
+            break
+        yield item
+    thread.join()
+
+
+class AsyncFetcher:
+    """Concurrent page fetcher with a global limit and per-host politeness.
+
+    Requests to different hosts run in parallel (up to ``max_concurrency``);
+    at most ``per_host_concurrency`` requests to the same host are in flight
+    at once, and they are paced by the per-host token bucket of the
+    ``RateLimiter`` (the shared one by default). Blocking I/O
+    goes through the shared pooled ``HttpClient`` on worker threads. With a
+    ``robots`` cache, URLs forbidden by the site's robots.txt raise
+    ``DisallowedByRobots`` instead of being requested.
+    """
+
+    def __init__(self, max_concurrency: int = 10, rate_limiter: Optional[RateLimiter] = None,
+                 client: Optional[HttpClient] = None, robots: Optional[RobotsCache] = None,
+                 per_host_concurrency: int = 1):
+        self.max_concurrency = max_concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.client = client or get_http_client()
+        self.robots = robots
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    def _slots(self, url: str) -> Tuple[asyncio.Semaphore, asyncio.Semaphore]:
+        """The global and per-host semaphores for the running event loop.
+
+        A semaphore is tied to the loop it was first awaited on, so each new
+        loop (e.g. every run_sync call) gets a fresh set.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._host_slots = {}
+        host = host_of(url)
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return self._semaphore, self._host_slots[host]
+
+    async def fetch(self, url: str, **kwargs) -> requests.Response:
+        """Fetch one URL, honoring the host's rate limit.
+
+        Fresh cache hits are returned straight away without throttling.
+        """
+        response = self.client.cached(url)
+        if response is not None:
+            return response
+
+        if self.robots and not await asyncio.to_thread(self.robots.allowed, url):
+            raise DisallowedByRobots(f"robots.txt disallows {url}")
+
+        global_slot, host_slot = self._slots(url)
+
+        async with host_slot:
+            await self.rate_limiter.acquire_async(url)
+            async with global_slot:
+                response = await asyncio.to_thread(self.client.get, url, throttle=False, **kwargs)
+
+        response.raise_for_status()
+        return response
+
+    async def fetch_as_completed(self, urls: List[str], **kwargs) -> AsyncIterator[Tuple[str, Union[requests.Response, Exception]]]:
+        """Yield (url, response) pairs as each fetch finishes; failures come back as exceptions."""
+
+        async def fetch_one(url):
+            try:
+                return url, await self.fetch(url, **kwargs)
+            except Exception as e:
+                return url, e
+
+        for next_done in asyncio.as_completed([fetch_one(url) for url in urls]):
+            yield await next_done
+
+    async def fetch_all(self, urls: List[str], **kwargs) -> List[Union[requests.Response, Exception]]:
+        """Fetch many URLs concurrently; failures are returned in place as exceptions."""
+        return await asyncio.gather(
+            *(self.fetch(url, **kwargs) for url in urls),
+            return_exceptions=True
+        )
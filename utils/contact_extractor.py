@@ -0,0 +1,107 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from utils.parsed_page import ParsedPage
+
+# One alternation scanned with a single finditer pass. Each branch is anchored
+# with a lookbehind so matching only starts at token boundaries.
+CONTACT_PATTERN = re.compile(r"""
+    (?P<social>https?://(?:www\.)?
+        (?P<platform>facebook|linkedin|instagram|twitter|x|youtube|yelp)\.com/[^\s"'<>]+)
+  | (?<![A-Za-z0-9._%+-])
+    (?P<email>[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,})
+  | (?<![\d\w])
+    (?P<phone>(?:\+?1[-.\s]?)?\(?[2-9]\d{2}\)?[-.\s]?\d{3}[-.\s]?\d{4})(?!\d)
+  | (?<![\w])
+    (?P<address>\d{1,6}\s+(?:[A-Za-z0-9.'-]+\s+){0,5}?
+        (?i:street|st|avenue|ave|road|rd|boulevard|blvd|drive|dr|lane|ln|parkway|pkwy|
+            highway|hwy|way|court|ct|circle|cir|trail|trl|place|pl)\b\.?
+        (?:,\s*[A-Za-z .]{2,30},\s*[A-Z]{2}(?:\s+\d{5}(?:-\d{4})?)?)?)
+""", re.VERBOSE)
+
+# Match group -> ContactInfo list it collects into
+_FIELDS = {'phone': 'phones', 'email': 'emails', 'address': 'addresses'}
+
+_NON_DIGITS = re.compile(r'\D')
+_SPACES = re.compile(r'\s+')
+
+
+def normalize_phone(raw: str) -> Optional[str]:
+    """Format a US phone number as (XXX) XXX-XXXX, or None if it is not one."""
+    digits = _NON_DIGITS.sub('', raw or '')
+    if len(digits) == 11 and digits[0] == '1':
+        digits = digits[1:]
+    if len(digits) != 10:
+        return None
+    return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
+
+
+def phone_e164(raw: str) -> Optional[str]:
+    """Return a US phone number in E.164 form (+1XXXXXXXXXX), or None."""
+    formatted = normalize_phone(raw)
+    return '+1' + _NON_DIGITS.sub('', formatted) if formatted else None
+
+
+def normalize_email(raw: str) -> str:
+    """Lowercase an email address and strip surrounding punctuation."""
+    return (raw or '').strip().strip('.,;:').lower()
+
+
+@dataclass
+class ContactInfo:
+    """All contact details found on a page, normalized and de-duplicated."""
+    phones: List[str] = field(default_factory=list)
+    emails: List[str] = field(default_factory=list)
+    addresses: List[str] = field(default_factory=list)
+    social: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def phone(self) -> Optional[str]:
+        return self.phones[0] if self.phones else None
+
+    @property
+    def email(self) -> Optional[str]:
+        return self.emails[0] if self.emails else None
+
+    @property
+    def address(self) -> Optional[str]:
+        return self.addresses[0] if self.addresses else None
+
+
+def extract_contacts(text: str, hrefs: Iterable[str] = ()) -> ContactInfo:
+    """Scan text (and link targets) once for phones, emails, addresses and social links.
+
+    Link targets are scanned first so ``tel:``/``mailto:`` values rank ahead
+    of numbers and addresses that only appear in body text.
+    """
+    info = ContactInfo()
+    seen = set()
+
+    for source in ('\n'.join(hrefs), text or ''):
+        for match in CONTACT_PATTERN.finditer(source):
+            kind = match.lastgroup
+            value = match.group(kind)
+
+            if kind == 'social':
+                info.social.setdefault(match.group('platform'), value.rstrip('/'))
+                continue
+            if kind == 'email':
+                value = normalize_email(value)
+            elif kind == 'phone':
+                value = normalize_phone(value)
+                if not value:
+                    continue
+            else:
+                value = _SPACES.sub(' ', value).strip()
+
+            if (kind, value) not in seen:
+                seen.add((kind, value))
+                getattr(info, _FIELDS[kind]).append(value)
+
+    return info
+
+
+def extract_page_contacts(page: ParsedPage) -> ContactInfo:
+    """Extract contact details from a parsed page's links and text."""
+    return extract_contacts(page.text, (href for href, _ in page.links))
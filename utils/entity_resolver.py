@@ -0,0 +1,164 @@
+import re
+from difflib import SequenceMatcher
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from utils.contact_extractor import phone_e164
+from utils.urls import domain_of
+
+# Trailing words that do not distinguish one company from another
+LEGAL_SUFFIXES = {'inc', 'incorporated', 'llc', 'ltd', 'co', 'corp', 'corporation', 'company', 'pllc', 'llp', 'lp'}
+
+# Websites that are listings about a company rather than the company's own domain
+LISTING_DOMAINS = ('google.', 'yelp.', 'yellowpages.', 'facebook.', 'linkedin.', 'bbb.org', 'angi.', 'thumbtack.')
+
+_NAME_TOKEN = re.compile(r'[a-z0-9]+')
+
+# Trade words shared by most prospects; they are skipped when choosing a name's block
+GENERIC_WORDS = {'pest', 'control', 'service', 'services', 'exterminating', 'exterminators', 'termite',
+                 'lawn', 'solutions', 'management', 'and', 'of'}
+
+# Letters kept from each distinctive word in a block key
+BLOCK_PREFIX = 4
+
+
+def name_fingerprint(name: str) -> str:
+    """Reduce a company name to a comparable form.
+
+    Lowercases, drops punctuation, a leading "the" and trailing legal
+    suffixes, so "The Turner Pest Control, Inc." and "turner pest control"
+    share the fingerprint "turner pest control".
+    """
+    tokens = _NAME_TOKEN.findall((name or '').lower().replace('&', ' and '))
+    while tokens and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    if len(tokens) > 1 and tokens[0] == 'the':
+        tokens = tokens[1:]
+    return ' '.join(tokens)
+
+
+def _block_key(fingerprint: str) -> str:
+    """Prefixes of the first two distinctive words, e.g. "turn|brot" for "turner brothers pest control"."""
+    words = [word for word in fingerprint.split() if word not in GENERIC_WORDS] or fingerprint.split()
+    return '|'.join(word[:BLOCK_PREFIX] for word in words[:2])
+
+
+def _numbers(fingerprint: str) -> List[str]:
+    return [word for word in fingerprint.split() if word.isdigit()]
+
+
+class EntityResolver:
+    """Index of known companies for matching new candidates in near-constant time.
+
+    Each company is indexed under blocking keys: its website domain, its
+    E.164 phone number, its name fingerprint and a block key built from the
+    distinctive words of its name. A candidate is a duplicate if it shares a
+    domain, phone or fingerprint with a known company, or if its fingerprint
+    is close enough (``fuzzy_threshold``) to one in the same block. Only that
+    small block is compared, never the whole index. Name matches are
+    rejected when both sides have different websites.
+    """
+
+    def __init__(self, fuzzy_threshold: float = 0.9, ignore_domains: Iterable[str] = LISTING_DOMAINS):
+        self.fuzzy_threshold = fuzzy_threshold
+        self.ignore_domains = tuple(ignore_domains)
+        self.entities: List[Any] = []
+        self._by_domain: Dict[str, int] = {}
+        self._by_phone: Dict[str, int] = {}
+        self._by_fingerprint: Dict[str, int] = {}
+        self._blocks: Dict[str, List[str]] = {}
+        self._domains: List[Set[str]] = []
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    def _domain(self, website: Optional[str]) -> str:
+        domain = domain_of(website)
+        if any(listing in domain for listing in self.ignore_domains):
+            return ''
+        return domain
+
+    def match(self, name: str, website: Optional[str] = None, phone: Optional[str] = None) -> Optional[int]:
+        """Return the id of the known company this candidate refers to, or None."""
+        domain = self._domain(website)
+        if domain in self._by_domain:
+            return self._by_domain[domain]
+
+        e164 = phone_e164(phone) if phone else None
+        if e164 in self._by_phone:
+            return self._by_phone[e164]
+
+        fingerprint = name_fingerprint(name)
+        if not fingerprint:
+            return None
+        if fingerprint in self._by_fingerprint:
+            entity_id = self._by_fingerprint[fingerprint]
+            return None if self._conflicts(entity_id, domain) else entity_id
+
+        numbers = _numbers(fingerprint)
+        matcher = SequenceMatcher(b=fingerprint, autojunk=False)
+        for known in self._blocks.get(_block_key(fingerprint), ()):
+            if _numbers(known) != numbers:
+                continue
+            matcher.set_seq1(known)
+            if matcher.quick_ratio() >= self.fuzzy_threshold and matcher.ratio() >= self.fuzzy_threshold:
+                entity_id = self._by_fingerprint[known]
+                if not self._conflicts(entity_id, domain):
+                    return entity_id
+        return None
+
+    def _conflicts(self, entity_id: int, domain: str) -> bool:
+        """True if the candidate has a website and the known company has only other ones."""
+        return bool(domain and self._domains[entity_id] and domain not in self._domains[entity_id])
+
+    def add(self, name: str, website: Optional[str] = None, phone: Optional[str] = None, payload: Any = None) -> int:
+        """Index a company and return its id.
+
+        If it matches a known company, its domain, phone and name are added
+        as aliases of that company and the existing id is returned.
+        """
+        entity_id = self.match(name, website, phone)
+        if entity_id is None:
+            entity_id = len(self.entities)
+            self.entities.append(payload)
+            self._domains.append(set())
+
+        domain = self._domain(website)
+        if domain:
+            self._by_domain.setdefault(domain, entity_id)
+            self._domains[entity_id].add(domain)
+        e164 = phone_e164(phone) if phone else None
+        if e164:
+            self._by_phone.setdefault(e164, entity_id)
+        fingerprint = name_fingerprint(name)
+        if fingerprint and fingerprint not in self._by_fingerprint:
+            self._by_fingerprint[fingerprint] = entity_id
+            self._blocks.setdefault(_block_key(fingerprint), []).append(fingerprint)
+        return entity_id
+
+    def match_row(self, row: Dict) -> Optional[int]:
+        """Match a prospect row keyed by sheet column names."""
+        return self.match(row.get('Company Name', ''), row.get('Website'), row.get('Phone'))
+
+    def add_row(self, row: Dict) -> int:
+        """Index a prospect row keyed by sheet column names."""
+        return self.add(row.get('Company Name', ''), row.get('Website'), row.get('Phone'), payload=row)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict], **kwargs) -> 'EntityResolver':
+        """Build an index from existing prospect rows (e.g. worksheet.get_all_records())."""
+        resolver = cls(**kwargs)
+        for row in rows:
+            resolver.add_row(row)
+        return resolver
+
+    def new_rows(self, rows: Iterable[Dict]) -> List[Dict]:
+        """Return the rows that match no known company, indexing each as it is accepted.
+
+        Duplicates within ``rows`` themselves are dropped too.
+        """
+        accepted = []
+        for row in rows:
+            if self.match_row(row) is None:
+                self.add_row(row)
+                accepted.append(row)
+        return accepted
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from utils.urls import normalize_url
+
+# Response headers worth keeping alongside the cached body
+_STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Content-Encoding', 'Cache-Control')
+
+
+class HttpCache:
+    """Persistent on-disk cache of successful GET responses, keyed by URL.
+
+    Each entry is a ``<sha256>.json`` metadata file plus a ``<sha256>.body``
+    file under ``cache_dir``. Entries younger than ``ttl`` seconds are served
+    without touching the network; older ones are revalidated with a
+    conditional GET (``If-None-Match`` / ``If-Modified-Since``) and a 304
+    simply refreshes the entry.
+    """
+
+    def __init__(self, cache_dir: str = '.cache/http', ttl: float = 86400):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + '.json', base + '.body'
+
+    def _load(self, url: str) -> Optional[Dict]:
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                meta['body'] = f.read()
+            return meta
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, path: str, data: bytes):
+        # Write-then-rename so concurrent readers never see a partial file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _store(self, url: str, response: requests.Response, fetched_at: float):
+        meta_path, body_path = self._paths(url)
+        meta = {
+            'url': response.url or url,
+            'status_code': response.status_code,
+            'headers': {k: response.headers[k] for k in _STORED_HEADERS if k in response.headers},
+            'fetched_at': fetched_at,
+        }
+        self._write(body_path, response.content)
+        self._write(meta_path, json.dumps(meta).encode('utf-8'))
+
+    def _touch(self, url: str, meta: Dict, fetched_at: float):
+        meta_path, _ = self._paths(url)
+        stored = {k: v for k, v in meta.items() if k != 'body'}
+        stored['fetched_at'] = fetched_at
+        self._write(meta_path, json.dumps(stored).encode('utf-8'))
+
+    @staticmethod
+    def _to_response(meta: Dict) -> requests.Response:
+        response = requests.Response()
+        response.status_code = meta['status_code']
+        response.headers = CaseInsensitiveDict(meta['headers'])
+        response.url = meta['url']
+        response._content = meta['body']
+        response.from_cache = True
+        return response
+
+    def get_fresh(self, url: str) -> Optional[requests.Response]:
+        """Return the cached response if it is still within its TTL."""
+        meta = self._load(url)
+        if meta and time.time() - meta['fetched_at'] < self.ttl:
+            return self._to_response(meta)
+        return None
+
+    def fetch(self, session: requests.Session, url: str, **kwargs) -> requests.Response:
+        """GET a URL through the cache, revalidating stale entries.
+
+        Only 200 responses are stored; anything else is passed through.
+        """
+        meta = self._load(url)
+        now = time.time()
+        if meta and now - meta['fetched_at'] < self.ttl:
+            return self._to_response(meta)
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        if meta:
+            if 'ETag' in meta['headers']:
+                headers['If-None-Match'] = meta['headers']['ETag']
+            if 'Last-Modified' in meta['headers']:
+                headers['If-Modified-Since'] = meta['headers']['Last-Modified']
+
+        response = session.get(url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and meta:
+            self._touch(url, meta, now)
+            return self._to_response(meta)
+
+        if response.status_code == 200:
+            self._store(url, response, now)
+        return response
+
+    def clear(self):
+        """Delete every cached entry."""
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(('.json', '.body')):
+                os.remove(os.path.join(self.cache_dir, name))
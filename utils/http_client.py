@@ -0,0 +1,199 @@
+import os
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.http_cache import HttpCache
+from utils.rate_limiter import RateLimiter, get_rate_limiter
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# Largest response body kept in memory; anything past it is dropped
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024
+
+# Content types worth downloading: pages, plus robots.txt and sitemaps
+TEXT_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain', 'text/xml', 'application/xml')
+
+# Leading bytes of binary files served without a useful Content-Type
+_BINARY_SIGNATURES = (b'%PDF', b'\x89PNG', b'GIF8', b'\xff\xd8\xff', b'PK\x03\x04', b'\x1f\x8b')
+
+
+class UnsupportedContentType(requests.RequestException):
+    """Raised when a response is not a text document worth parsing."""
+
+
+def read_limited(response: requests.Response, max_bytes: int = DEFAULT_MAX_BYTES,
+                 content_types=TEXT_CONTENT_TYPES, chunk_size: int = 16384) -> requests.Response:
+    """Read a streamed response body in chunks, keeping at most ``max_bytes``.
+
+    A successful response whose Content-Type (or, when that is missing or
+    generic, whose first bytes) shows it is not a text document is closed
+    before its body is downloaded and raises ``UnsupportedContentType``.
+    Bodies over the budget are cut off and the connection is dropped; the
+    response gets ``truncated = True``.
+    """
+    if response._content_consumed:
+        return response
+
+    check_type = response.status_code == 200
+    declared = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+    if check_type and declared and declared != 'application/octet-stream':
+        if declared not in content_types and not declared.endswith('+xml'):
+            response.close()
+            raise UnsupportedContentType(f"Skipping {declared} content from {response.url}", response=response)
+        check_type = False
+
+    body = bytearray()
+    truncated = False
+    for chunk in response.iter_content(chunk_size):
+        if check_type and not body and chunk.lstrip().startswith(_BINARY_SIGNATURES):
+            response.close()
+            raise UnsupportedContentType(f"Skipping binary content from {response.url}", response=response)
+        body += chunk
+        if len(body) > max_bytes:
+            del body[max_bytes:]
+            truncated = True
+            break
+
+    if truncated:
+        response.close()
+    response._content = bytes(body)
+    response._content_consumed = True
+    response.truncated = truncated
+    return response
+
+
+class HttpClient:
+    """Connection-pooled HTTP client shared by the scraping tools and scripts.
+
+    One ``requests.Session`` is kept for the life of the client so TCP/TLS
+    connections are reused (keep-alive) instead of re-handshaking per URL.
+    urllib3 keeps a separate pool per host; ``pool_connections`` is how many
+    host pools are cached and ``pool_maxsize`` is the connections kept per host.
+
+    With a ``cache``, fresh cached pages are returned without any network
+    traffic or throttling. With a ``rate_limiter``, every request that does go
+    to the network first waits for its host's slot.
+
+    Bodies are streamed: at most ``max_bytes`` are kept per response and
+    binary or non-text responses are abandoned after their headers (see
+    ``read_limited``), so memory per request stays bounded. Pass
+    ``max_bytes=None`` to download bodies whole.
+    """
+
+    def __init__(self, pool_connections: int = 100, pool_maxsize: int = 10,
+                 max_retries: int = 2, backoff_factor: float = 0.5,
+                 timeout: float = 10, headers: Optional[Dict[str, str]] = None,
+                 cache: Optional[HttpCache] = None, rate_limiter: Optional[RateLimiter] = None,
+                 max_bytes: Optional[int] = DEFAULT_MAX_BYTES):
+        self.timeout = timeout
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.max_bytes = max_bytes
+        self.session = requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        # Runs on every response (redirects included) before anyone reads the body
+        self.session.hooks['response'].append(self._limit_body)
+
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry,
+            pool_block=False,
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _limit_body(self, response: requests.Response, **kwargs) -> requests.Response:
+        if self.max_bytes is None:
+            return response
+        return read_limited(response, self.max_bytes)
+
+    def cached(self, url: str) -> Optional[requests.Response]:
+        """Return a fresh cached response for the URL, if there is one."""
+        return self.cache.get_fresh(url) if self.cache else None
+
+    def get(self, url: str, throttle: bool = True, **kwargs) -> requests.Response:
+        """GET a URL through the cache, rate limiter and pooled session.
+
+        Pass ``throttle=False`` when the caller has already acquired a slot
+        from the rate limiter (e.g. the async fetcher).
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        kwargs.setdefault('stream', self.max_bytes is not None)
+
+        response = self.cached(url)
+        if response is not None:
+            return response
+
+        if throttle and self.rate_limiter:
+            self.rate_limiter.acquire(url)
+
+        if self.cache:
+            return self.cache.fetch(self.session, url, **kwargs)
+        return self.session.get(url, **kwargs)
+
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
+
+
+_shared_client: Optional[HttpClient] = None
+_shared_lock = threading.Lock()
+
+
+def _default_cache() -> Optional[HttpCache]:
+    """Build the response cache from SCRAPE_CACHE_DIR / SCRAPE_CACHE_TTL.
+
+    Setting SCRAPE_CACHE_DIR to an empty value disables caching.
+    """
+    cache_dir = os.getenv('SCRAPE_CACHE_DIR', '.cache/http')
+    if not cache_dir:
+        return None
+    return HttpCache(cache_dir, ttl=float(os.getenv('SCRAPE_CACHE_TTL', '86400')))
+
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide shared HTTP client, creating it on first use."""
+    global _shared_client
+    if _shared_client is None:
+        with _shared_lock:
+            if _shared_client is None:
+                _shared_client = HttpClient(cache=_default_cache(), rate_limiter=get_rate_limiter())
+    return _shared_client
+
+
+def configure_http_client(**kwargs) -> HttpClient:
+    """Replace the shared HTTP client with one built from the given settings.
+
+    Accepts the same keyword arguments as ``HttpClient`` (pool sizes,
+    retries, backoff, timeout, headers, cache, rate_limiter, max_bytes). The cache and
+    rate limiter default to the same ones the shared client starts with.
+    """
+    global _shared_client
+    kwargs.setdefault('cache', _default_cache())
+    kwargs.setdefault('rate_limiter', get_rate_limiter())
+    with _shared_lock:
+        if _shared_client is not None:
+            _shared_client.close()
+        _shared_client = HttpClient(**kwargs)
+    return _shared_client
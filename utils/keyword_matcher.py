@@ -0,0 +1,79 @@
+import re
+from typing import Dict, Iterable, List, Set
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _normalize(keyword: str) -> str:
+    return _WHITESPACE.sub(' ', keyword.strip().lower())
+
+
+def _trie_regex(trie: Dict) -> str:
+    """Serialize a character trie into a prefix-factored regex.
+
+    Shared prefixes appear once, so the regex engine walks the trie like an
+    automaton instead of retrying every keyword at each position. Longer
+    keywords are tried before their prefixes.
+    """
+    terminal = '' in trie
+    branches = []
+    for char in sorted(k for k in trie if k):
+        piece = r'\s+' if char == ' ' else re.escape(char)
+        branches.append(piece + _trie_regex(trie[char]))
+
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if terminal:
+        return '(?:' + body + ')?'
+    return body
+
+
+class KeywordMatcher:
+    """Finds every keyword from a vocabulary in one pass over the text.
+
+    The vocabulary is compiled once into a single trie-shaped regular
+    expression, so scan time depends on the text length rather than on how
+    many keywords there are. Matches respect word boundaries ("ant" does not
+    match "important") and, with ``plurals``, accept a trailing "s"/"es"
+    ("ants", "termites"). With ``whole_words=False`` only the start of a
+    keyword must be at a word boundary, so "pest" matches "PestPro".
+    Matching is case-insensitive and multi-word keywords match across any
+    whitespace. Overlapping keywords that start at different words are all
+    found ("bed bug" and "bug"); of those starting at the same word the
+    longest wins.
+    """
+
+    def __init__(self, keywords: Iterable[str], plurals: bool = True, whole_words: bool = True):
+        self.keywords: List[str] = []
+        trie: Dict = {}
+        for keyword in keywords:
+            normalized = _normalize(keyword)
+            if not normalized or normalized in self.keywords:
+                continue
+            self.keywords.append(normalized)
+            node = trie
+            for char in normalized:
+                node = node.setdefault(char, {})
+            node[''] = {}
+
+        suffix = '(?:e?s)?' if plurals else ''
+        boundary = r'(?!\w)' if whole_words else ''
+        body = _trie_regex(trie) if trie else '(?!)'
+        self.pattern = re.compile(r'(?<!\w)(' + body + ')' + suffix + boundary, re.IGNORECASE)
+        # Zero-width lookahead scan: a match does not consume its text, so
+        # keywords inside or overlapping an earlier match are still found
+        self._scan = re.compile(r'(?<!\w)(?=(' + body + ')' + suffix + boundary + ')', re.IGNORECASE)
+
+    def find_all(self, text: str) -> Set[str]:
+        """Return the set of keywords that occur in the text."""
+        return {_normalize(match.group(1)) for match in self._scan.finditer(text or '')}
+
+    def matches_in_order(self, text: str) -> List[str]:
+        """Return the keywords found, ordered as in the vocabulary."""
+        found = self.find_all(text)
+        return [keyword for keyword in self.keywords if keyword in found]
+
+    def search(self, text: str) -> bool:
+        """Return True if any keyword occurs in the text."""
+        return self.pattern.search(text or '') is not None
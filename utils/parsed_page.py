@@ -0,0 +1,65 @@
+from functools import cached_property
+from typing import List, Tuple
+from urllib.parse import unquote
+
+from bs4 import BeautifulSoup, NavigableString
+
+from utils.html_parser import make_soup
+
+
+class ParsedPage:
+    """An HTML page parsed once, with the views extractors need cached.
+
+    The document text, its individual text nodes, the links and the
+    ``mailto:``/``tel:`` targets are each computed on first access and then
+    shared by every extractor, instead of each one re-walking the tree.
+    """
+
+    def __init__(self, soup: BeautifulSoup, url: str = ''):
+        self.soup = soup
+        self.url = url
+
+    @classmethod
+    def from_html(cls, content, url: str = '') -> 'ParsedPage':
+        """Parse raw HTML (bytes or str) into a page with the fastest available parser."""
+        return cls(make_soup(content), url)
+
+    @cached_property
+    def text(self) -> str:
+        """Full visible text of the document."""
+        return self.soup.get_text()
+
+    @cached_property
+    def text_lower(self) -> str:
+        """Lowercased document text for keyword checks."""
+        return self.text.lower()
+
+    @cached_property
+    def strings(self) -> List[NavigableString]:
+        """Every text node in document order."""
+        return self.soup.find_all(string=True)
+
+    @cached_property
+    def title(self) -> str:
+        """Text of the <title> tag, or the first <h1> if there is no title."""
+        for tag_name in ('title', 'h1'):
+            tag = self.soup.find(tag_name)
+            if tag:
+                return tag.get_text(strip=True)
+        return ''
+
+    @cached_property
+    def links(self) -> List[Tuple[str, str]]:
+        """(href, link text) for every anchor with an href."""
+        return [(a['href'].strip(), a.get_text(strip=True)) for a in self.soup.find_all('a', href=True)]
+
+    @cached_property
+    def mailto(self) -> List[str]:
+        """Addresses from mailto: links, without query strings."""
+        return [unquote(href[7:].split('?')[0]).strip()
+                for href, _ in self.links if href.lower().startswith('mailto:')]
+
+    @cached_property
+    def tel(self) -> List[str]:
+        """Numbers from tel: links."""
+        return [unquote(href[4:]).strip() for href, _ in self.links if href.lower().startswith('tel:')]
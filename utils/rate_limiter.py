@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+
+from utils.urls import host_of
+
+
+class TokenBucket:
+    """Token bucket that hands out reservations instead of blocking.
+
+    ``reserve`` always takes a token, letting the balance go negative, and
+    returns how long the caller must wait before its token is actually
+    available. Callers sleep outside any lock, so waiting on one bucket never
+    blocks callers of another.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def reserve(self, now: float) -> float:
+        """Take one token and return the wait (seconds) until it is valid."""
+        if self.rate == float('inf'):
+            return 0.0
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class RateLimiter:
+    """Per-host token buckets plus a global cap for outbound scraping requests.
+
+    Each host gets its own bucket refilling one token every ``per_host_delay``
+    seconds, so politeness only delays requests to the same site. The global
+    bucket caps total throughput across all hosts at ``global_rate`` per second.
+    Works from threads (``acquire``) and coroutines (``acquire_async``).
+    """
+
+    def __init__(self, per_host_delay: float = 1.0, per_host_burst: int = 1,
+                 global_rate: float = 20.0, global_burst: int = 20):
+        self.per_host_delay = per_host_delay
+        self.per_host_burst = per_host_burst
+        self._global = TokenBucket(global_rate, global_burst)
+        self._hosts: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _host_rate(self) -> float:
+        return 1.0 / self.per_host_delay if self.per_host_delay > 0 else float('inf')
+
+    def reserve(self, url: str) -> float:
+        """Reserve a request slot for a URL and return the required wait."""
+        host = host_of(url)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._hosts.get(host)
+            if bucket is None:
+                bucket = self._hosts[host] = TokenBucket(self._host_rate(), self.per_host_burst)
+            return max(bucket.reserve(now), self._global.reserve(now))
+
+    def set_host_delay(self, url: str, delay: float):
+        """Space requests to a URL's host at least ``delay`` seconds apart (e.g. a robots.txt Crawl-delay)."""
+        if delay <= self.per_host_delay:
+            return
+        with self._lock:
+            self._hosts[host_of(url)] = TokenBucket(1.0 / delay, 1)
+
+    def set_host_burst(self, url: str, burst: int):
+        """Let up to ``burst`` requests to a URL's host through at once (a Crawl-delay still wins)."""
+        host = host_of(url)
+        with self._lock:
+            bucket = self._hosts.get(host)
+            if bucket is None:
+                self._hosts[host] = TokenBucket(self._host_rate(), burst)
+            elif bucket.rate >= self._host_rate():
+                bucket.capacity = max(bucket.capacity, burst)
+
+    def acquire(self, url: str):
+        """Block the current thread until a request to the URL is allowed."""
+        wait = self.reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, url: str):
+        """Wait (without blocking the event loop) until a request is allowed."""
+        wait = self.reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+_shared_limiter: Optional[RateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide shared rate limiter, creating it on first use."""
+    global _shared_limiter
+    if _shared_limiter is None:
+        with _shared_lock:
+            if _shared_limiter is None:
+                _shared_limiter = RateLimiter()
+    return _shared_limiter
+
+
+def configure_rate_limiter(**kwargs) -> RateLimiter:
+    """Replace the shared rate limiter with one built from the given settings."""
+    global _shared_limiter
+    with _shared_lock:
+        _shared_limiter = RateLimiter(**kwargs)
+    return _shared_limiter
@@ -0,0 +1,213 @@
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from utils.contact_extractor import phone_e164
+from utils.urls import host_of
+
+
+@dataclass
+class CompanyRecord:
+    """A company found by one of the scraping sources."""
+    name: str
+    website: Optional[str] = None
+    phone: Optional[str] = None
+    email: Optional[str] = None
+    address: Optional[str] = None
+    services: List[str] = field(default_factory=list)
+    social: Dict[str, str] = field(default_factory=dict)
+    source: str = 'Unknown'
+
+    def to_dict(self) -> Dict:
+        """Return the record as a plain dict, dropping empty fields."""
+        return {key: value for key, value in asdict(self).items() if value not in (None, [], {})}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CompanyRecord':
+        """Build a record from a dict, ignoring unknown keys."""
+        known = cls.__dataclass_fields__
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+
+
+# Column order of the prospect sheet and its CSV exports
+PROSPECT_COLUMNS = [
+    "Company Name", "Website", "Phone", "Email", "Address",
+    "Contact Person", "Title", "Company Size", "Employee Count",
+    "Services", "Training Priority", "Training Gaps",
+    "Deal Potential Min", "Deal Potential Max", "Annual Value",
+    "Opportunity Level", "Pain Points", "Campaign Angle",
+    "Next Action", "Follow Up Date", "Notes",
+    "Data Source", "Verification Status", "Last Updated"
+]
+
+
+def column_key(column: str) -> str:
+    """Turn a sheet header into its field name, e.g. "Deal Potential Min" -> "deal_potential_min"."""
+    return column.strip().lower().replace(' ', '_')
+
+
+@dataclass(slots=True)
+class CompanyAnalysis:
+    """Result of analyzing a company's website, ready to write to Sheets or CSV.
+
+    Field names match the prospect sheet headers (see ``column_key``), so a
+    record serializes straight into a ``PROSPECT_COLUMNS`` row.
+    """
+    company_name: str
+    website: str
+    location: str
+    company_size: str
+    size_score: int
+    employee_count: str
+    services: List[str] = field(default_factory=list)
+    training_priority: str = 'Low'
+    training_gaps: List[str] = field(default_factory=list)
+    decision_makers: List[str] = field(default_factory=list)
+    deal_potential_min: int = 0
+    deal_potential_max: int = 0
+    annual_value: int = 0
+    opportunity_level: str = 'Medium'
+    phone: Optional[str] = None
+    email: Optional[str] = None
+    pages_analyzed: int = 1
+
+    def __post_init__(self):
+        if not self.annual_value:
+            self.annual_value = (self.deal_potential_min + self.deal_potential_max) // 2
+
+    @property
+    def deal_range(self) -> str:
+        """Deal potential formatted as "$15,000-$21,600"."""
+        return f"${self.deal_potential_min:,}-${self.deal_potential_max:,}"
+
+    def to_dict(self) -> Dict:
+        """Return the record as a plain dict."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CompanyAnalysis':
+        """Build a record from a dict such as a saved analysis or a prospect entry.
+
+        Unknown keys are ignored. Services and training gaps may be given as
+        lists or as the joined strings used in the sheet.
+        """
+        values = {key: value for key, value in data.items() if key in cls.__dataclass_fields__}
+        values.setdefault('location', data.get('address', ''))
+        values.setdefault('size_score', 0)
+        values.setdefault('employee_count', '')
+        for key, separator in (('services', ','), ('training_gaps', ';'), ('decision_makers', ',')):
+            if isinstance(values.get(key), str):
+                values[key] = [item.strip() for item in values[key].split(separator) if item.strip()]
+        for key in ('deal_potential_min', 'deal_potential_max', 'annual_value', 'size_score', 'pages_analyzed'):
+            if isinstance(values.get(key), str):
+                values[key] = int(values[key].replace('$', '').replace(',', '') or 0)
+        return cls(**values)
+
+    def column_value(self, column: str, extra: Optional[Dict] = None):
+        """Value for one sheet column; columns the analysis does not cover come from ``extra``."""
+        key = column_key(column)
+        extra = extra or {}
+        if key in extra and (key not in self.__dataclass_fields__ or not getattr(self, key)):
+            return extra[key]
+        if key == 'address':
+            return self.location
+        value = getattr(self, key, '')
+        if key == 'training_gaps':
+            return '; '.join(value)
+        if isinstance(value, list):
+            return ', '.join(value)
+        return '' if value is None else value
+
+    def to_row(self, columns: List[str] = PROSPECT_COLUMNS, extra: Optional[Dict] = None) -> List:
+        """Cells for a Sheets or CSV row in the given column order.
+
+        ``extra`` supplies the columns the analysis does not produce (contact
+        person, campaign notes, ...) keyed by field name.
+        """
+        return [self.column_value(column, extra) for column in columns]
+
+def _website_is_listing(website: Optional[str], ignore_domains: Iterable[str]) -> bool:
+    """True if the URL points at a directory or social listing rather than the company's own site."""
+    host = host_of(website) if website else ''
+    return not host or any(domain in host for domain in ignore_domains)
+
+
+def merge_keys(record: CompanyRecord, ignore_domains: Iterable[str] = ()) -> List[str]:
+    """Identity keys for a record: its own domain and its E.164 phone."""
+    keys = []
+    if not _website_is_listing(record.website, ignore_domains):
+        keys.append('domain:' + host_of(record.website))
+    phone = phone_e164(record.phone) if record.phone else None
+    if phone:
+        keys.append('phone:' + phone)
+    return keys
+
+
+def _completeness(record: CompanyRecord) -> int:
+    """Number of filled contact fields, used to rank and pick the primary listing."""
+    return sum(1 for value in (record.website, record.phone, record.email, record.address) if value) \
+        + bool(record.services) + bool(record.social)
+
+
+def _merge_into(target: CompanyRecord, other: CompanyRecord, ignore_domains: Iterable[str]):
+    """Fill gaps in target from another record describing the same company."""
+    if other.website and (not target.website or (_website_is_listing(target.website, ignore_domains)
+                                                 and not _website_is_listing(other.website, ignore_domains))):
+        target.website = other.website
+    for name in ('phone', 'email', 'address'):
+        if not getattr(target, name) and getattr(other, name):
+            setattr(target, name, getattr(other, name))
+    target.services.extend(s for s in other.services if s not in target.services)
+    for platform, url in other.social.items():
+        target.social.setdefault(platform, url)
+
+
+def merge_company_records(records: Iterable[CompanyRecord], ignore_domains: Iterable[str] = ()) -> List[CompanyRecord]:
+    """Merge records that share a company domain or phone number into one ranked list.
+
+    Records match transitively (a domain match and a phone match can join three
+    listings). Directory and social URLs in ``ignore_domains`` never count as a
+    company's domain. Merged records list every contributing source, and the
+    result is ranked by how many sources found the company, then by how
+    complete its details are.
+    """
+    ignore_domains = tuple(ignore_domains)
+    groups: List[Optional[List[CompanyRecord]]] = []
+    key_to_group: Dict[str, int] = {}
+
+    for record in records:
+        keys = merge_keys(record, ignore_domains)
+        matched = sorted({key_to_group[key] for key in keys if key in key_to_group})
+        if not matched:
+            index = len(groups)
+            groups.append([record])
+        else:
+            index = matched[0]
+            groups[index].append(record)
+            # The record bridges several groups: fold them into the first one
+            for other in matched[1:]:
+                groups[index].extend(groups[other])
+                groups[other] = None
+                for key, value in key_to_group.items():
+                    if value == other:
+                        key_to_group[key] = index
+        for key in keys:
+            key_to_group[key] = index
+
+    merged = []
+    for group in groups:
+        if not group:
+            continue
+        # Start from the most complete listing so its name and fields win
+        group_records = sorted(group, key=_completeness, reverse=True)
+        result = CompanyRecord(**asdict(group_records[0]))
+        sources = [result.source]
+        for other in group_records[1:]:
+            _merge_into(result, other, ignore_domains)
+            if other.source not in sources:
+                sources.append(other.source)
+        result.source = ', '.join(sources)
+        merged.append((len(sources), result))
+
+    merged.sort(key=lambda item: (item[0], _completeness(item[1])), reverse=True)
+    return [record for _, record in merged]
@@ -0,0 +1,158 @@
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+from utils.http_client import DEFAULT_HEADERS, HttpClient, get_http_client
+from utils.rate_limiter import RateLimiter, get_rate_limiter
+from utils.urls import host_of
+
+# Longest Crawl-delay we honor; slower sites are still paced at this interval
+MAX_CRAWL_DELAY = 30.0
+
+# How soon to retry a robots.txt that could not be loaded
+RETRY_AFTER = 300.0
+
+
+class DisallowedByRobots(Exception):
+    """Raised when a site's robots.txt forbids fetching a URL."""
+
+
+class HostPolicy:
+    """Crawl rules for one host: robots.txt rules, Crawl-delay and sitemaps."""
+
+    def __init__(self, root: str, rules: Optional[RobotFileParser] = None, crawl_delay: Optional[float] = None,
+                 sitemaps: Optional[List[str]] = None, expires_at: float = 0.0):
+        self.root = root
+        self.rules = rules
+        self.crawl_delay = crawl_delay
+        self.sitemaps = sitemaps or []
+        self.expires_at = expires_at
+
+    def allows(self, url: str, user_agent: str = '*') -> bool:
+        """True if the rules permit fetching the URL (no rules means allow all)."""
+        return self.rules is None or self.rules.can_fetch(user_agent, url)
+
+    def sitemap_urls(self) -> List[str]:
+        """Sitemaps declared in robots.txt, or the conventional /sitemap.xml."""
+        return self.sitemaps or [self.root + '/sitemap.xml']
+
+
+def parse_robots(root: str, content: str, user_agent: str = '*', ttl: float = 86400) -> HostPolicy:
+    """Build a host policy from the text of a robots.txt file."""
+    rules = RobotFileParser(root + '/robots.txt')
+    rules.parse(content.splitlines())
+    delay = rules.crawl_delay(user_agent)
+    return HostPolicy(
+        root,
+        rules=rules,
+        crawl_delay=min(float(delay), MAX_CRAWL_DELAY) if delay else None,
+        sitemaps=rules.site_maps() or [],
+        expires_at=time.monotonic() + ttl,
+    )
+
+
+class RobotsCache:
+    """Per-host crawl policies loaded from robots.txt and kept for ``ttl`` seconds.
+
+    Each host's robots.txt is fetched once per TTL and shared by every
+    caller. A missing robots.txt (4xx) allows everything; one that cannot be
+    loaded (5xx or network error) also allows everything but is retried after
+    a few minutes. A Crawl-delay slows that host in the shared rate limiter.
+    With ``enabled=False`` nothing is fetched and every URL is allowed.
+    """
+
+    def __init__(self, ttl: float = 86400, user_agent: str = DEFAULT_HEADERS['User-Agent'],
+                 client: Optional[HttpClient] = None, rate_limiter: Optional[RateLimiter] = None,
+                 enabled: bool = True):
+        self.ttl = ttl
+        self.user_agent = user_agent
+        self.client = client
+        self.rate_limiter = rate_limiter
+        self.enabled = enabled
+        self._policies: Dict[str, HostPolicy] = {}
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, root: str) -> HostPolicy:
+        client = self.client or get_http_client()
+        try:
+            response = client.get(root + '/robots.txt', throttle=False)
+        except Exception:
+            return HostPolicy(root, expires_at=time.monotonic() + RETRY_AFTER)
+
+        if response.status_code >= 500:
+            return HostPolicy(root, expires_at=time.monotonic() + RETRY_AFTER)
+        if response.status_code >= 400:
+            return HostPolicy(root, expires_at=time.monotonic() + self.ttl)
+
+        content = response.content.decode('utf-8', 'ignore') if isinstance(response.content, bytes) else response.content
+        policy = parse_robots(root, content, self.user_agent, self.ttl)
+        if policy.crawl_delay and self.rate_limiter:
+            self.rate_limiter.set_host_delay(root, policy.crawl_delay)
+        return policy
+
+    def policy(self, url: str) -> HostPolicy:
+        """Return the crawl policy for a URL's host, loading robots.txt if needed."""
+        parts = urlparse(url)
+        root = f"{parts.scheme or 'http'}://{parts.netloc}"
+        if not self.enabled:
+            return HostPolicy(root)
+
+        host = host_of(url)
+        policy = self._policies.get(host)
+        if policy is not None and policy.expires_at > time.monotonic():
+            return policy
+
+        with self._lock:
+            host_lock = self._host_locks.setdefault(host, threading.Lock())
+        # One fetch per host; other callers for the same host wait for it
+        with host_lock:
+            policy = self._policies.get(host)
+            if policy is None or policy.expires_at <= time.monotonic():
+                policy = self._policies[host] = self._load(root)
+        return policy
+
+    def allowed(self, url: str) -> bool:
+        """True if robots.txt permits fetching the URL."""
+        return self.policy(url).allows(url, self.user_agent)
+
+    def check(self, url: str):
+        """Raise DisallowedByRobots if robots.txt forbids the URL."""
+        if not self.allowed(url):
+            raise DisallowedByRobots(f"robots.txt disallows {url}")
+
+    def sitemap_urls(self, url: str) -> List[str]:
+        """Sitemap URLs for a URL's host."""
+        return self.policy(url).sitemap_urls()
+
+
+_shared_cache: Optional[RobotsCache] = None
+_shared_lock = threading.Lock()
+
+
+def _env_enabled() -> bool:
+    """SCRAPE_RESPECT_ROBOTS=0 turns robots.txt checks off."""
+    return os.getenv('SCRAPE_RESPECT_ROBOTS', '1').lower() not in ('0', 'false', 'no')
+
+
+def get_robots_cache() -> RobotsCache:
+    """Return the process-wide shared robots.txt cache, creating it on first use."""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                _shared_cache = RobotsCache(rate_limiter=get_rate_limiter(), enabled=_env_enabled())
+    return _shared_cache
+
+
+def configure_robots_cache(**kwargs) -> RobotsCache:
+    """Replace the shared robots.txt cache with one built from the given settings."""
+    global _shared_cache
+    kwargs.setdefault('rate_limiter', get_rate_limiter())
+    kwargs.setdefault('enabled', _env_enabled())
+    with _shared_lock:
+        _shared_cache = RobotsCache(**kwargs)
+    return _shared_cache
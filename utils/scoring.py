@@ -0,0 +1,154 @@
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Mapping, Sequence, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional; score_batch falls back to a per-row loop
+    np = None
+
+# Size signal -> points it adds to the size score
+SIZE_WEIGHTS = {'team': 1, 'locations': 2, 'fleet': 1, 'images': 1}
+
+# Homepage image count above which a site counts as a bigger operation
+IMAGE_THRESHOLD = 10
+
+# (lowest size score, bucket), smallest bucket first
+SIZE_THRESHOLDS = ((0, "Small (<10 employees)"), (2, "Medium (10-20 employees)"), (4, "Large (20+ employees)"))
+
+# Size bucket -> (estimated employees, deal potential min, deal potential max)
+SIZE_BUCKETS = {
+    "Large (20+ employees)": ("20+", 15000, 21600),
+    "Medium (10-20 employees)": ("10-20", 11200, 16800),
+    "Small (<10 employees)": ("<10", 3600, 7200),
+}
+
+# Training gap signal -> gap it reveals, in report order
+TRAINING_GAPS = {
+    'no_training': "No formal training mentioned",
+    'hiring': "Hiring challenges indicate training needs",
+    'quality_service': "Quality focus suggests training opportunities",
+    'compliance': "Compliance requirements",
+}
+
+# (lowest number of training gaps, label)
+PRIORITY_THRESHOLDS = ((0, 'Low'), (1, 'Medium'), (3, 'High'))
+OPPORTUNITY_THRESHOLDS = ((0, 'Medium'), (2, 'High'))
+
+# Every feature flag a company is scored on
+FEATURES = tuple(SIZE_WEIGHTS) + tuple(TRAINING_GAPS)
+
+
+def company_features(found: Set[str], image_count: int = 0) -> Dict[str, bool]:
+    """Feature flags for one company from the analysis keywords found on its pages."""
+    return {
+        'team': 'team' in found or 'staff' in found,
+        'locations': 'locations' in found or 'offices' in found,
+        'fleet': 'fleet' in found or 'trucks' in found,
+        'images': image_count > IMAGE_THRESHOLD,
+        'no_training': 'training' not in found,
+        'hiring': 'hiring' in found or 'careers' in found,
+        'quality_service': 'quality' in found and 'service' in found,
+        'compliance': 'compliance' in found or 'licensed' in found,
+    }
+
+
+def training_gaps(features: Mapping[str, bool]) -> List[str]:
+    """The training gaps a company's features reveal, in report order."""
+    return [gap for name, gap in TRAINING_GAPS.items() if features.get(name)]
+
+
+def _tier(value: int, thresholds: Sequence[Tuple[int, str]]) -> str:
+    return thresholds[bisect_right([low for low, _ in thresholds], value) - 1][1]
+
+
+def score_company(features: Mapping[str, bool]) -> Dict:
+    """Size, priority and deal value for one company's feature flags.
+
+    Keys match the CompanyAnalysis fields they fill, plus ``gap_count``.
+    """
+    size_score = sum(weight for name, weight in SIZE_WEIGHTS.items() if features.get(name))
+    gap_count = sum(1 for name in TRAINING_GAPS if features.get(name))
+    size = _tier(size_score, SIZE_THRESHOLDS)
+    employee_count, deal_min, deal_max = SIZE_BUCKETS[size]
+    return {
+        'size_score': size_score,
+        'company_size': size,
+        'employee_count': employee_count,
+        'deal_potential_min': deal_min,
+        'deal_potential_max': deal_max,
+        'annual_value': (deal_min + deal_max) // 2,
+        'gap_count': gap_count,
+        'training_priority': _tier(gap_count, PRIORITY_THRESHOLDS),
+        'opportunity_level': _tier(gap_count, OPPORTUNITY_THRESHOLDS),
+    }
+
+
+def feature_columns(rows: Iterable[Mapping[str, bool]]) -> Dict[str, List[bool]]:
+    """Transpose per-company feature dicts into the columns score_batch takes."""
+    columns = {name: [] for name in FEATURES}
+    for row in rows:
+        for name in FEATURES:
+            columns[name].append(bool(row.get(name)))
+    return columns
+
+
+def _column_count(columns: Mapping[str, Sequence]) -> int:
+    lengths = {len(columns[name]) for name in FEATURES if name in columns}
+    if len(lengths) > 1:
+        raise ValueError(f"Feature columns have different lengths: {sorted(lengths)}")
+    return lengths.pop() if lengths else 0
+
+
+def _score_batch_numpy(columns: Mapping[str, Sequence], count: int) -> Dict:
+    flags = {name: np.asarray(columns[name], dtype=bool) if name in columns else np.zeros(count, dtype=bool)
+             for name in FEATURES}
+
+    size_score = np.zeros(count, dtype=np.int64)
+    for name, weight in SIZE_WEIGHTS.items():
+        size_score += weight * flags[name]
+    gap_count = np.zeros(count, dtype=np.int64)
+    for name in TRAINING_GAPS:
+        gap_count += flags[name]
+
+    def tiers(values, thresholds):
+        index = np.searchsorted([low for low, _ in thresholds], values, side='right') - 1
+        return index, np.array([label for _, label in thresholds], dtype=object)[index]
+
+    bucket, sizes = tiers(size_score, SIZE_THRESHOLDS)
+    buckets = [SIZE_BUCKETS[label] for _, label in SIZE_THRESHOLDS]
+    deal_min = np.array([low for _, low, _ in buckets], dtype=np.int64)[bucket]
+    deal_max = np.array([high for _, _, high in buckets], dtype=np.int64)[bucket]
+
+    return {
+        'size_score': size_score,
+        'company_size': sizes,
+        'employee_count': np.array([employees for employees, _, _ in buckets], dtype=object)[bucket],
+        'deal_potential_min': deal_min,
+        'deal_potential_max': deal_max,
+        'annual_value': (deal_min + deal_max) // 2,
+        'gap_count': gap_count,
+        'training_priority': tiers(gap_count, PRIORITY_THRESHOLDS)[1],
+        'opportunity_level': tiers(gap_count, OPPORTUNITY_THRESHOLDS)[1],
+    }
+
+
+def score_batch(columns: Mapping[str, Sequence[bool]]) -> Dict:
+    """Score many companies at once from columns of feature flags.
+
+    ``columns`` maps each name in FEATURES to one flag per company (a
+    missing column counts as all False). The result has the keys of
+    score_company, each holding one value per company in input order.
+    With NumPy installed every rule runs as whole-array operations, so
+    re-scoring 100k companies takes milliseconds; without it the columns
+    are scored row by row and returned as lists.
+    """
+    count = _column_count(columns)
+    if np is not None:
+        return _score_batch_numpy(columns, count)
+
+    results = {key: [] for key in score_company({})}
+    for index in range(count):
+        scores = score_company({name: columns[name][index] for name in FEATURES if name in columns})
+        for key, value in scores.items():
+            results[key].append(value)
+    return results
@@ -0,0 +1,126 @@
+import threading
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from gspread.utils import rowcol_to_a1
+
+from utils.records import column_key
+
+# Campaign tracking columns written after each email, in sheet order
+EMAIL_STATUS_COLUMNS = ('Email Status', 'Email Sent Date', 'SendGrid Status', 'Campaign Status')
+
+
+class UnknownColumn(KeyError):
+    """Raised when a field has no column in the worksheet's header row."""
+
+
+def email_status_fields(status: str = '', sent_at: str = '', status_code: str = '',
+                        campaign_status: str = '') -> Dict[str, str]:
+    """Values for the email tracking columns, keyed by header."""
+    return dict(zip(EMAIL_STATUS_COLUMNS, (status, sent_at, status_code, campaign_status)))
+
+
+def a1_range(row: int, col: int, values: List[Any]) -> Dict:
+    """batch_update entry writing ``values`` across a row from column ``col``, e.g. K5:N5."""
+    first = rowcol_to_a1(row, col)
+    last = rowcol_to_a1(row, col + len(values) - 1)
+    return {'range': first if first == last else f"{first}:{last}", 'values': [values]}
+
+
+def cell_ranges(row: int, cells: Dict[int, Any]) -> List[Dict]:
+    """batch_update entries for cells of one row keyed by column, one per run of adjacent columns."""
+    ranges = []
+    run: List[Any] = []
+    start = None
+    for col, value in sorted(cells.items()):
+        if start is not None and col != start + len(run):
+            ranges.append(a1_range(row, start, run))
+            run, start = [], None
+        if start is None:
+            start = col
+        run.append(value)
+    if run:
+        ranges.append(a1_range(row, start, run))
+    return ranges
+
+
+class SheetSchema:
+    """Column layout of a worksheet, taken from its header row.
+
+    Fields can be named by their header ("Email Status") or its field name
+    (``email_status``); both resolve to the 1-based column index the header
+    actually has, so writes follow the sheet's layout instead of assuming
+    one. Asking for a field the sheet has no column for raises
+    UnknownColumn rather than writing somewhere else.
+    """
+
+    def __init__(self, headers: Sequence[str]):
+        self.headers = list(headers)
+        self._columns: Dict[str, int] = {}
+        for index, header in enumerate(self.headers, 1):
+            if header.strip():
+                self._columns.setdefault(column_key(header), index)
+
+    @classmethod
+    def from_worksheet(cls, worksheet) -> 'SheetSchema':
+        """Read the header row (row 1) of a worksheet."""
+        return cls(worksheet.row_values(1))
+
+    def __contains__(self, field: str) -> bool:
+        return column_key(field) in self._columns
+
+    def column(self, field: str) -> int:
+        """1-based column index of a field."""
+        try:
+            return self._columns[column_key(field)]
+        except KeyError:
+            raise UnknownColumn(f"Sheet has no '{field}' column") from None
+
+    def a1(self, row: int, field: str) -> str:
+        """A1 reference of a field's cell in a row, e.g. "K5"."""
+        return rowcol_to_a1(row, self.column(field))
+
+    def split(self, values: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+        """Separate the fields the sheet has from the ones it does not."""
+        known = {field: value for field, value in values.items() if field in self}
+        return known, [field for field in values if field not in self]
+
+    def cells(self, values: Dict[str, Any]) -> Dict[int, Any]:
+        """Field values keyed by 1-based column index."""
+        return {self.column(field): value for field, value in values.items()}
+
+    def row_ranges(self, row: int, values: Dict[str, Any]) -> List[Dict]:
+        """batch_update ranges writing ``values`` into a row, one per run of adjacent columns.
+
+        A whole-record update over neighbouring columns becomes a single range.
+        """
+        return cell_ranges(row, self.cells(values))
+
+
+_schemas: Dict[Tuple, SheetSchema] = {}
+_schemas_lock = threading.Lock()
+
+
+def _worksheet_key(worksheet) -> Tuple:
+    spreadsheet = getattr(worksheet, 'spreadsheet', None)
+    return (getattr(spreadsheet, 'id', None), getattr(worksheet, 'id', id(worksheet)))
+
+
+def schema_for(worksheet, refresh: bool = False) -> SheetSchema:
+    """Return the worksheet's schema, reading its header row only the first time."""
+    key = _worksheet_key(worksheet)
+    with _schemas_lock:
+        schema = None if refresh else _schemas.get(key)
+    if schema is None:
+        schema = SheetSchema.from_worksheet(worksheet)
+        with _schemas_lock:
+            _schemas[key] = schema
+    return schema
+
+
+def forget_schemas(worksheets: Iterable = ()):
+    """Drop cached schemas (all of them when no worksheet is given), e.g. after editing headers."""
+    with _schemas_lock:
+        if not worksheets:
+            _schemas.clear()
+        for worksheet in worksheets:
+            _schemas.pop(_worksheet_key(worksheet), None)
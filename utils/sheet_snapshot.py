@@ -0,0 +1,174 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from gspread.utils import numericise_all, to_records
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    sheet_key TEXT PRIMARY KEY,
+    revision TEXT NOT NULL,
+    checked_at REAL NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshot_rows (
+    sheet_key TEXT NOT NULL,
+    row_number INTEGER NOT NULL,
+    cells TEXT NOT NULL,
+    PRIMARY KEY (sheet_key, row_number)
+);
+"""
+
+
+def sheet_key(worksheet) -> str:
+    """Stable identifier of a worksheet: spreadsheet id and sheet id."""
+    return f"{worksheet.spreadsheet.id}/{worksheet.id}"
+
+
+def records_from_values(values: List[List[str]]) -> List[Dict]:
+    """Turn a sheet's values into records exactly as worksheet.get_all_records() does."""
+    if not values or values == [[]]:
+        return []
+    return to_records(values[0], [numericise_all(row) for row in values[1:]])
+
+
+class SheetSnapshotCache:
+    """Local SQLite copy of worksheets, re-read only when the spreadsheet changes.
+
+    Each read first asks the Drive API for the spreadsheet's modifiedTime
+    (one small metadata request that does not count against the Sheets
+    read quota). If it matches the stored snapshot the rows come from disk;
+    otherwise the sheet is read once and the snapshot replaced. Within
+    ``check_interval`` seconds of the last check even that request is
+    skipped. If the revision cannot be checked the sheet is read live.
+    """
+
+    def __init__(self, path: str = '.cache/sheets.sqlite3', check_interval: float = 0.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.reads = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open the database for one transaction, committing on success."""
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def _revision(self, worksheet) -> Optional[str]:
+        try:
+            return worksheet.spreadsheet.get_lastUpdateTime()
+        except Exception:
+            return None
+
+    def _stored(self, db: sqlite3.Connection, key: str) -> List[List[str]]:
+        rows = db.execute('SELECT cells FROM snapshot_rows WHERE sheet_key = ? ORDER BY row_number', (key,))
+        return [json.loads(cells) for (cells,) in rows]
+
+    def store(self, worksheet, values: List[List[str]], revision: str):
+        """Replace the snapshot of a worksheet with ``values`` taken at ``revision``."""
+        key = sheet_key(worksheet)
+        now = time.time()
+        with self._lock, self._connect() as db:
+            db.execute('DELETE FROM snapshot_rows WHERE sheet_key = ?', (key,))
+            db.executemany('INSERT INTO snapshot_rows (sheet_key, row_number, cells) VALUES (?, ?, ?)',
+                           [(key, number, json.dumps(list(row))) for number, row in enumerate(values, 1)])
+            db.execute('INSERT OR REPLACE INTO snapshots (sheet_key, revision, checked_at, fetched_at) '
+                       'VALUES (?, ?, ?, ?)', (key, revision, now, now))
+
+    def get_all_values(self, worksheet) -> List[List[str]]:
+        """Every row of the worksheet, header first, from the snapshot when it is current."""
+        key = sheet_key(worksheet)
+        with self._lock, self._connect() as db:
+            snapshot = db.execute('SELECT revision, checked_at FROM snapshots WHERE sheet_key = ?', (key,)).fetchone()
+            if snapshot and time.time() - snapshot[1] < self.check_interval:
+                return self._stored(db, key)
+
+        # Read the revision before the values: a change in between only
+        # makes the next check refresh again, never hides an edit
+        revision = self._revision(worksheet)
+        if snapshot and revision is not None and revision == snapshot[0]:
+            with self._lock, self._connect() as db:
+                db.execute('UPDATE snapshots SET checked_at = ? WHERE sheet_key = ?', (time.time(), key))
+                return self._stored(db, key)
+
+        values = [list(row) for row in worksheet.get(pad_values=True)]
+        self.reads += 1
+        if revision is not None:
+            self.store(worksheet, values, revision)
+        return values
+
+    def get_all_records(self, worksheet) -> List[Dict]:
+        """Drop-in for worksheet.get_all_records() served from the snapshot."""
+        return records_from_values(self.get_all_values(worksheet))
+
+    def invalidate(self, worksheet=None):
+        """Forget the snapshot of one worksheet, or of all of them."""
+        with self._lock, self._connect() as db:
+            if worksheet is None:
+                db.execute('DELETE FROM snapshot_rows')
+                db.execute('DELETE FROM snapshots')
+            else:
+                key = sheet_key(worksheet)
+                db.execute('DELETE FROM snapshot_rows WHERE sheet_key = ?', (key,))
+                db.execute('DELETE FROM snapshots WHERE sheet_key = ?', (key,))
+
+
+_shared_cache: Optional[SheetSnapshotCache] = None
+_shared_lock = threading.Lock()
+_UNSET = object()
+
+
+def _default_cache() -> Optional[SheetSnapshotCache]:
+    """Build the snapshot cache from SHEETS_SNAPSHOT_PATH (empty disables it)."""
+    path = os.getenv('SHEETS_SNAPSHOT_PATH', '.cache/sheets.sqlite3')
+    check_interval = float(os.getenv('SHEETS_SNAPSHOT_CHECK_INTERVAL', '0'))
+    return SheetSnapshotCache(path, check_interval=check_interval) if path else None
+
+
+def get_sheet_snapshots() -> Optional[SheetSnapshotCache]:
+    """Return the process-wide snapshot cache (None when disabled), creating it on first use."""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                _shared_cache = _default_cache() or _UNSET
+    return None if _shared_cache is _UNSET else _shared_cache
+
+
+def configure_sheet_snapshots(**kwargs) -> SheetSnapshotCache:
+    """Replace the shared snapshot cache with one built from the given settings."""
+    global _shared_cache
+    with _shared_lock:
+        _shared_cache = SheetSnapshotCache(**kwargs)
+    return _shared_cache
+
+
+def forget_snapshot(worksheet):
+    """Drop a worksheet's snapshot after writing to it.
+
+    Drive's modifiedTime can lag a write by a moment, so a snapshot stored
+    before the write must not be served on the strength of it.
+    """
+    cache = get_sheet_snapshots()
+    if cache:
+        cache.invalidate(worksheet)
+
+
+def read_records(worksheet) -> List[Dict]:
+    """worksheet.get_all_records(), served from the local snapshot when the sheet is unchanged."""
+    cache = get_sheet_snapshots()
+    return cache.get_all_records(worksheet) if cache else worksheet.get_all_records()
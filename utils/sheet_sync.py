@@ -0,0 +1,369 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from utils.records import column_key
+from utils.sheet_schema import SheetSchema
+from utils.sheet_snapshot import forget_snapshot
+from utils.sheet_writer import DEFAULT_APPEND_CHUNK, SheetWriteBuffer, append_rows_chunked
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_state (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS prospects (
+    row_key TEXT PRIMARY KEY,
+    fields TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS synced_rows (
+    row_key TEXT PRIMARY KEY,
+    row_number INTEGER NOT NULL,
+    fields TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS duplicate_rows (
+    row_key TEXT NOT NULL,
+    row_number INTEGER NOT NULL,
+    PRIMARY KEY (row_key, row_number)
+);
+CREATE TABLE IF NOT EXISTS changes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    row_key TEXT NOT NULL,
+    field TEXT NOT NULL,
+    value TEXT NOT NULL,
+    changed_at REAL NOT NULL,
+    synced_at REAL
+);
+CREATE INDEX IF NOT EXISTS changes_pending ON changes (synced_at, row_key);
+"""
+
+
+def cell_text(value: Any) -> str:
+    """A value as the text a sheet cell shows for it; None is an empty cell."""
+    return '' if value is None else str(value)
+
+
+class ProspectStore:
+    """Local copy of the prospect sheet with a log of changes not yet pushed.
+
+    Prospects are identified by their ``key_field`` (the company name by
+    default) and hold cell text keyed by field name (``email_status``,
+    ``annual_value``, ...). ``update`` records only fields whose value
+    actually changes. Alongside the local values the store keeps each row
+    as it was at the last sync, which SheetSync diffs both sides against.
+    """
+
+    def __init__(self, path: str = '.cache/prospects.sqlite3', key_field: str = 'company_name'):
+        self.path = path
+        self.key_field = column_key(key_field)
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open the database for one transaction, committing on success."""
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        """The local values of one prospect, or None if the store has no such prospect."""
+        with self._connect() as db:
+            row = db.execute('SELECT fields FROM prospects WHERE row_key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def records(self) -> List[Dict[str, str]]:
+        """Every prospect's local values."""
+        with self._connect() as db:
+            return [json.loads(fields) for (fields,) in db.execute('SELECT fields FROM prospects ORDER BY rowid')]
+
+    def update(self, key: str, values: Dict[str, Any]) -> int:
+        """Set fields of a prospect (creating it if new); returns the number of fields that changed."""
+        values = {column_key(name): cell_text(value) for name, value in values.items()}
+        values[self.key_field] = key
+        now = time.time()
+        with self._lock, self._connect() as db:
+            row = db.execute('SELECT fields FROM prospects WHERE row_key = ?', (key,)).fetchone()
+            current = json.loads(row[0]) if row else {}
+            changed = {name: value for name, value in values.items() if current.get(name, '') != value}
+            if not changed and row:
+                return 0
+            db.execute('INSERT OR REPLACE INTO prospects (row_key, fields) VALUES (?, ?)',
+                       (key, json.dumps({**current, **values})))
+            db.executemany('INSERT INTO changes (row_key, field, value, changed_at) VALUES (?, ?, ?, ?)',
+                           [(key, name, value, now) for name, value in changed.items()])
+        return len(changed)
+
+    def pending(self) -> Dict[str, Dict[str, str]]:
+        """Unpushed local changes: the latest value of each changed field, by prospect."""
+        pending: Dict[str, Dict[str, str]] = {}
+        with self._connect() as db:
+            rows = db.execute('SELECT row_key, field, value FROM changes WHERE synced_at IS NULL ORDER BY id')
+            for key, name, value in rows:
+                pending.setdefault(key, {})[name] = value
+        return pending
+
+    def sync_state(self) -> Tuple[Optional[str], List[str], int]:
+        """Sheet revision, header row and last row number as of the last sync."""
+        with self._connect() as db:
+            state = dict(db.execute('SELECT name, value FROM sync_state'))
+        return (state.get('revision'), json.loads(state.get('headers', '[]')),
+                int(state.get('last_row', '1')))
+
+    def synced_rows(self, keys=None) -> Dict[str, Tuple[int, Dict[str, str]]]:
+        """Row number and values of prospects as of the last sync (all of them when ``keys`` is None)."""
+        with self._connect() as db:
+            if keys is None:
+                rows = db.execute('SELECT row_key, row_number, fields FROM synced_rows')
+            else:
+                keys = list(keys)
+                marks = ','.join('?' * len(keys))
+                rows = db.execute(f'SELECT row_key, row_number, fields FROM synced_rows WHERE row_key IN ({marks})',
+                                  keys) if keys else []
+            return {key: (number, json.loads(fields)) for key, number, fields in rows}
+
+    def duplicate_rows(self, keys) -> Dict[str, List[int]]:
+        """Row numbers of further rows with the same key, for the given prospects."""
+        keys = list(keys)
+        if not keys:
+            return {}
+        duplicates: Dict[str, List[int]] = {}
+        with self._connect() as db:
+            marks = ','.join('?' * len(keys))
+            for key, number in db.execute(f'SELECT row_key, row_number FROM duplicate_rows '
+                                          f'WHERE row_key IN ({marks}) ORDER BY row_number', keys):
+                duplicates.setdefault(key, []).append(number)
+        return duplicates
+
+    def record_sync(self, revision: Optional[str], headers: List[str], last_row: int,
+                    rows: Dict[str, Tuple[int, Dict[str, str]]], local: Dict[str, Dict[str, str]],
+                    removed: List[str], synced_until: int, duplicates: Optional[Dict[str, List[int]]] = None):
+        """Save the outcome of a sync in one transaction.
+
+        ``rows`` are the new synced values, ``local`` the prospects whose
+        local values change, ``removed`` the prospects gone from the
+        sheet, and every change up to id ``synced_until`` has been pushed
+        and is dropped from the change log.
+        ``duplicates``, when the sheet was read, replaces the known
+        duplicate rows.
+        """
+        with self._lock, self._connect() as db:
+            db.executemany('INSERT OR REPLACE INTO sync_state (name, value) VALUES (?, ?)',
+                           [('revision', revision or ''), ('headers', json.dumps(headers)),
+                            ('last_row', str(last_row))])
+            db.executemany('INSERT OR REPLACE INTO synced_rows (row_key, row_number, fields) VALUES (?, ?, ?)',
+                           [(key, number, json.dumps(fields)) for key, (number, fields) in rows.items()])
+            db.executemany('INSERT OR REPLACE INTO prospects (row_key, fields) VALUES (?, ?)',
+                           [(key, json.dumps(fields)) for key, fields in local.items()])
+            for table in ('prospects', 'synced_rows', 'changes'):
+                db.executemany(f'DELETE FROM {table} WHERE row_key = ?', [(key,) for key in removed])
+            if duplicates is not None:
+                db.execute('DELETE FROM duplicate_rows')
+                db.executemany('INSERT INTO duplicate_rows (row_key, row_number) VALUES (?, ?)',
+                               [(key, number) for key, numbers in duplicates.items() for number in numbers])
+            db.execute('DELETE FROM changes WHERE id <= ?', (synced_until,))
+
+    def last_change_id(self) -> int:
+        with self._connect() as db:
+            return db.execute('SELECT COALESCE(MAX(id), 0) FROM changes').fetchone()[0]
+
+
+@dataclass
+class Conflict:
+    """A field changed both locally and in the sheet since the last sync."""
+    key: str
+    field: str
+    local: str
+    sheet: Optional[str]  # None when the row was deleted from the sheet
+
+
+@dataclass
+class SyncResult:
+    """Outcome of SheetSync.sync."""
+    pushed: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    appended: List[str] = field(default_factory=list)
+    pulled: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    removed: List[str] = field(default_factory=list)
+    conflicts: List[Conflict] = field(default_factory=list)
+    duplicates: Dict[str, List[int]] = field(default_factory=dict)
+    duplicate_cells: int = 0
+    read_sheet: bool = False
+    requests: int = 0
+
+    @property
+    def cells_pushed(self) -> int:
+        return sum(len(values) for values in self.pushed.values()) + self.duplicate_cells
+
+
+class SheetSync:
+    """Two-way sync between a ProspectStore and a worksheet.
+
+    Both sides are diffed against the rows as they were at the last sync:
+    a field that differs in the sheet was edited there and is pulled into
+    the store, a field in the store's change log is pushed. A field
+    changed on both sides to different values is a conflict, settled by
+    ``prefer`` ("sheet" keeps the sheet's value, "local" overwrites it)
+    and reported either way. Fields the sheet has no column for stay local.
+
+    Rows are matched by key, not position, so rows that move (a row above
+    deleted, the sheet sorted) keep their prospect. Further rows with the
+    same key (two branches of one company) are reported in ``duplicates``
+    and otherwise left as they are: they receive the same local pushes as
+    the first row, but edits made to them are neither pulled nor undone.
+
+    Each sync first asks Drive for the spreadsheet's modifiedTime. While it
+    matches the revision of the last sync nobody has edited the sheet, so
+    it is not read at all and only the pending changes are written. Pushed
+    cells go out in one batch_update (adjacent fields of a row as one
+    range) and new prospects in chunked append_rows, so a sync costs a
+    number of requests set by what changed, not by the size of the sheet.
+    The revision is fetched again after our own writes and recorded, so
+    they do not make the next sync read the sheet. The sheet is read, once,
+    only after someone else has modified it; the Sheets API has no way to
+    fetch just the edited rows.
+    """
+
+    def __init__(self, store: ProspectStore, worksheet, prefer: str = 'sheet',
+                 chunk_size: int = DEFAULT_APPEND_CHUNK):
+        if prefer not in ('sheet', 'local'):
+            raise ValueError(f"prefer must be 'sheet' or 'local', not {prefer!r}")
+        self.store = store
+        self.worksheet = worksheet
+        self.prefer = prefer
+        self.chunk_size = chunk_size
+
+    def _revision(self) -> Optional[str]:
+        try:
+            return self.worksheet.spreadsheet.get_lastUpdateTime()
+        except Exception:
+            return None
+
+    def _read_sheet(self) -> Tuple[List[str], int, Dict[str, Tuple[int, Dict[str, str]]], Dict[str, List]]:
+        """Header row, last row number, the first row of every key and the rows repeating a key."""
+        values = self.worksheet.get(pad_values=True)
+        headers = list(values[0]) if values else []
+        fields = [column_key(header) if header.strip() else None for header in headers]
+        rows = {}
+        copies: Dict[str, List[Tuple[int, Dict[str, str]]]] = {}
+        for number, row in enumerate(values[1:], 2):
+            record = {name: cell_text(value) for name, value in zip(fields, row) if name}
+            key = record.get(self.store.key_field, '')
+            if not key:
+                continue
+            if key in rows:
+                copies.setdefault(key, []).append((number, record))
+            else:
+                rows[key] = (number, record)
+        return headers, max(len(values), 1), rows, copies
+
+    def sync(self) -> SyncResult:
+        """Pull sheet edits, push local changes and record the new synced state."""
+        result = SyncResult()
+        synced_until = self.store.last_change_id()
+        pending = self.store.pending()
+        revision = self._revision()
+        last_revision, headers, last_row = self.store.sync_state()
+
+        remote_edits: Dict[str, Dict[str, str]] = {}
+        new_rows: Dict[str, Tuple[int, Dict[str, str]]] = {}
+        if revision is None or revision != last_revision or not headers:
+            headers, last_row, rows, copies = self._read_sheet()
+            result.read_sheet = True
+            result.requests += 1
+            base = self.store.synced_rows()
+            for key, (number, record) in rows.items():
+                old_number, old = base.get(key, (None, {}))
+                edits = {name: value for name, value in record.items() if old.get(name, '') != value}
+                if edits:
+                    remote_edits[key] = edits
+                elif number != old_number:
+                    new_rows[key] = (number, record)
+            result.removed = [key for key in base if key not in rows]
+        else:
+            # Unchanged since the last sync: its rows are the sheet's rows
+            rows = self.store.synced_rows(pending)
+            copies = {key: [(number, None) for number in numbers]
+                      for key, numbers in self.store.duplicate_rows(pending).items()}
+        result.duplicates = {key: [number for number, _ in extra] for key, extra in copies.items()}
+
+        schema = SheetSchema(headers)
+        local_updates: Dict[str, Dict[str, str]] = {}
+        pushes: Dict[str, Dict[str, str]] = {}
+        copy_pushes: List[Tuple[int, Dict[str, str]]] = []
+        appends: List[str] = []
+
+        for key in result.removed:
+            for name, value in pending.pop(key, {}).items():
+                result.conflicts.append(Conflict(key, name, value, None))
+
+        for key in set(remote_edits) | set(pending):
+            sheet_edits = remote_edits.get(key, {})
+            local_edits = pending.get(key, {})
+            if key not in rows:
+                appends.append(key)
+                continue
+            push = {}
+            for name, value in local_edits.items():
+                if name not in schema:
+                    continue
+                if name in sheet_edits and sheet_edits[name] != value:
+                    result.conflicts.append(Conflict(key, name, value, sheet_edits[name]))
+                    if self.prefer == 'sheet':
+                        continue
+                    del sheet_edits[name]
+                if name not in sheet_edits:
+                    push[name] = value
+            if push:
+                pushes[key] = push
+            if sheet_edits:
+                result.pulled[key] = sheet_edits
+                local_updates[key] = {**(self.store.get(key) or {}), **sheet_edits}
+            number, record = rows[key]
+            final = {**record, **push}
+            new_rows[key] = (number, final)
+
+            for copy_number, copy_record in copies.get(key, []):
+                copy_push = {name: value for name, value in push.items()
+                             if copy_record is None or copy_record.get(name, '') != value}
+                if copy_push:
+                    copy_pushes.append((copy_number, copy_push))
+                    result.duplicate_cells += len(copy_push)
+
+        if pushes or copy_pushes:
+            with SheetWriteBuffer(self.worksheet, schema=schema) as buffer:
+                for key, values in pushes.items():
+                    buffer.update_fields(rows[key][0], values)
+                for number, values in copy_pushes:
+                    buffer.update_fields(number, values)
+            result.pushed = pushes
+            result.requests += buffer.requests_sent
+
+        if appends:
+            records = {key: self.store.get(key) or {self.store.key_field: key} for key in appends}
+            result.requests += append_rows_chunked(
+                self.worksheet, [[records[key].get(column_key(header), '') if header.strip() else ''
+                                  for header in headers] for key in appends], self.chunk_size)
+            for key in appends:
+                last_row += 1
+                new_rows[key] = (last_row, {name: value for name, value in records[key].items() if name in schema})
+            result.appended = appends
+
+        if pushes or copy_pushes or appends:
+            forget_snapshot(self.worksheet)
+            revision = self._revision()
+
+        self.store.record_sync(revision, headers, last_row, new_rows, local_updates, result.removed, synced_until,
+                               result.duplicates if result.read_sheet else None)
+        return result
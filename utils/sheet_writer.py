@@ -0,0 +1,176 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from gspread.utils import ValueInputOption
+
+from utils.entity_resolver import EntityResolver
+from utils.records import PROSPECT_COLUMNS, column_key
+from utils.sheet_schema import SheetSchema, cell_ranges, schema_for
+from utils.sheet_snapshot import forget_snapshot, read_records
+
+# Pending cells that trigger a flush; a batch_update carries them all in one request
+DEFAULT_MAX_CELLS = 1000
+
+# Rows per append_rows request; keeps each request well under the API payload limit
+DEFAULT_APPEND_CHUNK = 500
+
+# Oldest pending write, in seconds, before the next write triggers a flush
+DEFAULT_MAX_DELAY = 30.0
+
+
+class SheetWriteBuffer:
+    """Collects cell and row writes to a worksheet and sends them as one batch_update.
+
+    Every ``update_cell`` / ``update_row`` call only records the new values.
+    They are written together when ``max_cells`` cells are pending, when a
+    write arrives more than ``max_delay`` seconds after the oldest pending
+    one, on ``flush()``, or when the ``with`` block ends. A later write to
+    the same cell replaces the earlier one, and neighbouring cells in a row
+    are sent as a single range, so a status sync over 50 rows is one API
+    request instead of 200 ``update_cell`` calls.
+
+    ``update_fields`` addresses cells by header name through the
+    worksheet's SheetSchema instead of by column number.
+
+    Values are entered as if typed by a user, like ``update_cell``. A failed
+    flush raises and keeps the writes pending so it can be retried.
+    """
+
+    def __init__(self, worksheet, max_cells: int = DEFAULT_MAX_CELLS, max_delay: float = DEFAULT_MAX_DELAY,
+                 schema: Optional[SheetSchema] = None):
+        self.worksheet = worksheet
+        self.max_cells = max_cells
+        self.max_delay = max_delay
+        self._schema = schema
+        self.requests_sent = 0
+        self._pending: Dict[int, Dict[int, Any]] = {}
+        self._cell_count = 0
+        self._first_write_at: Optional[float] = None
+        self._lock = threading.RLock()
+
+    def __enter__(self) -> 'SheetWriteBuffer':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+
+    @property
+    def pending_cells(self) -> int:
+        """Number of cells waiting to be written."""
+        return self._cell_count
+
+    def update_cell(self, row: int, col: int, value: Any):
+        """Queue a single cell write (1-based row and column, like gspread)."""
+        self.update_row(row, [value], col)
+
+    @property
+    def schema(self) -> SheetSchema:
+        """The worksheet's column layout, read from its header row on first use."""
+        if self._schema is None:
+            self._schema = schema_for(self.worksheet)
+        return self._schema
+
+    def update_fields(self, row: int, values: Dict[str, Any]):
+        """Queue writes to a row's cells by header or field name.
+
+        Raises UnknownColumn, queuing nothing, if any field has no column.
+        """
+        cells = self.schema.cells(values)
+        with self._lock:
+            for col, value in sorted(cells.items()):
+                self.update_row(row, [value], col)
+
+    def update_row(self, row: int, values: Sequence[Any], col: int = 1):
+        """Queue writes to consecutive cells of a row, starting at column ``col``."""
+        with self._lock:
+            cells = self._pending.setdefault(row, {})
+            for offset, value in enumerate(values):
+                if col + offset not in cells:
+                    self._cell_count += 1
+                cells[col + offset] = value
+            if self._first_write_at is None:
+                self._first_write_at = time.monotonic()
+
+            if self._cell_count >= self.max_cells or time.monotonic() - self._first_write_at >= self.max_delay:
+                self.flush()
+
+    def _ranges(self) -> List[Dict]:
+        """Pending cells as batch_update ranges, one per run of adjacent cells in a row."""
+        return [entry for row in sorted(self._pending) for entry in cell_ranges(row, self._pending[row])]
+
+    def flush(self) -> int:
+        """Write every pending cell in one request; returns the number of cells written."""
+        with self._lock:
+            if not self._pending:
+                return 0
+            self.worksheet.batch_update(self._ranges(), value_input_option=ValueInputOption.user_entered)
+            forget_snapshot(self.worksheet)
+            self.requests_sent += 1
+            written = self._cell_count
+            self._pending = {}
+            self._cell_count = 0
+            self._first_write_at = None
+            return written
+
+
+def prospect_row(prospect: Dict, columns: Sequence[str] = PROSPECT_COLUMNS) -> List:
+    """Cells for a prospect keyed by field name (``company_name``, ``annual_value``, ...)."""
+    return [prospect.get(column_key(column), '') for column in columns]
+
+
+def append_rows_chunked(worksheet, rows: Sequence[Sequence], chunk_size: int = DEFAULT_APPEND_CHUNK) -> int:
+    """Append rows with one append_rows request per ``chunk_size`` rows; returns the request count."""
+    requests = 0
+    for start in range(0, len(rows), chunk_size):
+        worksheet.append_rows([list(row) for row in rows[start:start + chunk_size]])
+        requests += 1
+    if requests:
+        forget_snapshot(worksheet)
+    return requests
+
+
+@dataclass
+class ProspectImport:
+    """Outcome of append_prospects."""
+    added: List[Dict] = field(default_factory=list)
+    duplicates: List[Dict] = field(default_factory=list)
+    invalid: List[Dict] = field(default_factory=list)
+    requests: int = 0
+
+
+def append_prospects(worksheet, prospects: Iterable[Dict], existing_rows: Optional[List[Dict]] = None,
+                     row_for: Callable[[Dict], List] = prospect_row, dedupe: bool = True,
+                     chunk_size: int = DEFAULT_APPEND_CHUNK) -> ProspectImport:
+    """Validate, de-duplicate and append prospects in as few requests as possible.
+
+    Prospects are keyed by field name. One without a company name is
+    invalid. One that matches a company already in the sheet, or an earlier
+    prospect in the same call, by domain, phone or near-identical name is a
+    duplicate (unless ``dedupe`` is False). The rest are appended in chunks
+    of ``chunk_size`` rows, each row built by ``row_for``.
+
+    ``existing_rows`` are the sheet's current records; they are read
+    (through the local snapshot) when not given. Pass ``[]`` for a sheet that was
+    just cleared.
+    """
+    if existing_rows is None and dedupe:
+        existing_rows = read_records(worksheet)
+    resolver = EntityResolver.from_rows(existing_rows or [])
+
+    result = ProspectImport()
+    for prospect in prospects:
+        name = str(prospect.get('company_name') or '').strip()
+        if not name:
+            result.invalid.append(prospect)
+            continue
+        website, phone = prospect.get('website') or None, prospect.get('phone') or None
+        if dedupe and resolver.match(name, website, phone) is not None:
+            result.duplicates.append(prospect)
+            continue
+        resolver.add(name, website, phone, payload=prospect)
+        result.added.append(prospect)
+
+    result.requests = append_rows_chunked(worksheet, [row_for(prospect) for prospect in result.added], chunk_size)
+    return result
@@ -0,0 +1,145 @@
+import asyncio
+import re
+from typing import List, Optional, Sequence, Tuple
+from urllib.parse import urljoin, urldefrag
+
+from utils.async_fetcher import AsyncFetcher, run_sync
+from utils.parsed_page import ParsedPage
+from utils.robots import RobotsCache, get_robots_cache
+from utils.urls import host_of, normalize_url
+
+# Words in a link's path or text that mark a page worth crawling, best first
+PAGE_KEYWORDS = ('contact', 'team', 'staff', 'about', 'leadership', 'people', 'meet',
+                 'careers', 'jobs', 'employment')
+
+# Most child sitemaps read from a sitemap index
+MAX_CHILD_SITEMAPS = 3
+
+# Requests a crawled site's host may receive at once (its homepage plus key
+# pages) before the limiter settles to its per-host pace
+CRAWL_HOST_BURST = 4
+
+# Links to files rather than pages
+_SKIPPED_EXTENSIONS = re.compile(r'\.(?:pdf|jpe?g|png|gif|svg|webp|zip|docx?|xlsx?|mp4|mp3)$', re.IGNORECASE)
+
+_SITEMAP_LOC = re.compile(rb'<loc>\s*([^<\s]+)\s*</loc>', re.IGNORECASE)
+
+
+def page_rank(url: str, text: str = '', keywords: Sequence[str] = PAGE_KEYWORDS) -> Optional[int]:
+    """Rank a link by the first keyword in its path or text (lower is better), or None."""
+    haystack = (url.split('://', 1)[-1].partition('/')[2] + ' ' + text).lower()
+    for rank, keyword in enumerate(keywords):
+        if keyword in haystack:
+            return rank
+    return None
+
+
+def parse_sitemap(content: bytes) -> List[str]:
+    """Return the page URLs listed in a sitemap.xml document."""
+    return [loc.decode('utf-8', 'ignore').replace('&amp;', '&') for loc in _SITEMAP_LOC.findall(content or b'')]
+
+
+class SiteCrawler:
+    """Bounded crawler that finds a company's contact, team and careers pages.
+
+    Instead of guessing paths, it reads the homepage's own links and the
+    sitemaps listed in robots.txt (or /sitemap.xml), keeps the same-site pages
+    whose URL or link text mentions one of ``keywords``, and fetches the
+    best-ranked ones concurrently. ``max_pages`` caps the pages fetched per
+    site (homepage included; robots.txt and sitemap requests are not
+    counted) and ``max_depth`` how many links away from the homepage it
+    goes. Paths disallowed by robots.txt are skipped and requests
+    are paced by the shared per-host rate limiter; the crawled site's host
+    alone may take a burst of ``host_burst`` requests.
+    """
+
+    def __init__(self, max_pages: int = 6, max_depth: int = 1, use_sitemap: bool = True,
+                 fetcher: Optional[AsyncFetcher] = None, robots: Optional[RobotsCache] = None,
+                 keywords: Sequence[str] = PAGE_KEYWORDS, host_burst: int = CRAWL_HOST_BURST):
+        self.max_pages = max_pages
+        self.host_burst = host_burst
+        self.max_depth = max_depth
+        self.use_sitemap = use_sitemap
+        self.keywords = keywords
+        self.robots = robots or get_robots_cache()
+        self.fetcher = fetcher or AsyncFetcher(robots=self.robots, per_host_concurrency=max_pages)
+
+    def _candidates(self, links: List[Tuple[str, str]], base_url: str, seen: set) -> List[Tuple[int, str]]:
+        """Relevant same-site links not crawled yet, as (rank, url)."""
+        host = host_of(base_url)
+        candidates = {}
+        for href, text in links:
+            url = urldefrag(urljoin(base_url, href))[0]
+            if not url.startswith(('http://', 'https://')) or host_of(url) != host:
+                continue
+            if _SKIPPED_EXTENSIONS.search(url.split('?')[0]):
+                continue
+            key = normalize_url(url)
+            rank = page_rank(url, text, self.keywords)
+            if key in seen or rank is None or not self.robots.allowed(url):
+                continue
+            if key not in candidates or rank < candidates[key][0]:
+                candidates[key] = (rank, url)
+        return sorted(candidates.values())
+
+    async def _sitemap_links(self, start_url: str) -> List[Tuple[str, str]]:
+        """Page URLs from the site's sitemaps, following one level of sitemap index."""
+        sitemaps = await asyncio.to_thread(self.robots.sitemap_urls, start_url)
+        urls = []
+        for _ in range(2):
+            children = []
+            async for _, response in self.fetcher.fetch_as_completed(sitemaps):
+                if isinstance(response, Exception):
+                    continue
+                for url in parse_sitemap(response.content):
+                    if url.split('?')[0].lower().endswith('.xml'):
+                        children.append(url)
+                    else:
+                        urls.append(url)
+            sitemaps = children[:MAX_CHILD_SITEMAPS]
+            if not sitemaps:
+                break
+        return [(url, '') for url in urls]
+
+    async def acrawl(self, start_url: str, homepage: Optional[ParsedPage] = None) -> List[ParsedPage]:
+        """Crawl a site and return its parsed pages, homepage first.
+
+        A ``homepage`` the caller already fetched is used instead of
+        fetching it again. Pages that fail to load are skipped; an
+        unreachable homepage returns [].
+        """
+        self.fetcher.rate_limiter.set_host_burst(start_url, self.host_burst)
+        if homepage is None:
+            try:
+                homepage_response = await self.fetcher.fetch(start_url)
+            except Exception:
+                return []
+            homepage = ParsedPage.from_html(homepage_response.content, start_url)
+            seen = {normalize_url(start_url), normalize_url(homepage_response.url or start_url)}
+        else:
+            seen = {normalize_url(start_url), normalize_url(homepage.url or start_url)}
+        pages = [homepage]
+
+        links = list(homepage.links)
+        if self.use_sitemap:
+            links += await self._sitemap_links(start_url)
+
+        depth = 1
+        while links and depth <= self.max_depth and len(pages) < self.max_pages:
+            batch = [url for _, url in self._candidates(links, start_url, seen)][:self.max_pages - len(pages)]
+            seen.update(normalize_url(url) for url in batch)
+            links = []
+
+            async for url, response in self.fetcher.fetch_as_completed(batch):
+                if isinstance(response, Exception):
+                    continue
+                page = ParsedPage.from_html(response.content, url)
+                pages.append(page)
+                links.extend(page.links)
+            depth += 1
+
+        return pages
+
+    def crawl(self, start_url: str, homepage: Optional[ParsedPage] = None) -> List[ParsedPage]:
+        """Synchronous version of acrawl."""
+        return run_sync(self.acrawl(start_url, homepage))
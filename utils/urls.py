@@ -0,0 +1,37 @@
+from urllib.parse import urlparse, urlunparse
+
+
+def host_of(url: str) -> str:
+    """Return the lowercase host of a URL (without a leading www.)."""
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL for use as a cache key.
+
+    Lowercases scheme and host, drops the fragment and default ports, and
+    gives an empty path a trailing slash.
+    """
+    parts = urlparse(url.strip())
+    scheme = (parts.scheme or 'http').lower()
+    netloc = parts.netloc.lower()
+    if (scheme == 'http' and netloc.endswith(':80')) or (scheme == 'https' and netloc.endswith(':443')):
+        netloc = netloc.rsplit(':', 1)[0]
+    path = parts.path or '/'
+    return urlunparse((scheme, netloc, path, parts.params, parts.query, ''))
+
+
+def domain_of(website: str) -> str:
+    """Return the host of a website written with or without a scheme, or '' if it is not one.
+
+    Sheet cells hold values like "turnerpest.com", "https://www.turnerpest.com/"
+    or free text such as "LinkedIn verified"; only the first two yield a domain.
+    """
+    website = (website or '').strip()
+    if not website or ' ' in website:
+        return ''
+    if '://' not in website:
+        website = 'http://' + website
+    host = host_of(website).split(':')[0]
+    return host if '.' in host else ''